@@ -18,29 +18,42 @@ ORDER BY
     hour_of_day;
 
 -- 쿼리 1.2: 가장 많이 요청된 API 엔드포인트 TOP 10
+-- 설명: 정수 키(route_id)로 먼저 집계한 뒤 routes와 조인하므로, /posts/1과 /posts/15가 '/posts/{id}'로 함께 집계됩니다.
 SELECT
-    path,
-    method,
-    COUNT(*) AS request_count
+    routes.template AS path,
+    top_routes.method,
+    top_routes.request_count
 FROM
-    access_logs
-GROUP BY
-    path, method
+    (
+        SELECT route_id, method, COUNT(*) AS request_count
+        FROM access_logs
+        GROUP BY route_id, method
+        ORDER BY request_count DESC
+        LIMIT 10
+    ) AS top_routes
+JOIN
+    routes ON routes.id = top_routes.route_id
 ORDER BY
-    request_count DESC
-LIMIT 10;
+    top_routes.request_count DESC;
 
 -- 쿼리 1.3: 엔드포인트별 평균 및 최대 응답 시간
 SELECT
-    path,
-    AVG(response_time_ms) AS avg_response_time_ms,
-    MAX(response_time_ms) AS max_response_time_ms
+    routes.template AS path,
+    route_times.avg_response_time_ms,
+    route_times.max_response_time_ms
 FROM
-    access_logs
-GROUP BY
-    path
+    (
+        SELECT
+            route_id,
+            AVG(response_time_ms) AS avg_response_time_ms,
+            MAX(response_time_ms) AS max_response_time_ms
+        FROM access_logs
+        GROUP BY route_id
+    ) AS route_times
+JOIN
+    routes ON routes.id = route_times.route_id
 ORDER BY
-    avg_response_time_ms DESC;
+    route_times.avg_response_time_ms DESC;
 
 -- 쿼리 2.1: Brute-force 공격 의심 IP 탐지
 SELECT
@@ -62,16 +75,19 @@ ORDER BY
     failed_attempts DESC;
 
 -- 쿼리 2.2: 웹 스캐너(Web Scanner) 의심 IP 탐지
+-- ip_address는 VARBINARY(16)이므로 INET6_NTOA로 문자열로 바꿔 출력합니다.
 SELECT
-    ip_address,
+    INET6_NTOA(access_logs.ip_address) AS ip_address,
     COUNT(*) AS not_found_count,
-    GROUP_CONCAT(DISTINCT path SEPARATOR ', ') AS scanned_paths
+    GROUP_CONCAT(DISTINCT COALESCE(access_logs.raw_path, routes.template) SEPARATOR ', ') AS scanned_paths
 FROM
     access_logs
+JOIN
+    routes ON routes.id = access_logs.route_id
 WHERE
-    status_code = 404
+    access_logs.status_code = 404
 GROUP BY
-    ip_address
+    access_logs.ip_address
 HAVING
     COUNT(*) >= 10
 ORDER BY
@@ -79,17 +95,19 @@ ORDER BY
 
 -- 쿼리 2.3: 특정 보안 이벤트(SQL Injection 등) 로그 상세 조회
 SELECT
-    id,
-    timestamp,
-    ip_address,
-    path,
-    details
+    access_logs.id,
+    access_logs.timestamp,
+    INET6_NTOA(access_logs.ip_address) AS ip_address,
+    COALESCE(access_logs.raw_path, routes.template) AS path,
+    access_logs.details
 FROM
     access_logs
+JOIN
+    routes ON routes.id = access_logs.route_id
 WHERE
-    event_type = 'SQL_INJECTION_ATTEMPT'
+    access_logs.event_type = 'SQL_INJECTION_ATTEMPT'
 ORDER BY
-    timestamp DESC;
+    access_logs.timestamp DESC;
 
 -- 쿼리 2.4: [고급] 전일 대비 요청 수가 급증한 IP 탐지 (Self-Join 호환 버전)
 -- 설명: Window Function을 지원하지 않는 구버전 MariaDB/MySQL을 위해 Self-Join 방식으로 재작성했습니다.
@@ -106,7 +124,7 @@ WITH daily_requests_per_ip AS (
 )
 SELECT
     today.request_date,
-    today.ip_address,
+    INET6_NTOA(today.ip_address) AS ip_address,
     today.total_requests,
     -- COALESCE 함수를 사용하여 어제 데이터가 없는 경우 0으로 표시
     COALESCE(yesterday.total_requests, 0) AS previous_day_requests
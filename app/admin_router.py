@@ -0,0 +1,150 @@
+# app/admin_router.py
+
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from . import database
+from .logger_config import drop_counters
+from .services import profiler
+from .services.memory_diagnostics import TracingNotStarted, memory_diagnostics
+from .services.single_flight import single_flight_stats
+from .services.slow_queries import SlowQueryRecorder
+from .services.tracing import tracer
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    X-Admin-Token 헤더가 환경 변수 ADMIN_TOKEN과 일치할 때만 통과시킵니다.
+    ADMIN_TOKEN이 설정되지 않은 환경에서는 관리자 API를 모두 막습니다.
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token or not x_admin_token:
+        raise HTTPException(status_code=403, detail="Admin token required")
+    if not secrets.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/traces", dependencies=[Depends(require_admin)])
+def read_traces(limit: int = 50, min_ms: float = 0.0, path: Optional[str] = None):
+    """링 버퍼에 샘플링된 최근 요청 trace (최신순). min_ms, path(접두사)로 거를 수 있습니다."""
+    return {
+        "sample_rate": tracer.sample_rate,
+        "slow_ms": tracer.slow_ms,
+        "traces": tracer.buffer.list(limit=limit, min_ms=min_ms, path=path),
+    }
+
+
+def get_slow_query_recorder() -> SlowQueryRecorder:
+    return database.slow_query_recorder
+
+
+@router.get("/slow-queries", dependencies=[Depends(require_admin)])
+def read_slow_queries(
+    limit: int = 20,
+    order_by: str = Query("total_ms", pattern="^(total_ms|count|max_ms|slow_count)$"),
+    recorder: SlowQueryRecorder = Depends(get_slow_query_recorder),
+):
+    """쿼리 지문별 실행 횟수/누적/최대 시간(상위 limit개)과 최근 느린 쿼리(파라미터, EXPLAIN 포함)"""
+    return recorder.report(limit=limit, order_by=order_by)
+
+
+@router.delete("/slow-queries", status_code=204, dependencies=[Depends(require_admin)])
+def reset_slow_queries(
+    recorder: SlowQueryRecorder = Depends(get_slow_query_recorder),
+):
+    recorder.reset()
+
+
+@router.get("/logging", dependencies=[Depends(require_admin)])
+def read_logging_stats():
+    """샘플링/속도 제한/큐 가득 참으로 버려진 로그 레코드 수"""
+    return {"dropped": drop_counters.snapshot()}
+
+
+@router.get("/single-flight", dependencies=[Depends(require_admin)])
+def read_single_flight_stats():
+    """게시물 조회 single-flight 그룹별 호출/실행/공유 수와 coalescing 비율"""
+    return single_flight_stats()
+
+
+@router.get("/profile", dependencies=[Depends(require_admin)])
+def run_profile(
+    seconds: float = Query(10.0, gt=0, le=60),
+    hz: int = Query(profiler.DEFAULT_HZ, ge=1, le=1000),
+    all_threads: bool = False,
+    format: str = Query("collapsed", pattern="^(collapsed|json)$"),
+):
+    """
+    이 워커를 seconds초 동안 샘플링하여 경로별로 나뉜 collapsed-stack(flamegraph 입력)을 반환합니다.
+    워커당 하나만 실행되며, 이미 실행 중이면 409를 반환합니다.
+    """
+    try:
+        sampler = profiler.profile(seconds, hz=hz, all_threads=all_threads)
+    except profiler.ProfileInProgress:
+        raise HTTPException(status_code=409, detail="Profile already running")
+
+    if format == "json":
+        return {
+            "pid": os.getpid(),
+            "duration": round(sampler.duration, 3),
+            "samples": sampler.samples,
+            "routes": dict(sampler.routes.most_common()),
+            "stacks": dict(sampler.stacks.most_common()),
+        }
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={
+            "X-Profile-Samples": str(sampler.samples),
+            "X-Worker-Pid": str(os.getpid()),
+        },
+    )
+
+
+@router.get("/memory", dependencies=[Depends(require_admin)])
+def read_memory():
+    """RSS, tracemalloc 상태, GC 세대별 통계, 살아 있는 ORM 모델 인스턴스 수"""
+    return memory_diagnostics.report()
+
+
+@router.post("/memory/tracemalloc", dependencies=[Depends(require_admin)])
+def toggle_tracemalloc(enabled: bool = True, nframes: int = Query(1, ge=1, le=25)):
+    """tracemalloc을 켜거나 끕니다. 켜져 있는 동안 할당마다 비용이 들므로 진단이 끝나면 꺼야 합니다."""
+    if enabled:
+        memory_diagnostics.start(nframes)
+    else:
+        memory_diagnostics.stop()
+    return {"tracing": memory_diagnostics.tracing}
+
+
+@router.post("/memory/snapshots/{name}", dependencies=[Depends(require_admin)])
+def take_memory_snapshot(name: str):
+    try:
+        return memory_diagnostics.take_snapshot(name)
+    except TracingNotStarted:
+        raise HTTPException(status_code=409, detail="tracemalloc is not running")
+
+
+@router.get("/memory/diff", dependencies=[Depends(require_admin)])
+def read_memory_diff(
+    base: str,
+    target: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=500),
+    group_by: str = Query("lineno", pattern="^(lineno|filename)$"),
+):
+    """base 스냅샷 대비 target 스냅샷(생략하면 현재)의 파일/라인별 할당 증가량 상위 limit개"""
+    try:
+        return {
+            "base": base,
+            "target": target,
+            "top": memory_diagnostics.diff(base, target, limit, group_by),
+        }
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Snapshot not found: {e.args[0]}")
+    except TracingNotStarted:
+        raise HTTPException(status_code=409, detail="tracemalloc is not running")
@@ -1,6 +1,8 @@
 -- ===================================================================================
 -- API 로그 데이터 분석 및 보안 위협 탐지를 위한 SQL 쿼리 모음
 -- 데이터베이스 종류(PostgreSQL, MySQL 등)에 따라 일부 함수(날짜/시간)는 수정이 필요할 수 있습니다.
+-- access_logs의 경로는 routes 사전 테이블의 키(route_id)로, 원래 경로는 템플릿과 다를 때만 raw_path에 저장됩니다.
+-- ip_address는 이진값(IPv4 4바이트/IPv6 16바이트)이므로 MySQL에서는 INET6_NTOA()로, 그 외에는 애플리케이션에서 문자열로 변환합니다.
 -- ===================================================================================
 
 
@@ -26,13 +28,15 @@ ORDER BY
 -- 쿼리 1.2: 가장 많이 요청된 API 엔드포인트 TOP 10 (인기 기능 분석)
 -- 설명: 어떤 기능(API)이 사용자들에게 가장 많이 사용되는지 파악하여 서비스 개선의 우선순위를 정하는 데 도움을 줍니다.
 SELECT
-    path,
-    method,
+    routes.template AS path,
+    access_logs.method,
     COUNT(*) AS request_count
 FROM
     access_logs
+JOIN
+    routes ON routes.id = access_logs.route_id
 GROUP BY
-    path, method
+    routes.template, access_logs.method
 ORDER BY
     request_count DESC
 LIMIT 10;
@@ -41,15 +45,17 @@ LIMIT 10;
 -- 쿼리 1.3: 엔드포인트별 평균 및 최대 응답 시간 (성능 병목 분석)
 -- 설명: API별 응답 속도를 분석하여 어떤 엔드포인트의 성능 개선이 시급한지 파악하고, SLO/SLA 지표로 활용할 수 있습니다.
 SELECT
-    path,
+    routes.template AS path,
     AVG(response_time_ms) AS avg_response_time_ms,
     MAX(response_time_ms) AS max_response_time_ms,
     -- 95th Percentile: 대부분의 요청이 이 시간 안에 완료됨을 의미 (PostgreSQL)
     PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY response_time_ms) AS p95_response_time_ms
 FROM
     access_logs
+JOIN
+    routes ON routes.id = access_logs.route_id
 GROUP BY
-    path
+    routes.template
 ORDER BY
     avg_response_time_ms DESC;
 
@@ -88,9 +94,11 @@ SELECT
     ip_address,
     COUNT(*) AS not_found_count,
     -- 어떤 경로들을 스캔했는지 확인
-    STRING_AGG(DISTINCT path, ', ') AS scanned_paths
+    STRING_AGG(DISTINCT COALESCE(access_logs.raw_path, routes.template), ', ') AS scanned_paths
 FROM
     access_logs
+JOIN
+    routes ON routes.id = access_logs.route_id
 WHERE
     status_code = 404
 GROUP BY
@@ -104,13 +112,15 @@ ORDER BY
 -- 쿼리 2.3: 특정 보안 이벤트(SQL Injection 등) 로그 상세 조회
 -- 설명: 기록된 특정 유형의 보안 이벤트를 모두 조회하여 공격 패턴과 출처, 영향을 파악합니다.
 SELECT 
-    id,
+    access_logs.id,
     timestamp,
     ip_address,
-    path,
+    COALESCE(access_logs.raw_path, routes.template) AS path,
     details
 FROM 
     access_logs
+JOIN
+    routes ON routes.id = access_logs.route_id
 WHERE 
     event_type = 'SQL_INJECTION_ATTEMPT' -- 'PERMISSION_DENIED' 등 다른 이벤트 유형으로 변경하여 조회 가능
 ORDER BY
@@ -0,0 +1,55 @@
+# app/analytics_router.py
+
+import atexit
+import os
+import tempfile
+import threading
+
+from fastapi import APIRouter, Depends, Request, Response
+
+from .database import engine
+from .services.analytics_summary import DEFAULT_REFRESH_INTERVAL, AnalyticsSummaryCache
+
+router = APIRouter()
+
+_summary_cache = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> AnalyticsSummaryCache:
+    """
+    프로세스 전역 요약 캐시를 반환합니다. 첫 요청 시점에 백그라운드 갱신 스레드를 시작하므로,
+    분석 API를 쓰지 않는 환경(테스트 등)에서는 DB에 접속하지 않습니다.
+    워커들은 ANALYTICS_SUMMARY_DIR(기본: 임시 디렉터리)의 요약 파일을 공유하며, 그중 한 워커만 집계합니다.
+    ANALYTICS_SUMMARY_DIR을 빈 값으로 두면 워커마다 따로 집계합니다.
+    """
+    global _summary_cache
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            interval = float(
+                os.getenv("ANALYTICS_REFRESH_SECONDS", DEFAULT_REFRESH_INTERVAL)
+            )
+            shared_dir = os.getenv(
+                "ANALYTICS_SUMMARY_DIR",
+                os.path.join(tempfile.gettempdir(), "analytics_summary"),
+            )
+            _summary_cache = AnalyticsSummaryCache(
+                engine, interval, shared_dir=shared_dir or None
+            ).start()
+            atexit.register(_summary_cache.stop)
+        return _summary_cache
+
+
+@router.get("/summary")
+def read_summary(
+    request: Request, cache: AnalyticsSummaryCache = Depends(get_summary_cache)
+):
+    """미리 계산된 KPI/시계열/상위 엔드포인트 요약. If-None-Match가 일치하면 304를 반환합니다."""
+    body, etag = cache.snapshot()
+    if body is None:
+        # 다른 워커가 첫 요약을 집계하는 중입니다.
+        return Response(status_code=503, headers={"Retry-After": "5"})
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,29 +1,232 @@
+import atexit
+import copy
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
+import threading
+import time
+
+import orjson
+
+ROOT_LOGGER_NAME = "MyApiProjectLogger"
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_RATE_LIMIT = 20.0
+DEFAULT_RATE_BURST = 50
+
+# LogRecord의 기본 속성. 이 외의 속성(extra=...)은 구조화 필드로 그대로 출력합니다.
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class DropCounters:
+    """버려진 로그 레코드 수 (샘플링 / 속도 제한 / 큐 가득 참)"""
+
+    def __init__(self):
+        self._counts = {"sampled": 0, "rate_limited": 0, "queue_full": 0}
+        self._lock = threading.Lock()
+
+    def increment(self, reason: str):
+        with self._lock:
+            self._counts[reason] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            for reason in self._counts:
+                self._counts[reason] = 0
+
+
+drop_counters = DropCounters()
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드를 orjson으로 한 줄짜리 JSON 객체로 인코딩합니다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S")
+            + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "func": record.funcName,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return orjson.dumps(payload, default=str).decode("utf-8")
+
+
+class SamplingFilter(logging.Filter):
+    """
+    로거 이름(접두사)별 비율만큼만 통과시킵니다. WARNING 이상은 항상 통과합니다.
+    예: {"MyApiProjectLogger.alerting": 0.1} -> alerting의 INFO 로그 10%만 출력
+    """
+
+    def __init__(self, rates: dict, counters: DropCounters = drop_counters):
+        super().__init__()
+        # 더 구체적인(긴) 이름이 먼저 매칭되도록 정렬합니다.
+        self.rates = sorted(rates.items(), key=lambda item: -len(item[0]))
+        self.counters = counters
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        for name, rate in self.rates:
+            if record.name == name or record.name.startswith(name + "."):
+                if random.random() < rate:
+                    return True
+                self.counters.increment("sampled")
+                return False
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    (로거, 메시지 템플릿)마다 초당 rate개, 최대 burst개까지 허용하는 토큰 버킷입니다.
+    %-스타일 인자를 쓰면 값이 달라도 같은 템플릿으로 묶이므로, 같은 경고가 쏟아질 때만 걸러집니다.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE_LIMIT,
+        burst: int = DEFAULT_RATE_BURST,
+        counters: DropCounters = drop_counters,
+        clock=time.monotonic,
+    ):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.counters = counters
+        self.clock = clock
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, str(record.msg))
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self.counters.increment("rate_limited")
+                return False
+            self._buckets[key] = (tokens - 1, now)
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    레코드를 큐에 넣기만 하고 즉시 반환합니다. 큐가 가득 차면 기다리지 않고 버리며 queue_full을 늘립니다.
+    실제 포맷팅(JSON 인코딩)과 stdout 쓰기는 QueueListener 스레드에서 이루어집니다.
+    """
+
+    def __init__(self, log_queue, counters: DropCounters = drop_counters):
+        super().__init__(log_queue)
+        self.counters = counters
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 구현과 달리 메시지만 합치고(인자가 이후에 바뀔 수 있으므로) 포맷팅은 리스너에 맡깁니다.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.counters.increment("queue_full")
+
+
+def parse_sample_rates(value: str) -> dict:
+    """'alerting=0.1,monitoring=0.5' 형식을 {'MyApiProjectLogger.alerting': 0.1, ...}로 바꿉니다."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, rate = item.split("=", 1)
+        name = name.strip()
+        if name != ROOT_LOGGER_NAME and not name.startswith(ROOT_LOGGER_NAME + "."):
+            name = f"{ROOT_LOGGER_NAME}.{name}"
+        rates[name] = float(rate)
+    return rates
 
 
 def setup_logger():
-    """프로젝트에서 사용할 기본 로거를 설정하고 반환합니다."""
+    """
+    프로젝트에서 사용할 기본 로거를 설정하고 반환합니다.
+    요청 스레드는 큐에 넣기만 하고, 리스너 스레드가 JSON(LOG_FORMAT=text면 기존 텍스트 형식)으로 stdout에 씁니다.
+    """
     # 로거 인스턴스 생성
-    logger = logging.getLogger("MyApiProjectLogger")
-    logger.setLevel(logging.INFO)  # INFO 레벨 이상의 로그만 처리
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
     # 이미 핸들러가 설정되어 있다면 중복 추가 방지
     if logger.hasHandlers():
         return logger
 
-    # 로그 포맷 설정
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - [%(funcName)s:%(lineno)d] - %(message)s"
+    if os.getenv("LOG_FORMAT", "json") == "text":
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - [%(funcName)s:%(lineno)d] - %(message)s"
+        )
+    else:
+        formatter = JsonFormatter()
+
+    # 콘솔(stdout) 핸들러는 리스너 스레드에서만 사용합니다.
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(int(os.getenv("LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)))
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(
+        SamplingFilter(parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", "")))
     )
+    queue_handler.addFilter(
+        RateLimitFilter(
+            rate=float(os.getenv("LOG_RATE_LIMIT", DEFAULT_RATE_LIMIT)),
+            burst=int(os.getenv("LOG_RATE_BURST", DEFAULT_RATE_BURST)),
+        )
+    )
+    logger.addHandler(queue_handler)
 
-    # 콘솔(stdout) 핸들러 설정
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    listener.start()
+    # 프로세스 종료 전에 큐에 남은 로그를 모두 출력합니다.
+    atexit.register(listener.stop)
+
+    def _restart_listener_in_child():
+        # 포크된 자식(gunicorn --preload 워커 등)에는 리스너 스레드가 없으므로 새 큐와 스레드로 다시 시작합니다.
+        log_queue_in_child = queue.Queue(log_queue.maxsize)
+        queue_handler.queue = listener.queue = log_queue_in_child
+        listener._thread = None
+        listener.start()
+
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_listener_in_child)
 
     return logger
 
 
+def get_logger(name: str) -> logging.Logger:
+    """모듈별 하위 로거. 상위 로거의 큐 핸들러를 공유하며 로거 이름별 샘플링 대상이 됩니다."""
+    return logger.getChild(name)
+
+
 # 전역적으로 사용할 로거 인스턴스
 logger = setup_logger()
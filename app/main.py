@@ -1,12 +1,16 @@
+import inspect
 import os
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from typing import List
 
 # 다른 파일에서 필요한 클래스와 함수들을 가져옵니다.
-from . import models, schemas
-from contextlib import asynccontextmanager
+from . import models, schemas, analytics_router, admin_router
+from contextlib import asynccontextmanager, contextmanager
 from .database import engine, get_db
+from .services.single_flight import SingleFlight
+from .services.title_index import TitleIndex, ensure_title_index, title_index_for
+from .services.tracing import TracingMiddleware, TracingRoute, instrument_engines
 
 # 데이터베이스 테이블 생성 (애플리케이션 시작 시)
 # models.Base.metadata.create_all(bind=engine) # <-- 이 줄을 삭제하거나 주석 처리!
@@ -23,6 +27,17 @@ async def lifespan(app: FastAPI):
 
 app = FastAPI()
 
+# 요청별 구간 시간(커넥션 대기/쿼리 실행/ORM/직렬화)을 Server-Timing 헤더로 내보내고, 일부를 샘플링해 보관합니다.
+# route_class는 이후 선언되는 경로에만 적용되므로 엔드포인트 선언보다 먼저 지정해야 합니다.
+app.router.route_class = TracingRoute
+app.add_middleware(TracingMiddleware)
+instrument_engines()
+
+# 대시보드용 분석 요약 API (백그라운드에서 미리 계산된 결과를 메모리에서 제공)
+app.include_router(analytics_router.router, prefix="/analytics", tags=["Analytics"])
+# 운영 진단용 관리자 API (X-Admin-Token 필요)
+app.include_router(admin_router.router, prefix="/admin", tags=["Admin"])
+
 
 # API 요청마다 데이터베이스 세션을 생성하고, 요청이 끝나면 닫는 의존성 함수
 # def get_db():
@@ -33,6 +48,40 @@ app = FastAPI()
 #         db.close()
 
 
+# 같은 게시물/같은 페이지에 대한 동시 조회는 DB 조회 한 번을 함께 기다립니다. (/admin/single-flight)
+post_reads = SingleFlight("read_post")
+post_page_reads = SingleFlight("read_posts")
+
+
+def get_session_scope(request: Request):
+    """
+    필요한 시점에만 세션(커넥션)을 여는 컨텍스트 매니저를 반환합니다.
+    single-flight로 다른 요청의 조회를 기다리는 요청은 커넥션을 잡지 않습니다.
+    get_db의 의존성 오버라이드(테스트 등)를 그대로 따릅니다.
+    """
+    dependency = request.app.dependency_overrides.get(get_db, get_db)
+
+    @contextmanager
+    def session_scope():
+        provided = dependency()
+        if not inspect.isgenerator(provided):
+            yield provided
+            return
+        try:
+            yield next(provided)
+        finally:
+            provided.close()
+
+    return session_scope
+
+
+def _forget_post_reads(post_id: int = None):
+    # 커밋 이후의 읽기가 커밋 이전에 시작된 조회에 합류하지 않도록 합니다.
+    if post_id is not None:
+        post_reads.forget(post_id)
+    post_page_reads.forget_all()
+
+
 # --- CRUD 엔드포인트 구현 ---
 
 
@@ -44,20 +93,49 @@ def create_post(post: schemas.PostCreate, db: Session = Depends(get_db)):
     db.add(db_post)  # DB 세션에 추가
     db.commit()  # DB에 커밋 (실제 저장)
     db.refresh(db_post)  # 생성된 객체의 정보를 다시 로드 (ID 등)
+    title_index_for(db.get_bind()).add(db_post.id, db_post.title)
+    _forget_post_reads()
     return db_post
 
 
 # Read (전체 조회)
 @app.get("/posts", response_model=List[schemas.Post])
-def read_posts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    posts = db.query(models.Post).offset(skip).limit(limit).all()
-    return posts
+def read_posts(
+    skip: int = 0, limit: int = 100, session_scope=Depends(get_session_scope)
+):
+    def fetch():
+        with session_scope() as db:
+            posts = db.query(models.Post).offset(skip).limit(limit).all()
+            # 여러 요청이 결과를 공유하므로 세션에 묶인 ORM 객체 대신 스키마 객체로 바꿔 둡니다.
+            return [schemas.Post.model_validate(post) for post in posts]
+
+    return post_page_reads.do((skip, limit), fetch)
+
+
+def get_title_index() -> TitleIndex:
+    """제목 자동완성 인덱스. 메모리에서만 조회하므로 DB 세션(커넥션)을 잡지 않습니다."""
+    return ensure_title_index(engine)
+
+
+# Read (제목 자동완성) - '/posts/{post_id}'보다 먼저 선언해야 'suggest'가 post_id로 해석되지 않습니다.
+@app.get("/posts/suggest", response_model=List[schemas.PostSuggestion])
+def suggest_posts(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    titles: TitleIndex = Depends(get_title_index),
+):
+    return titles.suggest(prefix, limit)
 
 
 # Read (단일 조회)
 @app.get("/posts/{post_id}", response_model=schemas.Post)
-def read_post(post_id: int, db: Session = Depends(get_db)):
-    post = db.query(models.Post).filter(models.Post.id == post_id).first()
+def read_post(post_id: int, session_scope=Depends(get_session_scope)):
+    def fetch():
+        with session_scope() as db:
+            post = db.query(models.Post).filter(models.Post.id == post_id).first()
+            return None if post is None else schemas.Post.model_validate(post)
+
+    post = post_reads.do(post_id, fetch)
     if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
     return post
@@ -74,6 +152,8 @@ def update_post(post_id: int, post: schemas.PostCreate, db: Session = Depends(ge
     db_post.content = post.content
     db.commit()
     db.refresh(db_post)
+    title_index_for(db.get_bind()).add(db_post.id, db_post.title)
+    _forget_post_reads(post_id)
     return db_post
 
 
@@ -86,6 +166,8 @@ def delete_post(post_id: int, db: Session = Depends(get_db)):
 
     db.delete(db_post)
     db.commit()
+    title_index_for(db.get_bind()).remove(post_id)
+    _forget_post_reads(post_id)
     return
 
 
@@ -1,4 +1,26 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, func
+import ipaddress
+import re
+import weakref
+
+from sqlalchemy import (
+    VARBINARY,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    event,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.types import TypeDecorator
+
 from .database import Base
 
 
@@ -10,6 +32,124 @@ class Post(Base):
     content = Column(String(500))  # 내용, 최대 500자
 
 
+class PackedIPAddress(TypeDecorator):
+    """
+    IP 주소 문자열을 VARBINARY(16)로 저장합니다. (IPv4 4바이트, IPv6 16바이트)
+    MySQL의 INET6_ATON()/INET6_NTOA()와 같은 형식이므로 SQL에서도 그대로 변환할 수 있습니다.
+    """
+
+    impl = VARBINARY(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return ipaddress.ip_address(value).packed
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return str(ipaddress.ip_address(bytes(value)))
+
+
+class Route(Base):
+    """
+    access_logs의 경로를 '/posts/{id}' 같은 경로 템플릿으로 정규화해 정수 키로 저장하기 위한 사전 테이블
+    """
+
+    __tablename__ = "routes"
+
+    id = Column(Integer, primary_key=True)
+    template = Column(String(255), nullable=False, unique=True)
+
+
+_ID_SEGMENT = re.compile(
+    r"/(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})(?=/|$)"
+)
+
+
+def route_template(path: str) -> str:
+    """쿼리 문자열을 떼고 숫자/UUID 경로 구간을 {id}로 바꿉니다. ('/posts/15?x=1' -> '/posts/{id}')"""
+    return _ID_SEGMENT.sub("/{id}", path.split("?", 1)[0])[:255] or "/"
+
+
+# 엔진별 {템플릿: routes.id} 캐시. 테이블을 다시 만들면(create_all/drop_all) 비웁니다.
+# 트랜잭션 안에서 새로 추가한 템플릿은 커밋된 뒤에야 캐시에 넣어, 롤백된 id를 재사용하지 않게 합니다.
+_route_ids = weakref.WeakKeyDictionary()
+_PENDING_ROUTES = "pending_route_ids"
+
+
+def clear_route_cache(engine=None):
+    if engine is None:
+        _route_ids.clear()
+    else:
+        _route_ids.pop(engine, None)
+
+
+def resolve_route_id(conn, template: str) -> int:
+    """템플릿의 routes.id를 반환합니다. 처음 보는 템플릿이면 추가합니다. (동시 추가는 무시하고 잠금 읽기로 다시 조회)"""
+    cache = _route_ids.setdefault(conn.engine, {})
+    route_id = cache.get(template)
+    if route_id is not None:
+        return route_id
+    pending = conn.info.setdefault(_PENDING_ROUTES, {})
+    route_id = pending.get(template)
+    if route_id is not None:
+        return route_id
+
+    route_id = conn.execute(select(Route.id).where(Route.template == template)).scalar()
+    if route_id is not None:
+        cache[template] = route_id
+        return route_id
+    conn.execute(
+        insert(Route)
+        .values(template=template)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+    )
+    # REPEATABLE READ(MySQL 기본)의 일반 SELECT는 트랜잭션 스냅샷을 읽으므로, 다른 트랜잭션이 방금 커밋해
+    # INSERT IGNORE가 건너뛴 행이 보이지 않습니다. 잠금 읽기(FOR UPDATE)는 최신 커밋 행을 읽습니다.
+    route_id = conn.execute(
+        select(Route.id).where(Route.template == template).with_for_update()
+    ).scalar_one()
+    pending[template] = route_id
+    return route_id
+
+
+@event.listens_for(Engine, "commit")
+def _publish_pending_routes(conn):
+    pending = conn.info.pop(_PENDING_ROUTES, None)
+    if pending:
+        _route_ids.setdefault(conn.engine, {}).update(pending)
+
+
+@event.listens_for(Engine, "rollback")
+def _discard_pending_routes(conn):
+    conn.info.pop(_PENDING_ROUTES, None)
+
+
+def encode_path(conn, path: str) -> dict:
+    """
+    경로를 access_logs 저장 형식(route_id, raw_path)으로 바꿉니다.
+    원래 경로는 템플릿과 다를 때(ID·쿼리 문자열 포함)만 raw_path에 남깁니다.
+    """
+    template = route_template(path)
+    return {
+        "route_id": resolve_route_id(conn, template),
+        "raw_path": path if path != template else None,
+    }
+
+
+def encode_access_log_rows(conn, rows: list) -> list:
+    """Core executemany용 딕셔너리 행의 'path'를 route_id/raw_path로 바꿉니다."""
+    encoded = []
+    for row in rows:
+        row = dict(row)
+        row.update(encode_path(conn, row.pop("path")))
+        encoded.append(row)
+    return encoded
+
+
 class AccessLog(Base):
     """
     성능 및 보안 분석을 위한 통합 액세스 로그 테이블
@@ -21,12 +161,16 @@ class AccessLog(Base):
     id = Column(Integer, primary_key=True, index=True)
 
     # --- 기본 접속 정보 (모델 1의 장점: 데이터 무결성) ---
-    ip_address = Column(String(50), nullable=False)
+    ip_address = Column(PackedIPAddress, nullable=False)
+    # 모니터링 규칙이 최근 구간(lookback)만 조회할 수 있도록 인덱스를 둡니다.
+    # (기존 DB는 scripts/migrate_timestamp_indexes.sql로 추가)
     timestamp = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
     )
     method = Column(String(10), nullable=False)
-    path = Column(String(255), nullable=False)
+    # 경로는 routes 사전 테이블의 정수 키로 저장하고, 원래 경로는 템플릿과 다를 때만 raw_path에 남깁니다.
+    route_id = Column(Integer, ForeignKey("routes.id"), nullable=False, index=True)
+    raw_path = Column(String(255), nullable=True)
     status_code = Column(Integer, nullable=False)
 
     # --- 성능 분석용 컬럼 (모델 1의 장점) ---
@@ -36,6 +180,37 @@ class AccessLog(Base):
     event_type = Column(String(50), nullable=False, default="NORMAL")
     details = Column(Text, nullable=True)  # 상세 정보는 없을 수 있으므로 nullable=True
 
+    route = relationship(Route)
+
+    @property
+    def path(self) -> str:
+        """원래 요청 경로. 아직 저장 전이면 지정한 값을, 저장된 행이면 raw_path 또는 템플릿을 반환합니다."""
+        pending = self.__dict__.get("_pending_path")
+        if pending is not None:
+            return pending
+        return self.raw_path or self.route.template
+
+    @path.setter
+    def path(self, value: str):
+        self.__dict__["_pending_path"] = value
+        self.raw_path = value if value != route_template(value) else None
+        # 이미 저장된 행이면 raw_path가 그대로여도 UPDATE(before_update)가 일어나도록 표시합니다.
+        flag_modified(self, "raw_path")
+
+
+@event.listens_for(AccessLog, "before_insert")
+@event.listens_for(AccessLog, "before_update")
+def _encode_access_log_path(mapper, connection, target):
+    pending = target.__dict__.pop("_pending_path", None)
+    if pending is not None:
+        target.route_id = encode_path(connection, pending)["route_id"]
+
+
+@event.listens_for(Route.__table__, "after_create")
+@event.listens_for(Route.__table__, "after_drop")
+def _clear_route_cache(table, connection, **kw):
+    clear_route_cache(connection.engine)
+
 
 # --- ⚔️🛡️ 과제 4.1: 보안 이벤트 로깅을 위한 모델 추가 ---
 class SecurityEvent(Base):
@@ -51,5 +226,5 @@ class SecurityEvent(Base):
     )  # LOGIN_FAIL, SUSPICIOUS_QUERY 등
     username = Column(String(100), nullable=True)  # 관련 사용자 이름
     ip_address = Column(String(50), nullable=False, index=True)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     description = Column(String(500))  # 이벤트 상세 설명
@@ -17,3 +17,9 @@ class Post(PostBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# 제목 자동완성 응답 스키마 (GET /posts/suggest)
+class PostSuggestion(BaseModel):
+    id: int
+    title: str
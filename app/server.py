@@ -0,0 +1,221 @@
+# app/server.py
+"""
+gunicorn + UvicornWorker 실행기. (python -m app.server)
+
+- 워커 수: cgroup CPU 쿼터(컨테이너 --cpus)와 CPU affinity 중 작은 값 기준. WEB_CONCURRENCY로 직접 지정 가능
+- DB 커넥션: DB_CONNECTION_BUDGET(서버 전체 상한)을 워커 수로 나눠 워커별 pool_size/max_overflow를 정합니다.
+- preload(기본): 마스터에서 앱을 한 번 import한 뒤 gc.freeze()로 고정하고 fork하여, 워커들이 메모리를
+  copy-on-write로 공유합니다. 엔진 풀은 post_fork에서 새로 만들어 부모와 커넥션을 공유하지 않습니다.
+- 종료/재시작: SIGTERM과 HUP 모두 기존 워커가 처리 중인 요청을 GRACEFUL_TIMEOUT초까지 마친 뒤 종료하고,
+  종료하는 워커는 worker_exit에서 풀을 닫아 커넥션을 바로 반납합니다.
+  단, preload 모드의 HUP은 마스터에 로드된 코드를 그대로 쓰므로, 코드 교체는 USR2(새 마스터 기동) 후
+  기존 마스터에 QUIT를 보내거나 SERVER_PRELOAD=0으로 실행합니다.
+  재시작 중에는 기존 워커와 새 워커가 잠시 겹치므로 예산의 최대 2배까지 커넥션이 열릴 수 있습니다.
+"""
+
+import gc
+import math
+import os
+from dataclasses import dataclass
+
+from .logger_config import get_logger
+
+logger = get_logger("server")
+
+DEFAULT_BIND = "0.0.0.0:8000"
+DEFAULT_CONNECTION_BUDGET = 60
+DEFAULT_OVERFLOW_RATIO = 0.25
+DEFAULT_GRACEFUL_TIMEOUT = 30
+DEFAULT_TIMEOUT = 60
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def cgroup_cpu_limit(cgroup_root: str = CGROUP_ROOT):
+    """cgroup v2(cpu.max) 또는 v1(cfs_quota_us/cfs_period_us)의 CPU 쿼터를 코어 수로 반환합니다. 제한이 없으면 None"""
+    try:
+        with open(os.path.join(cgroup_root, "cpu.max"), "r") as f:
+            quota, period = f.read().split()[:2]
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_quota_us"), "r") as f:
+            quota = int(f.read())
+        with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_period_us"), "r") as f:
+            period = int(f.read())
+    except (OSError, ValueError):
+        return None
+    if quota <= 0 or period <= 0:
+        return None
+    return quota / period
+
+
+def available_cpus(cgroup_root: str = CGROUP_ROOT) -> int:
+    """
+    이 프로세스가 실제로 쓸 수 있는 코어 수. os.cpu_count()는 호스트 전체 코어 수를 돌려주므로
+    affinity와 cgroup 쿼터로 줄입니다. 1.5코어처럼 소수 쿼터는 CFS 스로틀링을 피하도록 내림합니다.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit(cgroup_root)
+    if limit is not None:
+        cpus = min(cpus, math.floor(limit))
+    return max(1, cpus)
+
+
+@dataclass
+class ServerPlan:
+    """워커 수와 워커별 커넥션 풀 크기"""
+
+    cpus: int
+    workers: int
+    pool_size: int
+    max_overflow: int
+    connection_budget: int
+
+    @property
+    def max_connections(self) -> int:
+        """평상시(재시작 중이 아닐 때) 서버 전체가 열 수 있는 최대 DB 커넥션 수"""
+        return self.workers * (self.pool_size + self.max_overflow)
+
+    def database_env(self) -> dict:
+        return {
+            "DB_POOL_SIZE": str(self.pool_size),
+            "DB_MAX_OVERFLOW": str(self.max_overflow),
+        }
+
+
+def plan_server(
+    cpus: int,
+    connection_budget: int = DEFAULT_CONNECTION_BUDGET,
+    workers: int = None,
+    overflow_ratio: float = DEFAULT_OVERFLOW_RATIO,
+) -> ServerPlan:
+    """
+    비동기 워커는 코어당 1개를 기본으로 합니다. 워커별 커넥션 몫(예산 // 워커 수) 중 overflow_ratio만큼은
+    급증 시에만 여는 max_overflow로, 나머지는 pool_size로 나눕니다. 워커마다 커넥션이 최소 1개는
+    필요하므로 예산보다 워커가 많으면 워커 수를 예산에 맞춰 줄입니다.
+    """
+    if connection_budget < 1:
+        raise ValueError("connection_budget은 1 이상이어야 합니다.")
+    workers = workers or cpus
+    if workers > connection_budget:
+        logger.warning(
+            "workers %d exceed DB connection budget %d; reducing workers",
+            workers,
+            connection_budget,
+        )
+        workers = connection_budget
+
+    per_worker = connection_budget // workers
+    max_overflow = int(per_worker * overflow_ratio)
+    return ServerPlan(
+        cpus=cpus,
+        workers=workers,
+        pool_size=per_worker - max_overflow,
+        max_overflow=max_overflow,
+        connection_budget=connection_budget,
+    )
+
+
+def plan_from_env() -> ServerPlan:
+    workers = os.getenv("WEB_CONCURRENCY")
+    return plan_server(
+        cpus=available_cpus(),
+        connection_budget=int(
+            os.getenv("DB_CONNECTION_BUDGET", DEFAULT_CONNECTION_BUDGET)
+        ),
+        workers=int(workers) if workers else None,
+        overflow_ratio=float(os.getenv("DB_OVERFLOW_RATIO", DEFAULT_OVERFLOW_RATIO)),
+    )
+
+
+# --- gunicorn 서버 훅 ---
+
+
+def post_fork(server, worker):
+    from .database import engine, reset_pool_after_fork
+    from .services.title_index import warm_title_index
+
+    reset_pool_after_fork()
+    # 첫 자동완성 요청이 빌드를 기다리지 않도록 워커 시작 직후 백그라운드에서 제목 인덱스를 만듭니다.
+    warm_title_index(engine)
+
+
+def worker_exit(server, worker):
+    # 처리 중이던 요청을 마친(드레이닝된) 워커가 커넥션을 바로 반납하도록 풀을 닫습니다.
+    from .database import engine
+
+    engine.dispose()
+
+
+def gunicorn_options(
+    plan: ServerPlan,
+    bind: str = DEFAULT_BIND,
+    preload: bool = True,
+    graceful_timeout: int = DEFAULT_GRACEFUL_TIMEOUT,
+    timeout: int = DEFAULT_TIMEOUT,
+) -> dict:
+    return {
+        "bind": bind,
+        "workers": plan.workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": preload,
+        "graceful_timeout": graceful_timeout,
+        "timeout": timeout,
+        "keepalive": 5,
+        "post_fork": post_fork,
+        "worker_exit": worker_exit,
+    }
+
+
+def options_from_env(plan: ServerPlan) -> dict:
+    return gunicorn_options(
+        plan,
+        bind=os.getenv("BIND", DEFAULT_BIND),
+        preload=os.getenv("SERVER_PRELOAD", "1") != "0",
+        graceful_timeout=int(os.getenv("GRACEFUL_TIMEOUT", DEFAULT_GRACEFUL_TIMEOUT)),
+        timeout=int(os.getenv("WORKER_TIMEOUT", DEFAULT_TIMEOUT)),
+    )
+
+
+def run(plan: ServerPlan = None, options: dict = None):
+    # gunicorn은 배포(리눅스) 환경에서만 필요하므로 실행 시점에 import합니다.
+    from gunicorn.app.base import BaseApplication
+
+    plan = plan or plan_from_env()
+    options = options or options_from_env(plan)
+    # 워커별 풀 크기는 app.database가 import될 때 읽으므로 앱을 로드하기 전에 지정합니다.
+    os.environ.update(plan.database_env())
+
+    class _Server(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from .main import app
+
+            if options["preload_app"]:
+                # import 시점에 만들어진 객체를 GC 대상에서 빼서, 워커에서 GC가 공유 페이지를 건드리지 않도록 합니다.
+                gc.freeze()
+            return app
+
+    logger.info(
+        "starting %d workers (cpus=%d, pool_size=%d, max_overflow=%d, max_connections=%d)",
+        plan.workers,
+        plan.cpus,
+        plan.pool_size,
+        plan.max_overflow,
+        plan.max_connections,
+    )
+    _Server().run()
+
+
+if __name__ == "__main__":
+    run()
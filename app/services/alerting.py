@@ -1,41 +1,292 @@
+import atexit
 import os
+import queue
 import smtplib
+import threading
+import time
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+
 from dotenv import load_dotenv
 import pandas as pd
 
 # 1. 방금 만든 로거를 가져옵니다.
-from app.logger_config import logger
+from app.logger_config import get_logger
+
+logger = get_logger("alerting")
 
 load_dotenv()
 
+# 알림 메일에 포함할 탐지 결과의 최대 행 수
+DEFAULT_TOP_N = 20
+
+
+def summarize_findings(findings_df: pd.DataFrame, top_n: int = DEFAULT_TOP_N) -> str:
+    """탐지 결과 전체 대신 앞쪽 top_n 행만 문자열로 만들고, 생략된 행 수를 덧붙입니다."""
+    if findings_df is None or findings_df.empty:
+        return "(탐지 데이터 없음)"
+    summary = findings_df.head(top_n).to_string()
+    if len(findings_df) > top_n:
+        summary += (
+            f"\n... 외 {len(findings_df) - top_n}행 생략 (총 {len(findings_df)}행)"
+        )
+    return summary
+
+
+@dataclass
+class Alert:
+    rule: str
+    subject: str
+    body: str
+    findings: str
+    suppressed: int = 0
+    created_at: float = field(default_factory=time.time)
+
+
+class AlertDispatcher:
+    """
+    알림을 큐에 받아 별도 스레드에서 발송하는 디스패처.
+    - 규칙(rule)별 중복 억제 윈도우 안에서 같은 규칙의 알림은 한 번만 보냅니다.
+    - digest_interval 동안 모인 알림을 하나의 요약 메일로 묶어 보냅니다.
+    - SMTP 세션을 재사용하고, 발송 실패 시 세션을 다시 맺어 재시도합니다.
+    """
+
+    def __init__(
+        self,
+        sender: str,
+        receiver: str,
+        password: str,
+        host: str = "smtp.gmail.com",
+        port: int = 465,
+        use_ssl: bool = True,
+        dedup_window: float = 600.0,
+        digest_interval: float = 30.0,
+        max_batch: int = 50,
+        top_n: int = DEFAULT_TOP_N,
+        max_retries: int = 3,
+        retry_backoff: float = 2.0,
+        idle_timeout: float = 120.0,
+    ):
+        self.sender = sender
+        self.receiver = receiver
+        self.password = password
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.dedup_window = dedup_window
+        self.digest_interval = digest_interval
+        self.max_batch = max_batch
+        self.top_n = top_n
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idle_timeout = idle_timeout
+
+        self._queue = queue.Queue()
+        self._last_alerted = {}
+        self._suppressed = {}
+        self._dedup_lock = threading.Lock()
+        self._smtp = None
+        self._last_used = 0.0
+        self._stopping = threading.Event()
+        self._thread = None
+        self.sent_messages = 0
+        self.failed_messages = 0
+
+    # --- 호출자 쪽 API (논블로킹) ---
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="alert-dispatcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def submit(
+        self, rule: str, subject: str, body: str, findings_df: pd.DataFrame = None
+    ) -> bool:
+        """알림을 큐에 넣습니다. 중복 억제 윈도우에 걸려 버려지면 False를 반환합니다."""
+        now = time.monotonic()
+        with self._dedup_lock:
+            last = self._last_alerted.get(rule)
+            if last is not None and now - last < self.dedup_window:
+                self._suppressed[rule] = self._suppressed.get(rule, 0) + 1
+                logger.info("중복 알림 억제: rule=%s", rule)
+                return False
+            self._last_alerted[rule] = now
+            suppressed = self._suppressed.pop(rule, 0)
+
+        self._queue.put(
+            Alert(
+                rule=rule,
+                subject=subject,
+                body=body,
+                findings=summarize_findings(findings_df, self.top_n),
+                suppressed=suppressed,
+            )
+        )
+        return True
+
+    def flush(self):
+        """큐에 들어간 알림이 모두 처리될 때까지 기다립니다."""
+        self._queue.join()
+
+    def stop(self, flush: bool = True):
+        if flush and self._thread is not None and self._thread.is_alive():
+            self.flush()
+        self._stopping.set()
+        if self._thread is not None:
+            self._queue.put(None)  # 대기 중인 발송 스레드를 깨웁니다.
+            self._thread.join(timeout=5)
+        self._close_session()
+
+    # --- 발송 스레드 ---
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                first = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                if self._smtp is not None:
+                    if time.monotonic() - self._last_used > self.idle_timeout:
+                        self._close_session()
+                continue
+            if first is None:
+                self._queue.task_done()
+                break
 
-def send_email_alert(subject: str, body: str, findings_df: pd.DataFrame):
+            batch = [first]
+            deadline = time.monotonic() + self.digest_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    alert = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if alert is None:
+                    self._queue.task_done()
+                    self._stopping.set()
+                    break
+                batch.append(alert)
+
+            try:
+                self._deliver(self._build_message(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _build_message(self, batch) -> EmailMessage:
+        if len(batch) == 1:
+            subject = batch[0].subject
+        else:
+            subject = f"[모니터링 알림] {len(batch)}건의 이상 징후 요약"
+
+        sections = []
+        for alert in batch:
+            created = time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.localtime(alert.created_at)
+            )
+            section = f"■ {alert.subject} ({created})\n{alert.body}\n"
+            if alert.suppressed:
+                section += f"(직전 윈도우에서 중복 억제된 알림 {alert.suppressed}건)\n"
+            section += f"\nDetected Data:\n{alert.findings}\n"
+            sections.append(section)
+
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = self.sender
+        message["To"] = self.receiver
+        message.set_content("\n\n".join(sections))
+        return message
+
+    def _session(self):
+        if self._smtp is None:
+            smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+            self._smtp = smtp_class(self.host, self.port, timeout=30)
+            logger.info("%s:%s 서버에 연결 성공", self.host, self.port)
+            self._smtp.login(self.sender, self.password)
+            logger.info("'%s' 계정으로 로그인 성공", self.sender)
+        return self._smtp
+
+    def _close_session(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+    def _deliver(self, message: EmailMessage):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                logger.info(
+                    "이메일 발송 시도 %d/%d: (발신: %s, 수신: %s)",
+                    attempt,
+                    self.max_retries,
+                    self.sender,
+                    self.receiver,
+                )
+                self._session().send_message(message)
+                self._last_used = time.monotonic()
+                self.sent_messages += 1
+                logger.info("✅ 이메일 알림을 성공적으로 발송했습니다.")
+                return
+            except Exception:
+                # 끊긴 세션일 수 있으므로 닫고, 다음 시도에서 새로 연결합니다.
+                self._close_session()
+                if attempt == self.max_retries:
+                    self.failed_messages += 1
+                    logger.error("❌ 이메일 발송 중 에러 발생", exc_info=True)
+                    return
+                logger.warning("이메일 발송 실패, %d회차 재시도 예정", attempt)
+                time.sleep(self.retry_backoff * attempt)
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """환경 변수로 설정된 전역 디스패처를 반환합니다. 이메일 정보가 없으면 None."""
+    global _dispatcher
     SENDER = os.getenv("SENDER_EMAIL")
     RECEIVER = os.getenv("RECEIVER_EMAIL")
     PASSWORD = os.getenv("EMAIL_APP_PASSWORD")
-
     if not all([SENDER, RECEIVER, PASSWORD]):
+        return None
+
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = AlertDispatcher(
+                SENDER,
+                RECEIVER,
+                PASSWORD,
+                host=os.getenv("SMTP_HOST", "smtp.gmail.com"),
+                port=int(os.getenv("SMTP_PORT", "465")),
+                dedup_window=float(os.getenv("ALERT_DEDUP_WINDOW_SECONDS", "600")),
+                digest_interval=float(os.getenv("ALERT_DIGEST_INTERVAL_SECONDS", "30")),
+            ).start()
+            # 프로세스 종료 전에 큐에 남은 알림을 모두 발송합니다.
+            atexit.register(_dispatcher.stop)
+        return _dispatcher
+
+
+def send_email_alert(
+    subject: str, body: str, findings_df: pd.DataFrame, rule: str = None
+):
+    """
+    알림을 디스패처 큐에 넣고 즉시 반환합니다. 실제 발송은 백그라운드 스레드에서
+    중복 억제와 요약(digest) 묶음을 거쳐 이루어집니다. rule을 생략하면 제목을 규칙 키로 씁니다.
+    """
+    dispatcher = get_dispatcher()
+    if dispatcher is None:
         # 2. print 대신 logger.warning 사용
         logger.warning(
             "이메일 정보(SENDER, RECEIVER, PASSWORD)가 .env 파일에 설정되지 않았습니다. 시뮬레이션 모드로 작동합니다."
         )
         return
 
-    try:
-        # 3. 이메일 발송 시도 전/후에 INFO 레벨 로그 기록
-        logger.info(f"이메일 발송 시도: (발신: {SENDER}, 수신: {RECEIVER})")
-        message = (
-            f"Subject: {subject}\n\n{body}\n\nDetected Data:\n{findings_df.to_string()}"
-        )
-
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            logger.info("smtp.gmail.com:465 서버에 연결 성공")
-            server.login(SENDER, PASSWORD)
-            logger.info(f"'{SENDER}' 계정으로 로그인 성공")
-            server.sendmail(SENDER, RECEIVER, message.encode("utf-8"))
-
-        logger.info("✅ 이메일 알림을 성공적으로 발송했습니다.")
-
-    except Exception:
-        # 4. (핵심) 에러 발생 시, 에러의 전체 추적 내용을 로그로 남깁니다.
-        logger.error("❌ 이메일 발송 중 에러 발생", exc_info=True)
+    dispatcher.submit(rule or subject, subject, body, findings_df)
@@ -0,0 +1,191 @@
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+
+from app.logger_config import get_logger
+from app.services.log_aggregates import IncrementalLogAggregator
+
+logger = get_logger("analytics_summary")
+
+DEFAULT_REFRESH_INTERVAL = 30.0
+
+
+SUMMARY_FILE = "summary.json"
+LEADER_LOCK_FILE = "summary.lock"
+
+
+class AnalyticsSummaryCache:
+    """
+    대시보드용 KPI/시계열/상위 엔드포인트 요약을 백그라운드 스레드가 주기적으로 갱신하고,
+    직렬화된 JSON 본문과 ETag를 메모리에 보관합니다. 요청 처리 경로에서는 DB에 접근하지 않습니다.
+
+    shared_dir을 지정하면 같은 호스트의 gunicorn 워커들 중 잠금 파일(flock)을 잡은 한 워커(리더)만
+    DB를 집계해 shared_dir/summary.json에 본문과 ETag를 쓰고, 나머지 워커는 그 파일을 읽어 제공합니다.
+    따라서 DB 부하는 워커 수와 무관하고, 모든 워커가 같은 ETag를 돌려주어 If-None-Match가 워커를 바꿔도 맞습니다.
+    리더 워커가 종료되면 잠금이 풀리고, 다음 주기에 다른 워커가 리더를 이어받습니다.
+    shared_dir이 None이면 프로세스 혼자 집계합니다. (단일 프로세스/테스트)
+    """
+
+    def __init__(
+        self,
+        engine,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        shared_dir: str = None,
+    ):
+        self.engine = engine
+        self.refresh_interval = refresh_interval
+        self.shared_dir = shared_dir
+        self.aggregator = IncrementalLogAggregator()
+        self.body = None
+        self.etag = None
+        self.generated_at = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._leader_lock = None  # 리더일 때 flock을 잡고 있는 파일
+        self._loaded_mtime = None
+        if shared_dir is not None:
+            os.makedirs(shared_dir, exist_ok=True)
+
+    @property
+    def is_leader(self) -> bool:
+        return self.shared_dir is None or self._leader_lock is not None
+
+    def _try_lead(self) -> bool:
+        """잠금 파일을 논블로킹으로 잡아 리더가 되어 봅니다. 이미 리더면 True"""
+        if self.is_leader:
+            return True
+        f = open(os.path.join(self.shared_dir, LEADER_LOCK_FILE), "a")
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            return False
+        self._leader_lock = f
+        # 새로 집계하는 동안에는 이전 리더가 마지막으로 쓴 요약을 그대로 제공합니다.
+        self._load()
+        logger.info("analytics summary leader: pid %d", os.getpid())
+        return True
+
+    def _release_leadership(self):
+        if self._leader_lock is not None:
+            self._leader_lock.close()  # 파일을 닫으면 flock도 풀립니다.
+            self._leader_lock = None
+
+    def refresh(self) -> bool:
+        """새 로그를 집계해 요약을 다시 만듭니다. 내용이 바뀌었으면 True를 반환합니다."""
+        with self._lock:
+            new_rows = self.aggregator.refresh(self.engine)
+            if self.body is not None and new_rows == 0:
+                return False
+
+            generated_at = time.time()
+            payload = self._build_payload()
+            body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+            etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+            changed = etag != self.etag
+            self.body, self.etag, self.generated_at = body, etag, generated_at
+            if changed and self.shared_dir is not None:
+                self._publish()
+            return changed
+
+    def _publish(self):
+        # 임시 파일에 쓴 뒤 교체하여, 다른 워커가 쓰다 만 파일을 읽지 않도록 합니다.
+        path = os.path.join(self.shared_dir, SUMMARY_FILE)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "etag": self.etag,
+                    "generated_at": self.generated_at,
+                    "body": self.body,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
+        self._loaded_mtime = os.stat(path).st_mtime_ns
+
+    def _load(self) -> bool:
+        """리더가 쓴 요약 파일이 바뀌었으면 읽어 옵니다. (요청마다 stat 한 번)"""
+        path = os.path.join(self.shared_dir, SUMMARY_FILE)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            if mtime == self._loaded_mtime:
+                return False
+            with open(path, "r", encoding="utf-8") as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            return False
+        with self._lock:
+            self.body, self.etag = summary["body"], summary["etag"]
+            self.generated_at = summary["generated_at"]
+            self._loaded_mtime = mtime
+        return True
+
+    def sync(self) -> bool:
+        """한 번의 갱신 주기: 리더면 DB를 집계하고, 아니면 리더가 쓴 요약을 읽습니다."""
+        if self._try_lead():
+            return self.refresh()
+        return self._load()
+
+    def _build_payload(self) -> dict:
+        results = self.aggregator.results()
+        buckets = self.aggregator.buckets
+        total_requests = int(buckets["request_count"].sum()) if len(buckets) else 0
+        total_response_time = (
+            float(buckets["total_response_time_ms"].sum()) if len(buckets) else 0.0
+        )
+        return {
+            "kpis": {
+                "total_requests": total_requests,
+                "avg_response_time_ms": (
+                    total_response_time / total_requests if total_requests else None
+                ),
+                "watermark": int(self.aggregator.watermark),
+            },
+            # DataFrame은 records 형태로 직렬화합니다. (NaN은 null)
+            **{
+                name: json.loads(df.to_json(orient="records"))
+                for name, df in results.items()
+            },
+        }
+
+    def snapshot(self):
+        """
+        (JSON 본문, ETag)를 반환합니다. 한 번도 갱신되지 않았다면 리더(단일 프로세스 포함)는 즉시 갱신하고,
+        리더가 아닌 워커는 리더가 요약을 쓰기 전까지 (None, None)을 반환합니다.
+        """
+        if not self.is_leader:
+            self._load()
+        if self.body is None and self._try_lead():
+            self.refresh()
+        return self.body, self.etag
+
+    # --- 백그라운드 갱신 ---
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="analytics-summary-refresher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._release_leadership()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sync()
+            except Exception:
+                logger.error("분석 요약 갱신 중 에러 발생", exc_info=True)
+            self._stop_event.wait(self.refresh_interval)
@@ -0,0 +1,36 @@
+from sqlalchemy import select
+
+# 워터마크 아래에서 아직 보이지 않는 id(비어 있는 번호)를 다시 확인하는 범위
+DEFAULT_ID_LAG = 1_000
+
+
+def scan_id_gaps(conn, id_column, watermark: int, upper: int, gaps=(), id_lag=None):
+    """
+    max(id) 워터마크로 증분 처리할 때 늦게 커밋된 행을 놓치지 않기 위한 확인.
+    AUTO_INCREMENT id는 INSERT 시점에 정해지므로 커밋 순서와 다를 수 있습니다.
+
+    이전 gap 중 이번에 보이는 id(filled)와, (watermark, upper] 중 upper - id_lag 위에서
+    비어 있는 id(missing)를 반환합니다. 둘 다 기본 키 조회라 id_lag개 이하만 읽습니다.
+    """
+    id_lag = DEFAULT_ID_LAG if id_lag is None else id_lag
+    filled = set()
+    if gaps:
+        filled = set(
+            conn.execute(select(id_column).where(id_column.in_(sorted(gaps)))).scalars()
+        )
+    low = max(watermark, upper - id_lag)
+    seen = set(
+        conn.execute(
+            select(id_column).where(id_column > low, id_column <= upper)
+        ).scalars()
+    )
+    return filled, set(range(low + 1, upper + 1)) - seen
+
+
+def remaining_gaps(gaps, filled, missing, upper: int, id_lag=None) -> set:
+    """
+    다음 실행에서 다시 확인할 gap. 범위(upper - id_lag) 밖으로 밀려난 id는
+    롤백 등으로 영영 비어 있다고 보고 잊습니다.
+    """
+    id_lag = DEFAULT_ID_LAG if id_lag is None else id_lag
+    return {id_ for id_ in (set(gaps) - filled) | missing if id_ > upper - id_lag}
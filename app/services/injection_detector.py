@@ -0,0 +1,256 @@
+import atexit
+import datetime
+import json
+import os
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import insert
+
+from app.logger_config import get_logger
+from app.models import SecurityEvent
+
+logger = get_logger("injection_detector")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+# 컨테이너 이미지에도 같은 상대 경로로 복사됩니다. (Dockerfile) 다른 위치는 INJECTION_PAYLOADS_FILE로 지정합니다.
+DEFAULT_PAYLOADS_FILE = os.getenv(
+    "INJECTION_PAYLOADS_FILE",
+    os.path.join(PROJECT_ROOT, "penetration_tests", "payloads.json"),
+)
+
+# 공백 대신 쓰이는 인라인 주석(/**/)까지 구분자로 취급합니다.
+_SEPARATOR = r"(?:\s|/\*.*?\*/)+"
+# payloads.json 템플릿의 치환 자리 (%s, %d, <ATTACKER_DOMAIN> 등)
+_PLACEHOLDER = re.compile(r"%[sd]|<[A-Z_]+>")
+_INLINE_COMMENT = re.compile(r"/\*.*?\*/")
+
+# (규칙 이름, 정규식, 가중치). 앞에 있는 규칙이 같은 위치에서 먼저 선택되므로 구체적인 규칙을 앞에 둡니다.
+KEYWORD_RULES = [
+    ("union_select", rf"\bunion{_SEPARATOR}(?:all{_SEPARATOR})?select\b", 5),
+    ("time_delay", r"\b(?:sleep|benchmark|pg_sleep)\s*\(|\bwaitfor\s+delay\b", 5),
+    ("error_function", r"\b(?:extractvalue|updatexml)\s*\(", 5),
+    ("extended_procedure", r"\bxp_\w+", 5),
+    ("schema_probe", r"\binformation_schema\b|@@version", 4),
+    ("tautology", r"\b(?:or|and)\s+['\"]?\w+['\"]?\s*=\s*['\"]?\w+", 3),
+    ("stacked_query", r";\s*\w", 2),
+    ("comment", r"--|#|/\*", 2),
+    ("quote", r"'", 2),
+    ("boolean_keyword", r"\b(?:or|and)\b", 1),
+]
+TEMPLATE_WEIGHT = 5
+DEFAULT_THRESHOLD = 2
+# 템플릿 규칙의 '.*?'는 입력 길이에 대해 이차 시간이 걸리므로, 긴 입력은 앞/뒤 구간만 검사합니다.
+MAX_SCAN_LENGTH = 1024
+
+
+def template_pattern(template: str):
+    """
+    공격 페이로드 템플릿을 정규식으로 바꿉니다. 치환 자리는 '.*?'로, 공백/인라인 주석은 구분자로
+    일반화하므로 '%d'에 어떤 숫자가 들어가거나 공백 대신 /**/를 써도 같은 규칙에 걸립니다.
+    너무 짧아 키워드 규칙과 다를 바 없는 템플릿은 None을 반환합니다.
+    """
+    normalized = _INLINE_COMMENT.sub(" ", template).strip()
+    if len(normalized) < 6:
+        return None
+    parts = []
+    for literal in _PLACEHOLDER.split(normalized):
+        tokens = literal.split()
+        parts.append(
+            (r"\s*" if literal[:1].isspace() else "")
+            + _SEPARATOR.join(re.escape(token) for token in tokens)
+            + (r"\s*" if literal[-1:].isspace() else "")
+        )
+    return ".*?".join(parts)
+
+
+def load_payload_templates(filepath: str = DEFAULT_PAYLOADS_FILE) -> list:
+    if not os.path.exists(filepath):
+        # 템플릿 규칙 없이 키워드 규칙만으로 동작하게 되므로, 배포 누락을 알아챌 수 있도록 경고합니다.
+        logger.warning("페이로드 파일 %s가 없어 템플릿 규칙 없이 탐지합니다.", filepath)
+        return []
+    with open(filepath, "r", encoding="utf-8") as f:
+        scenarios = json.load(f).get("scenarios", [])
+    return [(s.get("id", s["name"]), s["payload"]) for s in scenarios]
+
+
+@dataclass
+class Detection:
+    score: int = 0
+    rules: list = field(default_factory=list)
+
+    @property
+    def rule_names(self) -> str:
+        return ",".join(self.rules)
+
+
+class InjectionDetector:
+    """
+    키워드 규칙과 payloads.json 템플릿을 이름 있는 그룹의 정규식 하나로 컴파일하여,
+    입력을 한 번만 훑으면서 일치한 규칙들의 가중치 합(score)을 계산합니다.
+    """
+
+    def __init__(
+        self,
+        templates=None,
+        keyword_rules=KEYWORD_RULES,
+        threshold: int = DEFAULT_THRESHOLD,
+        max_scan_length: int = MAX_SCAN_LENGTH,
+    ):
+        self.threshold = threshold
+        self.max_scan_length = max_scan_length
+        self.weights = {}
+        alternatives = []
+        templates = load_payload_templates() if templates is None else templates
+        rules = [
+            (f"payload:{rule_id}", template_pattern(payload), TEMPLATE_WEIGHT)
+            for rule_id, payload in templates
+        ]
+        rules += list(keyword_rules)
+        for index, (name, pattern, weight) in enumerate(rules):
+            if pattern is None:
+                continue
+            group = f"r{index}"
+            self.weights[group] = (name, weight)
+            alternatives.append(f"(?P<{group}>{pattern})")
+        self._pattern = re.compile("|".join(alternatives), re.IGNORECASE | re.DOTALL)
+
+    def scan(self, text: str) -> Detection:
+        """
+        max_scan_length보다 긴 입력은 앞과 뒤 max_scan_length자만 검사합니다.
+        (적대적인 긴 입력에서도 검사 시간이 수 ms를 넘지 않도록 제한)
+        """
+        detection = Detection()
+        limit = self.max_scan_length
+        windows = [text] if len(text) <= limit else [text[:limit], text[-limit:]]
+        for window in windows:
+            for match in self._pattern.finditer(window):
+                name, weight = self.weights[match.lastgroup]
+                if name not in detection.rules:
+                    detection.rules.append(name)
+                    detection.score += weight
+        return detection
+
+    def is_suspicious(self, detection: Detection) -> bool:
+        return detection.score >= self.threshold
+
+
+class SecurityEventSink:
+    """
+    탐지된 보안 이벤트를 요청 스레드에서 큐에 넣기만 하고, 백그라운드 스레드가 모아서
+    security_events에 한 번의 executemany로 기록합니다. 큐가 가득 차면 이벤트를 버리고 dropped를 늘립니다.
+    """
+
+    def __init__(
+        self,
+        engine,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_queue: int = 10_000,
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="security-event-sink", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def submit(self, event_type: str, ip_address: str, description: str, **extra):
+        """이벤트를 큐에 넣습니다. 요청 처리 경로에서는 DB에 접근하지 않습니다."""
+        event = {
+            "event_type": event_type,
+            "username": extra.get("username"),
+            "ip_address": ip_address,
+            "timestamp": datetime.datetime.now(datetime.timezone.utc),
+            "description": description[
+                : SecurityEvent.__table__.c.description.type.length
+            ],
+        }
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self):
+        """큐에 들어간 이벤트가 모두 기록될 때까지 기다립니다."""
+        self._queue.join()
+
+    def stop(self, flush: bool = True):
+        if self._thread is None:
+            return
+        if flush:
+            self.flush()
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                self._queue.task_done()
+                return
+            batch = [first]
+            stop = False
+            # 첫 이벤트부터 flush_interval이 지나면 이벤트가 계속 들어와도 기록합니다. (최대 지연 시간)
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    event = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if event is None:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                batch.append(event)
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(insert(SecurityEvent.__table__), batch)
+                self.written += len(batch)
+            except Exception:
+                logger.error("보안 이벤트 %d건 기록 실패", len(batch), exc_info=True)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+
+_detector = None
+_event_sink = None
+_lock = threading.Lock()
+
+
+def get_detector() -> InjectionDetector:
+    global _detector
+    with _lock:
+        if _detector is None:
+            _detector = InjectionDetector()
+        return _detector
+
+
+def get_event_sink() -> SecurityEventSink:
+    """애플리케이션 DB 엔진에 기록하는 전역 이벤트 싱크. 처음 사용할 때 기록 스레드를 시작합니다."""
+    global _event_sink
+    with _lock:
+        if _event_sink is None:
+            from app.database import engine
+
+            _event_sink = SecurityEventSink(engine).start()
+            atexit.register(_event_sink.stop)
+        return _event_sink
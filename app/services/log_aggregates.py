@@ -0,0 +1,220 @@
+import math
+import threading
+
+import pandas as pd
+from sqlalchemy import and_, case, func, literal_column, or_, select
+
+from app.models import AccessLog, Route
+from app.services.id_gaps import DEFAULT_ID_LAG, remaining_gaps, scan_id_gaps
+from app.services.quantile_sketch import (
+    DEFAULT_RELATIVE_ACCURACY,
+    MIN_VALUE_MS,
+    LatencySketch,
+    gamma_for,
+)
+
+# 증분 집계의 최소 단위: (시간 버킷, 엔드포인트, 메서드)
+KEY_COLUMNS = ["hour_bucket", "path", "method"]
+VALUE_COLUMNS = ["request_count", "total_response_time_ms", "max_response_time_ms"]
+# 엔드포인트/시간대별 응답 시간 스케치의 버킷 개수
+SKETCH_COLUMNS = ["hour_bucket", "path", "bin", "count"]
+PERCENTILES = {"p50": 0.50, "p95": 0.95, "p99": 0.99}
+
+
+def _hour_bucket(dialect_name: str):
+    """'YYYY-MM-DD HH' 형태의 시간 버킷 표현식을 DB 종류에 맞게 반환합니다."""
+    if dialect_name == "sqlite":
+        return func.strftime("%Y-%m-%d %H", AccessLog.timestamp)
+    return func.date_format(AccessLog.timestamp, "%Y-%m-%d %H")
+
+
+def _latency_bin():
+    """LatencySketch.add()와 같은 버킷 번호를 DB에서 계산하는 표현식"""
+    clamped = case(
+        (AccessLog.response_time_ms > MIN_VALUE_MS, AccessLog.response_time_ms),
+        else_=MIN_VALUE_MS,
+    )
+    log_gamma = math.log(gamma_for(DEFAULT_RELATIVE_ACCURACY))
+    return func.ceil(func.ln(clamped) / log_gamma)
+
+
+def _with_templates(df: pd.DataFrame, templates: dict) -> pd.DataFrame:
+    """'path' 열에 담긴 route_id를 경로 템플릿으로 바꿉니다."""
+    df["path"] = df["path"].map(templates)
+    return df
+
+
+class IncrementalLogAggregator:
+    """
+    access_logs를 워터마크(마지막으로 집계한 id) 기준으로 증분 집계합니다.
+    refresh()는 워터마크 이후의 새 행만 DB에서 시간/엔드포인트 단위로 집계하여
+    기존 버킷에 병합하므로, 전체 이력을 매번 다시 스캔하지 않습니다.
+
+    AUTO_INCREMENT id는 INSERT 시점에 정해지므로 트랜잭션이 커밋되는 순서와 다를 수 있습니다.
+    워터마크 바로 아래 id_lag개 범위에서 비어 있던 id를 기억해 두었다가 다음 refresh에서 다시 확인하고,
+    늦게 커밋된 행이 보이면 함께 집계합니다. (롤백으로 영영 비는 id는 범위를 벗어나면 잊습니다)
+    """
+
+    def __init__(self, id_lag: int = DEFAULT_ID_LAG):
+        self.watermark = 0
+        self.id_lag = id_lag
+        self.buckets = pd.DataFrame(columns=KEY_COLUMNS + VALUE_COLUMNS)
+        self.latency_bins = pd.DataFrame(columns=SKETCH_COLUMNS)
+        self._gaps = set()  # 워터마크 아래에서 아직 보이지 않은 id
+        self._lock = threading.Lock()
+
+    def refresh(self, engine) -> int:
+        """워터마크 이후의 새 로그를 집계하여 병합하고, 반영된 행 수를 반환합니다."""
+        with self._lock, engine.connect() as conn:
+            upper = conn.execute(select(func.max(AccessLog.id))).scalar()
+            if (upper is None or upper <= self.watermark) and not self._gaps:
+                return 0
+            upper = max(upper or 0, self.watermark)
+            filled, missing = scan_id_gaps(
+                conn, AccessLog.id, self.watermark, upper, self._gaps, self.id_lag
+            )
+            if upper == self.watermark and not filled:
+                return 0
+            rows = and_(AccessLog.id > self.watermark, AccessLog.id <= upper)
+            if filled:
+                rows = or_(rows, AccessLog.id.in_(sorted(filled)))
+
+            # 상한(upper)을 고정해 두어야 집계 도중 추가된 행이 다음 refresh에서 누락되지 않습니다.
+            # 경로는 정수 키(route_id)로 묶고, 집계가 끝난 뒤 routes 사전으로 템플릿을 붙입니다.
+            templates = dict(conn.execute(select(Route.id, Route.template)).all())
+            hour_bucket = _hour_bucket(conn.dialect.name).label("hour_bucket")
+            stmt = (
+                select(
+                    hour_bucket,
+                    AccessLog.route_id,
+                    AccessLog.method,
+                    func.count().label("request_count"),
+                    func.sum(AccessLog.response_time_ms).label(
+                        "total_response_time_ms"
+                    ),
+                    func.max(AccessLog.response_time_ms).label("max_response_time_ms"),
+                )
+                .where(rows)
+                .group_by(
+                    literal_column("hour_bucket"), AccessLog.route_id, AccessLog.method
+                )
+            )
+            delta = _with_templates(
+                pd.DataFrame(
+                    conn.execute(stmt).all(), columns=KEY_COLUMNS + VALUE_COLUMNS
+                ),
+                templates,
+            )
+
+            # 원본 행 대신 (시간대, 엔드포인트, 스케치 버킷)별 개수만 가져옵니다.
+            latency_bin = _latency_bin().label("bin")
+            sketch_stmt = (
+                select(hour_bucket, AccessLog.route_id, latency_bin, func.count())
+                .where(rows)
+                .group_by(
+                    literal_column("hour_bucket"),
+                    AccessLog.route_id,
+                    literal_column("bin"),
+                )
+            )
+            sketch_delta = _with_templates(
+                pd.DataFrame(conn.execute(sketch_stmt).all(), columns=SKETCH_COLUMNS),
+                templates,
+            )
+
+            self._merge(delta)
+            self._merge_latency_bins(sketch_delta)
+            self.watermark = upper
+            self._gaps = remaining_gaps(self._gaps, filled, missing, upper, self.id_lag)
+            return int(delta["request_count"].sum())
+
+    def _merge(self, delta: pd.DataFrame):
+        if delta.empty:
+            return
+        frames = [df for df in (self.buckets, delta) if not df.empty]
+        self.buckets = (
+            pd.concat(frames, ignore_index=True)
+            .groupby(KEY_COLUMNS, as_index=False)
+            .agg(
+                request_count=("request_count", "sum"),
+                total_response_time_ms=("total_response_time_ms", "sum"),
+                max_response_time_ms=("max_response_time_ms", "max"),
+            )
+        )
+
+    def _merge_latency_bins(self, delta: pd.DataFrame):
+        if delta.empty:
+            return
+        delta = delta.astype({"bin": "int64", "count": "int64"})
+        frames = [df for df in (self.latency_bins, delta) if not df.empty]
+        self.latency_bins = (
+            pd.concat(frames, ignore_index=True)
+            .groupby(["hour_bucket", "path", "bin"], as_index=False)["count"]
+            .sum()
+        )
+
+    def latency_sketches(self, since_hour_bucket: str = None) -> dict:
+        """시간대별 스케치를 병합하여 엔드포인트별 LatencySketch를 반환합니다."""
+        df = self.latency_bins
+        if since_hour_bucket is not None:
+            df = df[df["hour_bucket"] >= since_hour_bucket]
+        sketches = {}
+        for (path, index), count in df.groupby(["path", "bin"])["count"].sum().items():
+            sketches.setdefault(path, LatencySketch()).add_bin(int(index), int(count))
+        return sketches
+
+    # --- 분석 쿼리(1.1 ~ 1.3)와 같은 형태의 결과를 버킷에서 계산 ---
+
+    def time_series_requests(self) -> pd.DataFrame:
+        """쿼리 1.1: 시간대별 총 요청 수와 일 평균 요청 수"""
+        df = self.buckets
+        if df.empty:
+            return pd.DataFrame(
+                columns=["hour_of_day", "total_requests", "avg_requests_per_day"]
+            )
+        df = df.assign(
+            hour_of_day=df["hour_bucket"].str.slice(11, 13).astype(int),
+            request_date=df["hour_bucket"].str.slice(0, 10),
+        )
+        result = df.groupby("hour_of_day", as_index=False).agg(
+            total_requests=("request_count", "sum"),
+            days=("request_date", "nunique"),
+        )
+        result["avg_requests_per_day"] = result["total_requests"] / result["days"]
+        return result.drop(columns="days").sort_values("hour_of_day")
+
+    def top_endpoints(self, limit: int = 10) -> pd.DataFrame:
+        """쿼리 1.2: 가장 많이 요청된 엔드포인트"""
+        result = self.buckets.groupby(["path", "method"], as_index=False).agg(
+            request_count=("request_count", "sum")
+        )
+        return result.sort_values("request_count", ascending=False).head(limit)
+
+    def endpoint_response_times(self) -> pd.DataFrame:
+        """쿼리 1.3: 엔드포인트별 평균/최대 응답 시간과 스케치 기반 p50/p95/p99"""
+        result = self.buckets.groupby("path", as_index=False).agg(
+            request_count=("request_count", "sum"),
+            total_response_time_ms=("total_response_time_ms", "sum"),
+            max_response_time_ms=("max_response_time_ms", "max"),
+        )
+        result["avg_response_time_ms"] = (
+            result["total_response_time_ms"] / result["request_count"]
+        )
+        sketches = self.latency_sketches()
+        for column, q in PERCENTILES.items():
+            result[f"{column}_response_time_ms"] = [
+                sketches[path].quantile(q) if path in sketches else None
+                for path in result["path"]
+            ]
+        columns = ["path", "avg_response_time_ms", "max_response_time_ms"]
+        columns += [f"{column}_response_time_ms" for column in PERCENTILES]
+        return result[columns].sort_values("avg_response_time_ms", ascending=False)
+
+    def results(self) -> dict:
+        """대시보드가 사용하는 이름으로 집계 결과를 묶어 반환합니다."""
+        with self._lock:
+            return {
+                "time_series_requests": self.time_series_requests(),
+                "top_10_endpoints": self.top_endpoints(10),
+                "slowest_10_endpoints": self.endpoint_response_times(),
+            }
@@ -0,0 +1,542 @@
+import datetime
+import json
+import os
+
+import brotli
+import orjson
+import pandas as pd
+from sqlalchemy import delete, select
+
+from app.logger_config import get_logger
+from app.models import AccessLog, Route
+
+logger = get_logger("log_archive")
+
+MANIFEST_FILE = "manifest.json"
+PART_SUFFIX = ".ndjson.br"
+
+# 콜드 아카이브의 한 줄(JSON 객체)에 담기는 컬럼. path는 routes 사전의 경로 템플릿입니다.
+ARCHIVE_COLUMNS = [
+    "id",
+    "timestamp",
+    "ip_address",
+    "method",
+    "path",
+    "raw_path",
+    "status_code",
+    "response_time_ms",
+    "event_type",
+    "details",
+]
+
+
+def _select_access_logs():
+    columns = [
+        Route.template.label(name) if name == "path" else AccessLog.__table__.c[name]
+        for name in ARCHIVE_COLUMNS
+    ]
+    return select(*columns).join_from(AccessLog, Route, AccessLog.route_id == Route.id)
+
+
+def _naive_utc(value: datetime.datetime) -> datetime.datetime:
+    """DB의 timestamp는 UTC 기준 naive 값으로 다룹니다. aware 값은 UTC로 바꾼 뒤 tzinfo를 뗍니다."""
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _load_manifest(directory: str) -> dict:
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {"version": 1, "parts": [], "pending_delete": []}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(directory: str, manifest: dict):
+    # 임시 파일에 쓴 뒤 교체하여, 중단되더라도 manifest.json이 깨지지 않도록 합니다.
+    tmp_path = os.path.join(directory, MANIFEST_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST_FILE))
+
+
+def read_part(path: str) -> list:
+    """Brotli로 압축된 NDJSON 파트 파일 하나를 행(dict) 목록으로 읽습니다."""
+    with open(path, "rb") as f:
+        data = brotli.decompress(f.read())
+    return [orjson.loads(line) for line in data.splitlines() if line]
+
+
+class _PartWriter:
+    """하루치 행을 Brotli 스트림으로 압축해 임시 파일에 쓰고, close()에서 최종 이름으로 교체합니다."""
+
+    def __init__(self, directory: str, day: str, first_id: int, quality: int):
+        self.file = f"{day}.{first_id}{PART_SUFFIX}"
+        self.path = os.path.join(directory, self.file)
+        self.day = day
+        self.rows = 0
+        self.min_id = self.max_id = first_id
+        self.min_timestamp = self.max_timestamp = None
+        self._compressor = brotli.Compressor(quality=quality)
+        self._f = open(self.path + ".tmp", "wb")
+
+    def write(self, row: dict):
+        self._f.write(self._compressor.process(orjson.dumps(row) + b"\n"))
+        self.rows += 1
+        self.min_id = min(self.min_id, row["id"])
+        self.max_id = max(self.max_id, row["id"])
+        timestamp = row["timestamp"]
+        if self.min_timestamp is None or timestamp < self.min_timestamp:
+            self.min_timestamp = timestamp
+        if self.max_timestamp is None or timestamp > self.max_timestamp:
+            self.max_timestamp = timestamp
+
+    def close(self) -> dict:
+        self._f.write(self._compressor.finish())
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._f.close()
+        os.replace(self.path + ".tmp", self.path)
+        return {
+            "file": self.file,
+            "day": self.day,
+            "rows": self.rows,
+            "min_id": self.min_id,
+            "max_id": self.max_id,
+            "min_timestamp": self.min_timestamp.isoformat(),
+            "max_timestamp": self.max_timestamp.isoformat(),
+            "bytes": os.path.getsize(self.path),
+        }
+
+    def abort(self):
+        self._f.close()
+        os.remove(self.path + ".tmp")
+
+
+class ColdArchive:
+    """
+    access_logs의 오래된 행을 일(UTC) 단위 Brotli NDJSON 파트 파일로 보관하는 디렉터리.
+    manifest.json에 파트별 행 수, id/시간 범위를 기록해 두므로, 시간 범위 조회 시
+    겹치는 파트만 열어 봅니다.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = _load_manifest(directory)
+
+    @property
+    def parts(self) -> list:
+        return self.manifest["parts"]
+
+    def parts_between(self, start=None, end=None) -> list:
+        """[start, end) 구간과 시간 범위가 겹치는 파트 목록"""
+        selected = []
+        for part in self.parts:
+            first = datetime.datetime.fromisoformat(part["min_timestamp"])
+            last = datetime.datetime.fromisoformat(part["max_timestamp"])
+            if (end is None or first < end) and (start is None or last >= start):
+                selected.append(part)
+        return selected
+
+    def read_frame(self, start=None, end=None) -> pd.DataFrame:
+        frames = []
+        for part in self.parts_between(start, end):
+            rows = read_part(os.path.join(self.directory, part["file"]))
+            frames.append(pd.DataFrame(rows, columns=ARCHIVE_COLUMNS))
+        frame = _concat(frames)
+        return _between(frame, start, end)
+
+    def _remove_incomplete_parts(self):
+        """이전 실행이 중단되며 남긴 임시 파일을 지웁니다. (manifest에 없는 파일이므로 안전합니다)"""
+        for name in os.listdir(self.directory):
+            if name.endswith(PART_SUFFIX + ".tmp"):
+                os.remove(os.path.join(self.directory, name))
+
+    def archive(
+        self,
+        engine,
+        older_than_days: int = 90,
+        chunk_size: int = 10_000,
+        quality: int = 9,
+        now: datetime.datetime = None,
+    ) -> dict:
+        """
+        now 기준 older_than_days일 전 자정(UTC)보다 오래된 행을 기본 키 순서의 청크로 읽어
+        파트 파일에 쓰고, 파일과 manifest가 디스크에 기록된 뒤에 핫 테이블에서 삭제합니다.
+        같은 날짜의 행이 나중에 들어오면 다음 실행에서 그 날짜의 새 파트로 추가됩니다.
+        """
+        # 이전 실행이 파일을 쓰고 삭제 전에 중단되었다면 삭제부터 마칩니다.
+        recovered = self.finish_pending_deletes(engine, chunk_size)
+        self._remove_incomplete_parts()
+
+        now = _naive_utc(now or datetime.datetime.now(datetime.timezone.utc))
+        cutoff = datetime.datetime.combine(now.date(), datetime.time()) - (
+            datetime.timedelta(days=older_than_days)
+        )
+        base = _select_access_logs().where(AccessLog.timestamp < cutoff)
+
+        writers = {}
+        last_id = 0
+        try:
+            with engine.connect() as conn:
+                while True:
+                    stmt = (
+                        base.where(AccessLog.id > last_id)
+                        .order_by(AccessLog.id)
+                        .limit(chunk_size)
+                    )
+                    rows = conn.execute(stmt).mappings().all()
+                    if not rows:
+                        break
+                    for row in rows:
+                        row = dict(row)
+                        row["timestamp"] = _naive_utc(row["timestamp"])
+                        day = row["timestamp"].date().isoformat()
+                        if day not in writers:
+                            writers[day] = _PartWriter(
+                                self.directory, day, row["id"], quality
+                            )
+                        writers[day].write(row)
+                    last_id = rows[-1]["id"]
+            new_parts = [writer.close() for writer in writers.values()]
+        except BaseException:
+            for writer in writers.values():
+                if not writer._f.closed:
+                    writer.abort()
+            raise
+
+        self.parts.extend(new_parts)
+        self.manifest["pending_delete"].extend(part["file"] for part in new_parts)
+        _save_manifest(self.directory, self.manifest)
+        deleted = self.finish_pending_deletes(engine, chunk_size)
+
+        archived = sum(part["rows"] for part in new_parts)
+        logger.info(
+            "access_logs %d rows archived into %d parts (cutoff=%s)",
+            archived,
+            len(new_parts),
+            cutoff.isoformat(),
+        )
+        return {
+            "cutoff": cutoff.isoformat(),
+            "archived_rows": archived,
+            "deleted_rows": deleted + recovered,
+            "parts": [part["file"] for part in new_parts],
+        }
+
+    def finish_pending_deletes(self, engine, chunk_size: int = 10_000) -> int:
+        """
+        파일로 옮겨진 행을 핫 테이블에서 삭제합니다. 삭제 대상 id는 파트 파일에서 읽으므로,
+        아카이브된 행만 정확히 지우며 중간에 중단된 뒤 다시 실행해도 안전합니다.
+        """
+        deleted = 0
+        while self.manifest["pending_delete"]:
+            name = self.manifest["pending_delete"][0]
+            ids = [row["id"] for row in read_part(os.path.join(self.directory, name))]
+            for i in range(0, len(ids), chunk_size):
+                with engine.begin() as conn:
+                    result = conn.execute(
+                        delete(AccessLog).where(
+                            AccessLog.id.in_(ids[i : i + chunk_size])
+                        )
+                    )
+                    deleted += result.rowcount
+            self.manifest["pending_delete"].pop(0)
+            _save_manifest(self.directory, self.manifest)
+        return deleted
+
+
+def archive_access_logs(engine, directory: str, **kwargs) -> dict:
+    return ColdArchive(directory).archive(engine, **kwargs)
+
+
+def _concat(frames: list) -> pd.DataFrame:
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        frame = pd.DataFrame(columns=ARCHIVE_COLUMNS)
+    else:
+        frame = pd.concat(frames, ignore_index=True)
+    frame["timestamp"] = pd.to_datetime(frame["timestamp"])
+    return frame
+
+
+def _between(frame: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    if start is not None:
+        frame = frame[frame["timestamp"] >= start]
+    if end is not None:
+        frame = frame[frame["timestamp"] < end]
+    return frame
+
+
+def iter_access_log_chunks(
+    engine, directory: str, start=None, end=None, chunk_size: int = 100_000
+):
+    """
+    [start, end) 구간의 access_logs를 콜드 파트 하나씩, 그 다음 핫 테이블에서 chunk_size행씩 DataFrame으로 내보냅니다.
+    한 번에 메모리에 올라가는 행은 파트 하나(하루치) 또는 청크 하나입니다.
+    아카이브 직후 삭제가 끝나기 전처럼 양쪽에 있는 행(pending_delete 파트의 id)은 핫 쪽에서 건너뜁니다.
+    """
+    start = _naive_utc(start) if start is not None else None
+    end = _naive_utc(end) if end is not None else None
+    archive = ColdArchive(directory)
+    for part in archive.parts_between(start, end):
+        rows = read_part(os.path.join(directory, part["file"]))
+        frame = _between(
+            _concat([pd.DataFrame(rows, columns=ARCHIVE_COLUMNS)]), start, end
+        )
+        if not frame.empty:
+            yield frame
+
+    archived_ids = set()
+    for name in archive.manifest["pending_delete"]:
+        archived_ids.update(
+            row["id"] for row in read_part(os.path.join(directory, name))
+        )
+
+    stmt = _select_access_logs().order_by(AccessLog.id)
+    if start is not None:
+        stmt = stmt.where(AccessLog.timestamp >= start)
+    if end is not None:
+        stmt = stmt.where(AccessLog.timestamp < end)
+    with engine.connect() as conn:
+        result = conn.execute(
+            stmt.execution_options(stream_results=True, max_row_buffer=chunk_size)
+        )
+        for rows in result.partitions(chunk_size):
+            frame = pd.DataFrame(rows, columns=ARCHIVE_COLUMNS)
+            frame["timestamp"] = frame["timestamp"].map(_naive_utc)
+            if archived_ids:
+                frame = frame[~frame["id"].isin(archived_ids)]
+            yield _concat([frame])
+
+
+def load_access_logs(
+    engine, directory: str, start=None, end=None, chunk_size: int = 100_000
+) -> pd.DataFrame:
+    """
+    [start, end) 구간의 access_logs를 핫 테이블과 콜드 아카이브에서 함께 읽어 하나의 DataFrame으로 합칩니다.
+    구간 전체를 메모리에 올리므로 짧은 구간 조회용입니다. 집계는 run_analysis()가 청크별로 처리합니다.
+    """
+    frames = list(iter_access_log_chunks(engine, directory, start, end, chunk_size))
+    frame = _concat(frames)
+    return frame.sort_values("id", kind="stable").reset_index(drop=True)
+
+
+# --- analysis_queries.sql의 access_logs 집계와 같은 결과 형태 (쿼리 2.1은 security_events 대상이라 제외) ---
+# 각 집계는 청크별 부분 집계(_partial_*)와, 부분 집계들을 이어 붙인 표로 최종 결과를 만드는 함수로 나뉩니다.
+# 부분 집계는 (경로, IP, 날짜 등) 키별 합계라서 크기가 행 수가 아니라 키 수에 비례합니다.
+
+
+def _partial_requests_by_hour(logs: pd.DataFrame) -> pd.DataFrame:
+    return (
+        logs.assign(
+            hour_of_day=logs["timestamp"].dt.hour, day=logs["timestamp"].dt.date
+        )
+        .groupby(["hour_of_day", "day"])
+        .size()
+        .rename("requests")
+        .reset_index()
+    )
+
+
+def _requests_by_hour(partials: pd.DataFrame) -> pd.DataFrame:
+    result = partials.groupby("hour_of_day").agg(
+        total_requests=("requests", "sum"), days=("day", "nunique")
+    )
+    result["avg_requests_per_day"] = result["total_requests"] / result["days"]
+    return result.reset_index()[
+        ["hour_of_day", "total_requests", "avg_requests_per_day"]
+    ]
+
+
+def requests_by_hour(logs: pd.DataFrame) -> pd.DataFrame:
+    """쿼리 1.1: 시간대별 총 요청 수와 일 평균 요청 수"""
+    return _requests_by_hour(_partial_requests_by_hour(logs))
+
+
+def _partial_endpoint_counts(logs: pd.DataFrame) -> pd.DataFrame:
+    return logs.groupby(["path", "method"]).size().rename("request_count").reset_index()
+
+
+def _top_endpoints(partials: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
+    counts = partials.groupby(["path", "method"])["request_count"].sum()
+    counts = counts.reset_index().sort_values(
+        "request_count", ascending=False, kind="stable"
+    )
+    return counts.head(limit).reset_index(drop=True)
+
+
+def top_endpoints(logs: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
+    """쿼리 1.2: 가장 많이 요청된 (경로 템플릿, method) 조합"""
+    return _top_endpoints(_partial_endpoint_counts(logs), limit)
+
+
+def _partial_response_times(logs: pd.DataFrame) -> pd.DataFrame:
+    return (
+        logs.groupby("path")["response_time_ms"]
+        .agg(total_ms="sum", requests="count", max_response_time_ms="max")
+        .reset_index()
+    )
+
+
+def _endpoint_response_times(partials: pd.DataFrame) -> pd.DataFrame:
+    result = partials.groupby("path").agg(
+        total_ms=("total_ms", "sum"),
+        requests=("requests", "sum"),
+        max_response_time_ms=("max_response_time_ms", "max"),
+    )
+    result["avg_response_time_ms"] = result["total_ms"] / result["requests"]
+    return result.reset_index()[
+        ["path", "avg_response_time_ms", "max_response_time_ms"]
+    ].sort_values("avg_response_time_ms", ascending=False, kind="stable")
+
+
+def endpoint_response_times(logs: pd.DataFrame) -> pd.DataFrame:
+    """쿼리 1.3: 엔드포인트별 평균 및 최대 응답 시간"""
+    return _endpoint_response_times(_partial_response_times(logs))
+
+
+def _full_paths(logs: pd.DataFrame) -> pd.Series:
+    return logs["raw_path"].fillna(logs["path"])
+
+
+def _partial_not_found(logs: pd.DataFrame) -> pd.DataFrame:
+    not_found = logs[logs["status_code"] == 404].assign(full_path=_full_paths)
+    return (
+        not_found.groupby(["ip_address", "full_path"])
+        .agg(not_found_count=("id", "size"), first_id=("id", "min"))
+        .reset_index()
+    )
+
+
+def _not_found_by_ip(partials: pd.DataFrame, min_count: int = 10) -> pd.DataFrame:
+    paths = (
+        partials.groupby(["ip_address", "full_path"])
+        .agg(not_found_count=("not_found_count", "sum"), first_id=("first_id", "min"))
+        .reset_index()
+        # 스캔한 경로는 처음 요청된 순서(id 순)로 나열합니다.
+        .sort_values("first_id", kind="stable")
+    )
+    result = paths.groupby("ip_address").agg(
+        not_found_count=("not_found_count", "sum"),
+        scanned_paths=("full_path", ", ".join),
+    )
+    result = result[result["not_found_count"] >= min_count].reset_index()
+    return result.sort_values(
+        "not_found_count", ascending=False, kind="stable"
+    ).reset_index(drop=True)
+
+
+def not_found_by_ip(logs: pd.DataFrame, min_count: int = 10) -> pd.DataFrame:
+    """쿼리 2.2: 404 응답이 기준치 이상 발생한 IP와 스캔한 경로 목록"""
+    return _not_found_by_ip(_partial_not_found(logs), min_count)
+
+
+def _partial_sql_injection_attempts(logs: pd.DataFrame) -> pd.DataFrame:
+    attempts = logs[logs["event_type"] == "SQL_INJECTION_ATTEMPT"]
+    return attempts.assign(path=_full_paths)[
+        ["id", "timestamp", "ip_address", "path", "details"]
+    ]
+
+
+def _sql_injection_attempts(partials: pd.DataFrame) -> pd.DataFrame:
+    return partials.sort_values(
+        ["timestamp", "id"], ascending=[False, True], kind="stable"
+    ).reset_index(drop=True)
+
+
+def sql_injection_attempts(logs: pd.DataFrame) -> pd.DataFrame:
+    """쿼리 2.3: SQL Injection 시도 로그 상세"""
+    return _sql_injection_attempts(_partial_sql_injection_attempts(logs))
+
+
+def _partial_daily_requests(logs: pd.DataFrame) -> pd.DataFrame:
+    return (
+        logs.assign(request_date=logs["timestamp"].dt.date)
+        .groupby(["request_date", "ip_address"])
+        .size()
+        .rename("total_requests")
+        .reset_index()
+    )
+
+
+def _traffic_spikes(
+    partials: pd.DataFrame, ratio: int = 5, min_requests: int = 100
+) -> pd.DataFrame:
+    daily = (
+        partials.groupby(["request_date", "ip_address"])["total_requests"]
+        .sum()
+        .reset_index()
+    )
+    if daily.empty:
+        return daily.assign(previous_day_requests=pd.Series(dtype="int64"))
+    yesterday = daily.assign(
+        request_date=daily["request_date"] + datetime.timedelta(days=1)
+    ).rename(columns={"total_requests": "previous_day_requests"})
+    result = daily.merge(yesterday, on=["request_date", "ip_address"], how="left")
+    result["previous_day_requests"] = (
+        result["previous_day_requests"].fillna(0).astype("int64")
+    )
+    result = result[
+        (result["total_requests"] > result["previous_day_requests"] * ratio)
+        & (result["total_requests"] > min_requests)
+    ]
+    return result.sort_values(
+        ["request_date", "total_requests"], ascending=False, kind="stable"
+    ).reset_index(drop=True)
+
+
+def traffic_spikes(
+    logs: pd.DataFrame, ratio: int = 5, min_requests: int = 100
+) -> pd.DataFrame:
+    """쿼리 2.4: 전일 대비 요청 수가 급증한 IP"""
+    return _traffic_spikes(_partial_daily_requests(logs), ratio, min_requests)
+
+
+ANALYSIS_QUERIES = {
+    "1.1": requests_by_hour,
+    "1.2": top_endpoints,
+    "1.3": endpoint_response_times,
+    "2.2": not_found_by_ip,
+    "2.3": sql_injection_attempts,
+    "2.4": traffic_spikes,
+}
+
+# 쿼리 번호 -> (청크별 부분 집계, 부분 집계를 합쳐 최종 결과를 만드는 함수)
+PARTIAL_AGGREGATES = {
+    "1.1": (_partial_requests_by_hour, _requests_by_hour),
+    "1.2": (_partial_endpoint_counts, _top_endpoints),
+    "1.3": (_partial_response_times, _endpoint_response_times),
+    "2.2": (_partial_not_found, _not_found_by_ip),
+    "2.3": (_partial_sql_injection_attempts, _sql_injection_attempts),
+    "2.4": (_partial_daily_requests, _traffic_spikes),
+}
+
+
+def run_analysis(
+    engine,
+    directory: str,
+    query_id: str,
+    start=None,
+    end=None,
+    chunk_size: int = 100_000,
+    **params,
+) -> pd.DataFrame:
+    """
+    analysis_queries.sql의 쿼리 번호에 해당하는 집계를 핫 + 콜드 데이터의 [start, end) 구간에 실행합니다.
+    콜드 파트와 핫 테이블 청크마다 부분 집계만 남기고 행은 버리므로, 구간 전체를 메모리에 올리지 않습니다.
+    """
+    if query_id not in PARTIAL_AGGREGATES:
+        raise KeyError(query_id)
+    partial, finalize = PARTIAL_AGGREGATES[query_id]
+    partials = [
+        partial(chunk)
+        for chunk in iter_access_log_chunks(engine, directory, start, end, chunk_size)
+    ]
+    # 부분 집계가 하나도 없으면 빈 로그의 부분 집계로 결과 형태(컬럼)를 맞춥니다.
+    partials = [frame for frame in partials if not frame.empty] or [
+        partial(_concat([]))
+    ]
+    return finalize(pd.concat(partials, ignore_index=True), **params)
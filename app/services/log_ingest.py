@@ -0,0 +1,196 @@
+import datetime
+import gzip
+import ipaddress
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from sqlalchemy import insert
+
+from app.models import AccessLog, encode_access_log_rows
+
+# gunicorn 기본 access_log_format (%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s")
+# 뒤에 %(D)s/%(M)s 같은 응답 시간 필드를 하나 덧붙인 형식도 허용합니다.
+GUNICORN_PATTERN = re.compile(
+    r'(?P<ip>\S+) \S+ \S+ \[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<path>\S+)[^"]*" '
+    r'(?P<status>\d{3}) \S+(?: "[^"]*" "[^"]*")?(?: (?P<rt>\d+(?:\.\d+)?))?\s*$'
+)
+# uvicorn 액세스 로그 (INFO:     127.0.0.1:54321 - "GET /posts HTTP/1.1" 200 OK)
+# 로그 설정에 asctime이 포함되어 있으면 앞쪽의 'YYYY-MM-DD HH:MM:SS'를 타임스탬프로 사용합니다.
+UVICORN_PATTERN = re.compile(
+    r"(?:(?P<asctime>\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d)\S*\s.*?)?INFO:\s+"
+    r'(?P<ip>\[[^\]]+\]|[^\s:]+):\d+ - "(?P<method>[A-Z]+) (?P<path>\S+)[^"]*" '
+    r"(?P<status>\d{3})"
+)
+
+# 로그의 응답 시간 필드 단위 -> ms 변환 배율 (gunicorn: %(D)s=us, %(M)s=ms, %(T)s=s)
+TIME_UNITS = {"us": 0.001, "ms": 1.0, "s": 1000.0}
+PATH_MAX_LENGTH = AccessLog.__table__.c.raw_path.type.length
+LOGIN_PATH = "/users/login"
+
+
+@lru_cache(maxsize=4096)
+def _parse_clf_time(value: str) -> datetime.datetime:
+    """'10/Oct/2025:13:55:36 +0000' -> UTC datetime. 같은 초의 로그가 많으므로 결과를 캐시합니다."""
+    parsed = datetime.datetime.strptime(value, "%d/%b/%Y:%H:%M:%S %z")
+    return parsed.astimezone(datetime.timezone.utc)
+
+
+@lru_cache(maxsize=4096)
+def _parse_asctime(value: str) -> datetime.datetime:
+    parsed = datetime.datetime.fromisoformat(value)
+    return parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+def parse_line(
+    line: str, fallback_timestamp: datetime.datetime = None, time_unit: str = "us"
+):
+    """
+    액세스 로그 한 줄을 AccessLog 컬럼 딕셔너리로 변환합니다. 형식이 맞지 않거나 IP가 올바르지 않으면 None.
+    응답 시간이 기록되지 않은 형식(uvicorn 기본)은 response_time_ms를 0.0으로 둡니다.
+    """
+    match = GUNICORN_PATTERN.match(line)
+    if match:
+        timestamp = _parse_clf_time(match["time"])
+    else:
+        match = UVICORN_PATTERN.match(line)
+        if not match:
+            return None
+        asctime = match["asctime"]
+        timestamp = _parse_asctime(asctime) if asctime else fallback_timestamp
+
+    ip = match["ip"].strip("[]")
+    try:
+        ipaddress.ip_address(ip)
+    except ValueError:
+        return None
+
+    rt = match.groupdict().get("rt")
+    status_code = int(match["status"])
+    path = match["path"][:PATH_MAX_LENGTH]
+    return {
+        "ip_address": ip,
+        "timestamp": timestamp,
+        "method": match["method"],
+        "path": path,
+        "status_code": status_code,
+        "response_time_ms": float(rt) * TIME_UNITS[time_unit] if rt else 0.0,
+        "event_type": (
+            "FAILED_LOGIN"
+            if status_code == 401 and path.startswith(LOGIN_PATH)
+            else "NORMAL"
+        ),
+        "details": None,
+    }
+
+
+def _open_log(path: str):
+    """gzip 여부를 매직 넘버로 판별하여 바이너리 모드로 엽니다."""
+    with open(path, "rb") as f:
+        is_gzip = f.read(2) == b"\x1f\x8b"
+    return gzip.open(path, "rb") if is_gzip else open(path, "rb")
+
+
+class IngestCheckpoint:
+    """파일별로 마지막으로 커밋된 (압축 해제 기준) 바이트 오프셋을 JSON 파일에 저장합니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._state = json.load(f)
+
+    def get(self, log_path: str) -> dict:
+        with self._lock:
+            return dict(self._state.get(os.path.abspath(log_path), {}))
+
+    def set(self, log_path: str, state: dict):
+        with self._lock:
+            self._state[os.path.abspath(log_path)] = dict(state)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+@dataclass
+class IngestStats:
+    lines: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    batches: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        rate = self.lines / elapsed * 60 if elapsed else 0
+        return (
+            f"{self.lines:,}줄 처리, {self.inserted:,}행 적재, "
+            f"{self.skipped:,}줄 건너뜀, 배치 {self.batches}개 "
+            f"({elapsed:.2f}s, 분당 {rate:,.0f}줄)"
+        )
+
+
+def ingest_file(
+    engine,
+    log_path: str,
+    checkpoint: IngestCheckpoint,
+    batch_size: int = 10_000,
+    time_unit: str = "us",
+    stats: IngestStats = None,
+) -> IngestStats:
+    """
+    로그 파일을 한 줄씩 스트리밍으로 파싱하여 batch_size 단위의 Core executemany로 적재합니다.
+    배치가 커밋될 때마다 체크포인트에 오프셋을 기록하므로, 중단된 실행은 마지막 배치 이후부터 이어집니다.
+    (커밋과 체크포인트 기록 사이에 중단되면 마지막 배치 하나가 중복될 수 있습니다.)
+    """
+    stats = stats or IngestStats()
+    state = checkpoint.get(log_path)
+    offset = state.get("offset", 0)
+    size = os.path.getsize(log_path)
+    if size < state.get("size", 0):
+        # 파일이 더 작아졌다면 로테이션된 것으로 보고 처음부터 다시 읽습니다.
+        offset = 0
+
+    # 타임스탬프가 없는 uvicorn 로그는 파일 수정 시각을 사용합니다.
+    fallback_timestamp = datetime.datetime.fromtimestamp(
+        os.path.getmtime(log_path), tz=datetime.timezone.utc
+    )
+    stmt = insert(AccessLog.__table__)
+
+    def _flush(rows, offset):
+        if rows:
+            with engine.begin() as conn:
+                # path -> routes 사전 키(route_id)와 필요할 때만 남기는 raw_path로 변환
+                conn.execute(stmt, encode_access_log_rows(conn, rows))
+            stats.inserted += len(rows)
+            stats.batches += 1
+        checkpoint.set(log_path, {"offset": offset, "size": size})
+
+    rows = []
+    with _open_log(log_path) as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                # 아직 기록 중인 마지막 줄은 다음 실행에서 읽습니다.
+                break
+            offset += len(raw)
+            stats.lines += 1
+            row = parse_line(
+                raw.decode("utf-8", errors="replace"), fallback_timestamp, time_unit
+            )
+            if row is None:
+                stats.skipped += 1
+                continue
+            rows.append(row)
+            if len(rows) >= batch_size:
+                _flush(rows, offset)
+                rows = []
+    _flush(rows, offset)
+    return stats
@@ -0,0 +1,345 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+
+from app.models import AccessLog, Route
+from app.services.id_gaps import DEFAULT_ID_LAG, remaining_gaps
+from app.services.quantile_sketch import MIN_VALUE_MS, LatencySketch
+
+META_FILE = "meta.json"
+EPOCH = pd.Timestamp(0, tz="UTC")
+
+# 컬럼별 저장 형식. 문자열 컬럼은 사전(dictionary) 인코딩된 정수 코드로 저장합니다.
+COLUMN_DTYPES = {
+    "id": "int64",
+    "timestamp": "int64",  # UTC 기준 epoch 초
+    "status_code": "int16",
+    "response_time_ms": "float32",
+    "method": "int32",
+    "path": "int32",
+    "ip_address": "int32",
+    "event_type": "int32",
+}
+DICTIONARY_COLUMNS = ["method", "path", "ip_address", "event_type"]
+
+
+def _column_file(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}.bin")
+
+
+def _dictionary_file(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}.dict.jsonl")
+
+
+def _load_meta(directory: str) -> dict:
+    path = os.path.join(directory, META_FILE)
+    if not os.path.exists(path):
+        return {
+            "rows": 0,
+            "watermark": 0,
+            "gaps": [],
+            "columns": COLUMN_DTYPES,
+            "dictionary_sizes": {name: 0 for name in DICTIONARY_COLUMNS},
+        }
+    with open(path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    meta.setdefault("gaps", [])
+    if "dictionaries" in meta:
+        # 사전을 meta.json 안에 두던 이전 형식은 사전 파일로 옮깁니다.
+        dictionaries = meta.pop("dictionaries")
+        for name, values in dictionaries.items():
+            with open(_dictionary_file(directory, name), "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(v, ensure_ascii=False) + "\n" for v in values)
+        meta["dictionary_sizes"] = {
+            name: len(values) for name, values in dictionaries.items()
+        }
+        _save_meta(directory, meta)
+    return meta
+
+
+def _save_meta(directory: str, meta: dict):
+    # 임시 파일에 쓴 뒤 교체하여, 중단되더라도 meta.json이 깨지지 않도록 합니다.
+    tmp_path = os.path.join(directory, META_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(directory, META_FILE))
+
+
+def _load_dictionaries(directory: str, meta: dict) -> dict:
+    """
+    사전 파일(값 하나당 한 줄, 추가만 함)을 읽습니다. meta.json의 dictionary_sizes까지만 유효하므로,
+    중단된 쓰기가 남긴 뒷부분은 버립니다.
+    """
+    dictionaries = {}
+    for name, size in meta["dictionary_sizes"].items():
+        path = _dictionary_file(directory, name)
+        values = []
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                values = [json.loads(line) for _, line in zip(range(size), f)]
+        dictionaries[name] = values
+    return dictionaries
+
+
+class SnapshotWriter:
+    """
+    access_logs 컬럼을 NumPy 배열 파일(컬럼당 1개)에 이어 붙이는 스냅샷 작성기.
+    meta.json의 rows 값이 유효한 데이터의 길이이므로, 중간에 중단된 쓰기는
+    다음 append 시점에 잘라내고 다시 씁니다. 문자열 사전도 같은 방식으로 사전 파일에 추가만 하므로
+    청크마다 저장하는 meta.json은 사전 크기와 무관하게 작습니다.
+
+    워터마크(max(id)) 아래에서 비어 있던 id는 id_lag 범위 안에서 gaps로 기억해 두고,
+    다음 내보내기에서 늦게 커밋된 행이 보이면 함께 추가합니다. (app.services.id_gaps)
+    """
+
+    def __init__(self, directory: str, id_lag: int = DEFAULT_ID_LAG):
+        self.directory = directory
+        self.id_lag = id_lag
+        os.makedirs(directory, exist_ok=True)
+        self.meta = _load_meta(directory)
+        self.dictionaries = _load_dictionaries(directory, self.meta)
+        self._codes = {
+            name: {value: code for code, value in enumerate(values)}
+            for name, values in self.dictionaries.items()
+        }
+        self._truncate_to_meta()
+
+    @property
+    def watermark(self) -> int:
+        return self.meta["watermark"]
+
+    @property
+    def gaps(self) -> list:
+        return self.meta["gaps"]
+
+    def _truncate_to_meta(self):
+        for name, dtype in COLUMN_DTYPES.items():
+            path = _column_file(self.directory, name)
+            size = self.meta["rows"] * np.dtype(dtype).itemsize
+            with open(path, "ab") as f:
+                f.truncate(size)
+        for name, values in self.dictionaries.items():
+            with open(
+                _dictionary_file(self.directory, name), "w", encoding="utf-8"
+            ) as f:
+                f.writelines(json.dumps(v, ensure_ascii=False) + "\n" for v in values)
+
+    def _encode(self, name: str, values, added: list) -> np.ndarray:
+        """청크 단위로 factorize한 뒤, 청크 내 고유값만 전역 사전 코드로 변환합니다."""
+        local_codes, uniques = pd.factorize(pd.Series(values).fillna(""))
+        mapping = self._codes[name]
+        dictionary = self.dictionaries[name]
+        lookup = np.empty(len(uniques), dtype=COLUMN_DTYPES[name])
+        for i, value in enumerate(uniques):
+            code = mapping.get(value)
+            if code is None:
+                code = mapping[value] = len(dictionary)
+                dictionary.append(value)
+                added.append(value)
+            lookup[i] = code
+        return lookup[local_codes]
+
+    def append(self, chunk: pd.DataFrame):
+        """access_logs 컬럼 이름을 가진 DataFrame 청크를 스냅샷에 추가합니다."""
+        if chunk.empty:
+            return
+        timestamps = pd.to_datetime(chunk["timestamp"], utc=True)
+        epoch_seconds = (timestamps - EPOCH) // pd.Timedelta(seconds=1)
+        arrays = {
+            "id": chunk["id"].to_numpy(dtype="int64"),
+            "timestamp": epoch_seconds.to_numpy(dtype="int64"),
+            "status_code": chunk["status_code"].to_numpy(dtype="int16"),
+            "response_time_ms": chunk["response_time_ms"].to_numpy(dtype="float32"),
+        }
+        for name in DICTIONARY_COLUMNS:
+            added = []
+            arrays[name] = self._encode(name, chunk[name], added)
+            if added:
+                with open(
+                    _dictionary_file(self.directory, name), "a", encoding="utf-8"
+                ) as f:
+                    f.writelines(
+                        json.dumps(v, ensure_ascii=False) + "\n" for v in added
+                    )
+
+        for name, array in arrays.items():
+            with open(_column_file(self.directory, name), "ab") as f:
+                f.write(np.ascontiguousarray(array, dtype=COLUMN_DTYPES[name]).data)
+
+        # 워터마크 위의 id 중 청크에 없는 번호(id_lag 안)를 gap으로, 청크에 들어온 gap은 메워진 것으로 봅니다.
+        ids = set(arrays["id"].tolist())
+        watermark = self.meta["watermark"]
+        upper = max(watermark, int(arrays["id"].max()))
+        low = max(watermark, upper - self.id_lag)
+        missing = set(range(low + 1, upper + 1)) - ids
+        filled = ids & set(self.meta["gaps"])
+        self.meta["gaps"] = sorted(
+            remaining_gaps(self.meta["gaps"], filled, missing, upper, self.id_lag)
+        )
+        self.meta["rows"] += len(chunk)
+        self.meta["watermark"] = upper
+        self.meta["dictionary_sizes"] = {
+            name: len(values) for name, values in self.dictionaries.items()
+        }
+        _save_meta(self.directory, self.meta)
+
+
+def export_access_logs(
+    engine, directory: str, chunk_size: int = 100_000, id_lag: int = DEFAULT_ID_LAG
+) -> int:
+    """
+    스냅샷의 워터마크 이후 access_logs 행을 id 순으로 읽어 스냅샷에 추가합니다.
+    그 전에 지난번에 비어 있던 id(gaps) 중 그 사이 커밋된 행을 먼저 추가합니다.
+    """
+    writer = SnapshotWriter(directory, id_lag=id_lag)
+    # path는 routes 사전의 경로 템플릿으로, ip_address는 문자열로 변환된 값으로 내보냅니다.
+    columns = [
+        Route.template.label(name) if name == "path" else AccessLog.__table__.c[name]
+        for name in COLUMN_DTYPES
+    ]
+    base = select(*columns).join_from(AccessLog, Route, AccessLog.route_id == Route.id)
+
+    exported = 0
+    with engine.connect() as conn:
+        # 상한을 고정해 두어, 내보내는 도중 추가된 행은 다음 내보내기에서 gap 확인과 함께 처리합니다.
+        upper = conn.execute(select(func.max(AccessLog.id))).scalar() or 0
+        statements = []
+        if writer.gaps:
+            statements.append(base.where(AccessLog.id.in_(writer.gaps)))
+        if upper > writer.watermark:
+            statements.append(
+                base.where(AccessLog.id > writer.watermark, AccessLog.id <= upper)
+            )
+        for stmt in statements:
+            result = conn.execute(
+                stmt.order_by(AccessLog.id).execution_options(
+                    stream_results=True, max_row_buffer=chunk_size
+                )
+            )
+            for rows in result.partitions(chunk_size):
+                writer.append(pd.DataFrame(rows, columns=list(COLUMN_DTYPES)))
+                exported += len(rows)
+    return exported
+
+
+class LogSnapshot:
+    """스냅샷을 memory-map으로 열어 NumPy 벡터 연산으로 집계합니다. DB에 접근하지 않습니다."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta = _load_meta(directory)
+        self.rows = self.meta["rows"]
+        self.dictionaries = {
+            name: np.asarray(values, dtype=object)
+            for name, values in _load_dictionaries(directory, self.meta).items()
+        }
+        self._columns = {}
+
+    def __len__(self):
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._columns:
+            dtype = np.dtype(self.meta["columns"][name])
+            if self.rows == 0:
+                self._columns[name] = np.empty(0, dtype=dtype)
+            else:
+                self._columns[name] = np.memmap(
+                    _column_file(self.directory, name),
+                    dtype=dtype,
+                    mode="r",
+                    shape=(self.rows,),
+                )
+        return self._columns[name]
+
+    def decode(self, name: str, codes: np.ndarray) -> np.ndarray:
+        return self.dictionaries[name][codes]
+
+    # --- 분석 쿼리와 같은 형태의 집계 ---
+
+    def requests_by_hour(self) -> pd.DataFrame:
+        """쿼리 1.1: 시간대별 총 요청 수와 일 평균 요청 수"""
+        hours_since_epoch = self.column("timestamp") // 3600
+        total = np.bincount(hours_since_epoch % 24, minlength=24)
+        # (날짜, 시간) 조합이 몇 개 존재하는지로 시간대별 '일 수'를 구합니다. (정렬 없이 bincount 사용)
+        first_hour = hours_since_epoch.min() if self.rows else 0
+        seen_hours = np.flatnonzero(np.bincount(hours_since_epoch - first_hour))
+        days = np.bincount((seen_hours + first_hour) % 24, minlength=24)
+        hours = np.flatnonzero(total)
+        return pd.DataFrame(
+            {
+                "hour_of_day": hours,
+                "total_requests": total[hours],
+                "avg_requests_per_day": total[hours] / days[hours],
+            }
+        )
+
+    def top_endpoints(self, limit: int = 10) -> pd.DataFrame:
+        """쿼리 1.2: 가장 많이 요청된 (path, method) 조합"""
+        n_methods = max(len(self.dictionaries["method"]), 1)
+        keys = self.column("path").astype("int64") * n_methods + self.column("method")
+        counts = np.bincount(keys)
+        top = np.argsort(counts, kind="stable")[::-1][:limit]
+        top = top[counts[top] > 0]
+        return pd.DataFrame(
+            {
+                "path": self.decode("path", top // n_methods),
+                "method": self.decode("method", top % n_methods),
+                "request_count": counts[top],
+            }
+        )
+
+    def endpoint_response_times(self) -> pd.DataFrame:
+        """쿼리 1.3: 엔드포인트별 평균 및 최대 응답 시간"""
+        paths = self.column("path")
+        response_times = self.column("response_time_ms").astype("float64")
+        counts = np.bincount(paths)
+        totals = np.bincount(paths, weights=response_times)
+        maxima = np.full(len(counts), -np.inf)
+        np.maximum.at(maxima, paths, response_times)
+
+        present = np.flatnonzero(counts)
+        result = pd.DataFrame(
+            {
+                "path": self.decode("path", present),
+                "avg_response_time_ms": totals[present] / counts[present],
+                "max_response_time_ms": maxima[present],
+            }
+        )
+        return result.sort_values("avg_response_time_ms", ascending=False)
+
+    def endpoint_latency_sketches(self) -> dict:
+        """엔드포인트별 응답 시간 LatencySketch를 버킷 번호 bincount로 한 번에 만듭니다."""
+        sketch = LatencySketch()
+        paths = self.column("path").astype("int64")
+        values = np.maximum(self.column("response_time_ms"), MIN_VALUE_MS)
+        bins = np.ceil(np.log(values) / np.log(sketch.gamma)).astype("int64")
+        if self.rows == 0:
+            return {}
+
+        first_bin = bins.min()
+        n_bins = int(bins.max() - first_bin) + 1
+        counts = np.bincount(paths * n_bins + (bins - first_bin))
+        sketches = {}
+        for key in np.flatnonzero(counts):
+            path = self.dictionaries["path"][key // n_bins]
+            sketches.setdefault(path, LatencySketch()).add_bin(
+                int(key % n_bins + first_bin), int(counts[key])
+            )
+        return sketches
+
+    def not_found_by_ip(self, min_count: int = 10) -> pd.DataFrame:
+        """쿼리 2.2: 404 응답이 기준치 이상 발생한 IP"""
+        ips = self.column("ip_address")[self.column("status_code") == 404]
+        counts = np.bincount(ips, minlength=len(self.dictionaries["ip_address"]))
+        suspects = np.flatnonzero(counts >= min_count)
+        suspects = suspects[np.argsort(counts[suspects], kind="stable")[::-1]]
+        return pd.DataFrame(
+            {
+                "ip_address": self.decode("ip_address", suspects),
+                "not_found_count": counts[suspects],
+            }
+        )
@@ -0,0 +1,156 @@
+import gc
+import os
+import threading
+import tracemalloc
+from collections import OrderedDict
+
+from app.models import AccessLog, Post, SecurityEvent
+
+DEFAULT_ORM_MODELS = (Post, AccessLog, SecurityEvent)
+MAX_SNAPSHOTS = 10
+
+# tracemalloc 자체와 import 시스템의 할당은 비교 결과에서 제외합니다.
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class TracingNotStarted(Exception):
+    """tracemalloc이 꺼져 있어 스냅샷을 찍을 수 없을 때 발생합니다."""
+
+
+def current_rss_kb():
+    """현재 RSS(KB). /proc를 읽을 수 없는 환경에서는 None을 반환합니다."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def gc_stats() -> dict:
+    """세대별 수집 횟수/회수한 객체 수와 현재 추적 중인 객체 수, 수집 임계값"""
+    return {
+        "counts": list(gc.get_count()),
+        "thresholds": list(gc.get_threshold()),
+        "generations": [
+            {"generation": generation, **stats}
+            for generation, stats in enumerate(gc.get_stats())
+        ],
+        "garbage": len(gc.garbage),
+    }
+
+
+def orm_instance_counts(models=DEFAULT_ORM_MODELS) -> dict:
+    """
+    살아 있는 ORM 모델 인스턴스 수. gc가 추적하는 모든 객체를 훑으므로 워커 규모에 따라
+    수십~수백 ms가 걸릴 수 있어 요청 시에만 계산합니다.
+    """
+    counts = dict.fromkeys((model.__name__ for model in models), 0)
+    for obj in gc.get_objects():
+        if isinstance(obj, models):
+            counts[type(obj).__name__] = counts.get(type(obj).__name__, 0) + 1
+    return counts
+
+
+class MemoryDiagnostics:
+    """
+    tracemalloc을 켜고 끄며, 이름 붙인 스냅샷을 최근 max_snapshots개까지 보관합니다.
+    두 스냅샷(또는 스냅샷과 현재)을 파일/라인별로 비교해 증가량이 큰 순으로 돌려줍니다.
+    """
+
+    def __init__(self, max_snapshots: int = MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self._snapshots = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, nframes: int = 1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(nframes)
+
+    def stop(self):
+        """tracemalloc을 끕니다. 추적 정보가 사라지므로 보관한 스냅샷도 함께 비웁니다."""
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def _take(self):
+        if not tracemalloc.is_tracing():
+            raise TracingNotStarted()
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    def take_snapshot(self, name: str) -> dict:
+        snapshot = self._take()
+        with self._lock:
+            self._snapshots.pop(name, None)
+            self._snapshots[name] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return self._summary(name, snapshot)
+
+    def snapshots(self) -> list:
+        with self._lock:
+            items = list(self._snapshots.items())
+        return [self._summary(name, snapshot) for name, snapshot in items]
+
+    @staticmethod
+    def _summary(name, snapshot) -> dict:
+        stats = snapshot.statistics("filename")
+        return {
+            "name": name,
+            "traced_kb": round(sum(s.size for s in stats) / 1024, 1),
+            "blocks": sum(s.count for s in stats),
+        }
+
+    def _get(self, name: str):
+        with self._lock:
+            if name not in self._snapshots:
+                raise KeyError(name)
+            return self._snapshots[name]
+
+    def diff(
+        self, base: str, target: str = None, limit: int = 20, group_by="lineno"
+    ) -> list:
+        """base 대비 target(생략하면 현재)의 할당 증가량 상위 limit개. group_by는 'lineno' 또는 'filename'"""
+        base_snapshot = self._get(base)
+        target_snapshot = self._get(target) if target else self._take()
+        result = []
+        for stat in target_snapshot.compare_to(base_snapshot, group_by)[:limit]:
+            frame = stat.traceback[0]
+            result.append(
+                {
+                    "file": frame.filename,
+                    "line": frame.lineno if group_by == "lineno" else None,
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "count_diff": stat.count_diff,
+                    "size_kb": round(stat.size / 1024, 1),
+                    "count": stat.count,
+                }
+            )
+        return result
+
+    def report(self) -> dict:
+        traced = tracemalloc.get_traced_memory() if self.tracing else (0, 0)
+        return {
+            "pid": os.getpid(),
+            "rss_kb": current_rss_kb(),
+            "tracemalloc": {
+                "tracing": self.tracing,
+                "traced_kb": round(traced[0] / 1024, 1),
+                "peak_kb": round(traced[1] / 1024, 1),
+                "snapshots": [s["name"] for s in self.snapshots()],
+            },
+            "gc": gc_stats(),
+            "orm_instances": orm_instance_counts(),
+        }
+
+
+memory_diagnostics = MemoryDiagnostics()
@@ -0,0 +1,343 @@
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from sqlalchemy import and_, column, func, or_, select, table
+
+from app.logger_config import get_logger
+from app.services.alerting import send_email_alert
+from app.services.id_gaps import remaining_gaps, scan_id_gaps
+from app.services.streaming import collect_findings, stream_query
+
+logger = get_logger("monitoring")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_QUERIES_FILE = os.path.join(PROJECT_ROOT, "analysis_queries.sql")
+
+# 감시 대상 테이블. 쿼리의 'FROM <테이블>'을 최근 구간만 담은 파생 테이블로 바꿉니다.
+MONITORED_TABLES = ("access_logs", "security_events")
+_FROM_TABLE = re.compile(r"\bFROM\s+(" + "|".join(MONITORED_TABLES) + r")\b", re.I)
+# 이미 알린 탐지 결과를 기억하는 최소 기간(초). lookback이 더 길면 lookback + interval 동안 기억합니다.
+ALERTED_RETENTION = 24 * 3600
+
+
+@dataclass
+class MonitoringRule:
+    """analysis_queries.sql의 탐지 쿼리 하나를 주기적으로 실행하기 위한 규칙"""
+
+    name: str
+    query_id: str
+    interval: float  # 실행 주기 (초)
+    lookback: float  # 새 행 이전에 함께 살펴볼 구간 (초)
+    subject: str
+    body: str
+    # 같은 탐지 결과인지 가르는 컬럼. 이미 알린 키는 lookback 구간에 다시 나와도 알리지 않습니다.
+    # 비어 있으면 행 전체를 키로 씁니다.
+    key_columns: tuple = ()
+
+
+DEFAULT_RULES = [
+    MonitoringRule(
+        name="2.1_brute_force",
+        query_id="2.1",
+        interval=60,
+        lookback=24 * 3600,
+        subject="[보안 경고] Brute-Force 공격 시도가 탐지되었습니다.",
+        body="다음 IP 주소에서 비정상적인 로그인 시도가 감지되었습니다.",
+        key_columns=("ip_address", "username"),
+    ),
+    MonitoringRule(
+        name="2.2_web_scanner",
+        query_id="2.2",
+        interval=60,
+        lookback=3600,
+        subject="[보안 경고] 웹 스캐너 활동이 탐지되었습니다.",
+        body="다음 IP 주소에서 다수의 404 에러가 발생했습니다.",
+        key_columns=("ip_address",),
+    ),
+    MonitoringRule(
+        name="2.3_sqli_attempt",
+        query_id="2.3",
+        interval=60,
+        lookback=0,
+        subject="🔥 [보안 경고] SQL Injection 시도 기록이 발견되었습니다!",
+        body="다음 요청에서 SQL Injection 시도가 기록되었습니다.",
+        key_columns=("id",),
+    ),
+    MonitoringRule(
+        name="2.4_traffic_spike",
+        query_id="2.4",
+        interval=600,
+        lookback=2 * 24 * 3600,
+        subject="⚠️ [운영 경고] 비정상적인 트래픽 급증이 탐지되었습니다!",
+        body="전일 대비 요청 수가 급증한 IP가 있습니다.",
+        key_columns=("request_date", "ip_address"),
+    ),
+]
+
+
+def load_analysis_queries(filepath: str = DEFAULT_QUERIES_FILE) -> dict:
+    """SQL 파일을 읽어 '쿼리 X.X:' 주석을 기준으로 {번호: 쿼리} 딕셔너리를 만듭니다."""
+    with open(filepath, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    queries = {}
+    for query_block in (q.strip() for q in content.split(";")):
+        match = re.search(r"--\s*쿼리\s*([\d\.]+):", query_block)
+        if match:
+            queries[match.group(1)] = query_block
+    return queries
+
+
+def referenced_tables(query: str) -> list:
+    return sorted({match.lower() for match in _FROM_TABLE.findall(query)})
+
+
+def scope_query(query: str) -> str:
+    """
+    쿼리가 참조하는 감시 테이블을 '(lookback 시작 ~ 상한 id)' 범위의 파생 테이블로 바꿉니다.
+    파생 테이블에 원래 테이블 이름을 별칭으로 붙이므로 나머지 쿼리는 수정할 필요가 없습니다.
+    """
+
+    def _replace(match):
+        table = match.group(1).lower()
+        return (
+            f"FROM (SELECT * FROM {table} "
+            f"WHERE timestamp >= :since AND id <= :{table}_upper) AS {table}"
+        )
+
+    return _FROM_TABLE.sub(_replace, query)
+
+
+class WatermarkStore:
+    """
+    규칙별 상태를 JSON 파일에 저장합니다.
+    - watermarks: 테이블별로 마지막으로 처리한 id
+    - gaps: 워터마크 아래에서 아직 보이지 않은 id (늦게 커밋된 행을 다시 확인, app.services.id_gaps)
+    - alerted: 이미 알린 탐지 결과의 키와 알린 시각(epoch 초)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._state = json.load(f)
+
+    def _rule_state(self, rule_name: str) -> dict:
+        state = self._state.get(rule_name, {})
+        if "watermarks" not in state:
+            # 테이블별 id만 저장하던 이전 형식
+            state = {"watermarks": state}
+        return {
+            "watermarks": dict(state["watermarks"]),
+            "gaps": {t: list(ids) for t, ids in state.get("gaps", {}).items()},
+            "alerted": dict(state.get("alerted", {})),
+        }
+
+    def get(self, rule_name: str) -> dict:
+        with self._lock:
+            return self._rule_state(rule_name)["watermarks"]
+
+    def get_state(self, rule_name: str) -> dict:
+        with self._lock:
+            return self._rule_state(rule_name)
+
+    def set(
+        self, rule_name: str, watermarks: dict, gaps: dict = None, alerted: dict = None
+    ):
+        with self._lock:
+            state = self._rule_state(rule_name)
+            state["watermarks"] = dict(watermarks)
+            if gaps is not None:
+                state["gaps"] = {t: sorted(ids) for t, ids in gaps.items() if ids}
+            if alerted is not None:
+                state["alerted"] = dict(alerted)
+            self._state[rule_name] = state
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def _finding_key(values) -> str:
+    return hashlib.sha1(
+        json.dumps([str(v) for v in values], ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+class RuleScheduler:
+    """
+    모니터링 규칙을 주기적으로, 제한된 수의 DB 커넥션으로 동시에 실행합니다.
+    각 규칙은 워터마크 이후 새 행(또는 늦게 커밋된 워터마크 아래의 행)이 있을 때만 실행되며,
+    새 행과 lookback 구간만 조회합니다. lookback 구간에 다시 나온, 이미 알린 탐지 결과는 알리지 않습니다.
+    """
+
+    def __init__(
+        self,
+        engine,
+        rules,
+        watermarks: WatermarkStore,
+        queries: dict = None,
+        max_concurrency: int = 4,
+        alert=send_email_alert,
+        clock=time.time,
+    ):
+        self.engine = engine
+        self.rules = list(rules)
+        self.watermarks = watermarks
+        self.queries = queries if queries is not None else load_analysis_queries()
+        self.max_concurrency = max_concurrency
+        self.alert = alert
+        self.clock = clock
+        self._next_run = {rule.name: 0.0 for rule in self.rules}
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def _new_row_bounds(self, conn, table_name: str, watermark: int, gaps: list):
+        """
+        워터마크 이후의 새 행과 이번에 메워진 gap 행에 대한 (상한 id, 가장 이른 timestamp, 남은 gap)을
+        PK 범위로 조회합니다. 새 행이 없으면 None
+        """
+        t = table(table_name, column("id"), column("timestamp"))
+        upper = conn.execute(select(func.max(t.c.id))).scalar()
+        upper = max(upper or 0, watermark)
+        filled, missing = scan_id_gaps(conn, t.c.id, watermark, upper, gaps)
+        if upper == watermark and not filled:
+            return None
+        new_rows = and_(t.c.id > watermark, t.c.id <= upper)
+        if filled:
+            new_rows = or_(new_rows, t.c.id.in_(sorted(filled)))
+        earliest = conn.execute(
+            select(func.min(t.c.timestamp)).where(new_rows)
+        ).scalar()
+        return upper, earliest, remaining_gaps(gaps, filled, missing, upper)
+
+    def _unalerted(self, rule: MonitoringRule, chunks, alerted: dict, new_keys: set):
+        """이미 알린(또는 이번 실행에서 먼저 나온) 키의 행을 걸러 냅니다."""
+        for chunk in chunks:
+            columns = [c for c in rule.key_columns if c in chunk.columns]
+            keys = [
+                _finding_key(values)
+                for values in chunk[columns or list(chunk.columns)].itertuples(
+                    index=False
+                )
+            ]
+            mask = []
+            for key in keys:
+                fresh = key not in alerted and key not in new_keys
+                mask.append(fresh)
+                if fresh:
+                    new_keys.add(key)
+            yield chunk[mask]
+
+    def run_rule(self, rule: MonitoringRule):
+        """규칙을 한 번 실행합니다. 새 행이 없으면 None, 있으면 새로 탐지된 행 수를 반환합니다."""
+        query = self.queries.get(rule.query_id)
+        if not query:
+            logger.warning(
+                "쿼리 %s를 찾을 수 없어 '%s' 규칙을 건너뜁니다.",
+                rule.query_id,
+                rule.name,
+            )
+            return None
+
+        tables = referenced_tables(query)
+        state = self.watermarks.get_state(rule.name)
+        new_watermarks = {table: state["watermarks"].get(table, 0) for table in tables}
+        new_gaps = {table: state["gaps"].get(table, []) for table in tables}
+        has_new_rows = False
+        earliest_new = []
+        with self.engine.connect() as conn:
+            for table_name in tables:
+                bounds = self._new_row_bounds(
+                    conn, table_name, new_watermarks[table_name], new_gaps[table_name]
+                )
+                if bounds is not None:
+                    has_new_rows = True
+                    new_watermarks[table_name], earliest, new_gaps[table_name] = bounds
+                    # 새 행의 timestamp가 모두 NULL이면(security_events는 nullable) MIN()도 NULL입니다.
+                    if earliest is None:
+                        continue
+                    if isinstance(earliest, str):
+                        earliest = datetime.datetime.fromisoformat(earliest)
+                    earliest_new.append(earliest)
+
+        if not has_new_rows:
+            return None
+        if not earliest_new:
+            # timestamp가 NULL인 행은 'timestamp >= :since' 범위에 들지 않으므로 워터마크만 올립니다.
+            self.watermarks.set(rule.name, new_watermarks, new_gaps)
+            return 0
+
+        # 모든 테이블을 '가장 이른 새 행 - lookback' 이후, 이번 상한 id 이하로 제한합니다.
+        params = {
+            "since": min(earliest_new) - datetime.timedelta(seconds=rule.lookback)
+        }
+        for table_name in tables:
+            params[f"{table_name}_upper"] = new_watermarks[table_name]
+
+        now = self.clock()
+        retention = max(rule.lookback + rule.interval, ALERTED_RETENTION)
+        alerted = {
+            key: at for key, at in state["alerted"].items() if at >= now - retention
+        }
+        new_keys = set()
+        findings, total_rows = collect_findings(
+            self._unalerted(
+                rule,
+                stream_query(self.engine, scope_query(query), params=params),
+                alerted,
+                new_keys,
+            )
+        )
+        if total_rows:
+            logger.warning("🚨 '%s' 규칙에서 %d건 탐지", rule.name, total_rows)
+            self.alert(
+                subject=rule.subject,
+                body=f"{rule.body} (총 {total_rows}건)",
+                findings_df=findings,
+                rule=rule.name,
+            )
+        alerted.update((key, now) for key in new_keys)
+        self.watermarks.set(rule.name, new_watermarks, new_gaps, alerted)
+        return total_rows
+
+    def _run_and_release(self, rule: MonitoringRule):
+        try:
+            return self.run_rule(rule)
+        except Exception:
+            logger.error("'%s' 규칙 실행 중 에러 발생", rule.name, exc_info=True)
+        finally:
+            with self._lock:
+                self._running.discard(rule.name)
+
+    def run_pending(self, executor, now: float = None):
+        """실행 시각이 된 규칙을 executor에 제출하고, 제출한 future 목록을 반환합니다."""
+        now = time.monotonic() if now is None else now
+        futures = []
+        with self._lock:
+            for rule in self.rules:
+                if rule.name in self._running or self._next_run[rule.name] > now:
+                    continue
+                self._running.add(rule.name)
+                self._next_run[rule.name] = now + rule.interval
+                futures.append(executor.submit(self._run_and_release, rule))
+        return futures
+
+    def run_forever(self, stop_event: threading.Event = None, tick: float = 1.0):
+        stop_event = stop_event or threading.Event()
+        logger.info("모니터링 스케줄러 시작: 규칙 %d개", len(self.rules))
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="monitoring-rule"
+        ) as executor:
+            while not stop_event.is_set():
+                self.run_pending(executor)
+                stop_event.wait(tick)
@@ -0,0 +1,118 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from app.services.tracing import active_routes
+
+DEFAULT_HZ = 100
+MAX_DEPTH = 128
+
+# 워커(프로세스)당 하나의 프로파일만 실행되도록 막는 락
+_profile_lock = threading.Lock()
+
+
+class ProfileInProgress(Exception):
+    """이 워커에서 이미 프로파일이 실행 중일 때 발생합니다."""
+
+
+def _frame_label(code, cache: dict) -> str:
+    label = cache.get(code)
+    if label is None:
+        filename = os.path.basename(code.co_filename)
+        label = f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+        label = cache[code] = label.replace(";", ":")
+    return label
+
+
+class StackSampler:
+    """
+    별도 스레드가 1/hz초마다 sys._current_frames()로 모든 스레드의 스택을 읽어 collapsed-stack 형식
+    ("경로;바깥 함수;...;안쪽 함수" -> 샘플 수)으로 누적합니다. 시그널을 쓰지 않으므로 gunicorn 워커의
+    시그널 처리와 충돌하지 않고, 읽기 전용이라 프로파일 대상 코드의 실행을 멈추지 않습니다.
+    all_threads=False면 요청을 처리 중인(active_routes에 있는) 스레드만 샘플링합니다.
+    """
+
+    def __init__(self, hz: int = DEFAULT_HZ, all_threads: bool = False, exclude=()):
+        self.interval = 1.0 / hz
+        self.all_threads = all_threads
+        self.exclude = set(exclude)
+        self.stacks = Counter()
+        self.routes = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        exclude = self.exclude | {threading.get_ident()}
+        started = time.perf_counter()
+        next_tick = started
+        while not self._stop.is_set():
+            self.sample(exclude)
+            next_tick += self.interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # 샘플링이 밀렸으면 따라잡으려 하지 않고 다음 주기부터 다시 맞춥니다.
+                next_tick = time.perf_counter()
+        self.duration = time.perf_counter() - started
+
+    def sample(self, exclude=()):
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident in exclude:
+                continue
+            route = active_routes.get(ident)
+            if route is None:
+                if not self.all_threads:
+                    continue
+                route = f"[{thread_names.get(ident, ident)}]"
+            frames = []
+            while frame is not None and len(frames) < MAX_DEPTH:
+                frames.append(_frame_label(frame.f_code, self._labels))
+                frame = frame.f_back
+            frames.append(route)
+            self.stacks[";".join(reversed(frames))] += 1
+            self.routes[route] += 1
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope 등에 바로 넣을 수 있는 collapsed-stack 텍스트"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+def profile(seconds: float, hz: int = DEFAULT_HZ, all_threads: bool = False):
+    """
+    현재 프로세스를 seconds초 동안 샘플링한 StackSampler를 반환합니다. 기다리는 호출 스레드 자신은 제외합니다.
+    다른 프로파일이 실행 중이면 기다리지 않고 ProfileInProgress를 발생시킵니다.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfileInProgress()
+    try:
+        sampler = StackSampler(
+            hz=hz, all_threads=all_threads, exclude={threading.get_ident()}
+        ).start()
+        try:
+            time.sleep(seconds)
+        finally:
+            sampler.stop()
+        return sampler
+    finally:
+        _profile_lock.release()
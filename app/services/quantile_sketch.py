@@ -0,0 +1,89 @@
+import math
+
+# 상대 오차 1%: 추정한 p95 값이 실제 p95 값과 최대 1%까지만 차이납니다.
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# 이보다 작은 값(0 ms 포함)은 가장 작은 버킷에 함께 기록합니다.
+MIN_VALUE_MS = 0.001
+DEFAULT_MAX_BINS = 2048
+
+
+def gamma_for(relative_accuracy: float) -> float:
+    return (1 + relative_accuracy) / (1 - relative_accuracy)
+
+
+def bucket_index(value: float, gamma: float) -> int:
+    """값이 속한 로그 버킷 번호. 버킷 i는 (gamma^(i-1), gamma^i] 구간을 담당합니다."""
+    return math.ceil(math.log(max(value, MIN_VALUE_MS)) / math.log(gamma))
+
+
+class LatencySketch:
+    """
+    로그 스케일 버킷 기반의 병합 가능한 분위수 스케치 (DDSketch 방식).
+    버킷별 개수만 저장하므로 메모리가 일정하고, 같은 정확도의 스케치끼리는
+    버킷 개수를 더하는 것만으로 시간대/워커 간 병합이 가능합니다.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_bins: int = DEFAULT_MAX_BINS,
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy는 0과 1 사이여야 합니다.")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = gamma_for(relative_accuracy)
+        self.max_bins = max_bins
+        self.bins = {}
+        self.count = 0
+
+    def add(self, value: float, count: int = 1):
+        self.add_bin(bucket_index(value, self.gamma), count)
+
+    def add_bin(self, index: int, count: int):
+        """SQL 등에서 미리 계산한 버킷 번호와 개수를 그대로 반영합니다."""
+        if count <= 0:
+            return
+        self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+        if len(self.bins) > self.max_bins:
+            self._collapse_lowest()
+
+    def _collapse_lowest(self):
+        # 꼬리 지연(tail latency)의 정확도를 지키기 위해 가장 낮은 버킷들을 합칩니다.
+        indexes = sorted(self.bins)
+        overflow = len(indexes) - self.max_bins
+        target = indexes[overflow]
+        for index in indexes[:overflow]:
+            self.bins[target] += self.bins.pop(index)
+
+    def merge(self, other: "LatencySketch") -> "LatencySketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("정확도가 다른 스케치는 병합할 수 없습니다.")
+        for index, count in other.bins.items():
+            self.add_bin(index, count)
+        return self
+
+    def quantile(self, q: float):
+        """q(0~1) 분위수의 추정값을 반환합니다. 비어 있으면 None."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        cumulative = 0
+        for index in sorted(self.bins):
+            cumulative += self.bins[index]
+            if cumulative > rank:
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(index): count for index, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencySketch":
+        sketch = cls(relative_accuracy=data["relative_accuracy"])
+        for index, count in data["bins"].items():
+            sketch.add_bin(int(index), count)
+        return sketch
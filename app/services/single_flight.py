@@ -0,0 +1,127 @@
+import copy
+import threading
+
+from app.services.tracing import span
+
+# 이름별 SingleFlight 그룹 (/admin/single-flight에서 지표를 조회합니다)
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    """
+    팔로워에게 전달할 예외를 새 객체로 만듭니다. 같은 예외 객체를 여러 스레드에서 raise하면
+    __traceback__이 스레드마다 덧붙여져 서로의 트레이스백이 섞이기 때문입니다.
+    복사할 수 없는 예외(생성자 인자가 args와 다른 경우 등)는 원래 객체를 그대로 돌려줍니다.
+    """
+    try:
+        return copy.copy(error).with_traceback(None)
+    except Exception:
+        return error
+
+
+class SingleFlight:
+    """
+    같은 키에 대해 동시에 들어온 호출 중 첫 번째(리더)만 fn을 실행하고, 실행 중에 들어온 호출(팔로워)은
+    그 결과를 기다려 함께 받습니다. fn이 예외를 던지면 팔로워에게는 그 예외의 복사본이
+    리더의 예외를 원인(__cause__)으로 하여 전달됩니다.
+    결과를 보관하지 않으므로(TTL 캐시가 아님) 실행이 끝난 뒤 들어온 호출은 새로 실행합니다.
+    팔로워는 스레드에서 기다리기만 하므로 DB 커넥션을 잡지 않습니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.shared = 0
+        self.errors = 0
+        self.max_waiters = 0
+        with _groups_lock:
+            _groups[name] = self
+
+    def do(self, key, fn):
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.shared += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+
+        if not leader:
+            with span("singleflight.wait"):
+                call.done.wait()
+            if call.error is not None:
+                error = _copy_error(call.error)
+                if error is call.error:
+                    raise error
+                raise error from call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def forget(self, key):
+        """
+        진행 중인 실행에 이후 호출이 합류하지 않도록 키를 뗍니다. (이미 기다리는 호출은 그 결과를 받습니다)
+        쓰기 핸들러가 커밋 후 호출하면, 커밋 이후의 읽기는 커밋 이전에 시작된 조회 결과를 받지 않습니다.
+        """
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def forget_all(self):
+        with self._lock:
+            self._calls.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "shared": self.shared,
+                "errors": self.errors,
+                "in_flight": len(self._calls),
+                "max_waiters": self.max_waiters,
+                # 전체 호출 중 다른 호출의 실행 결과를 받은(DB 조회를 생략한) 비율
+                "coalescing_ratio": (
+                    round(self.shared / self.calls, 4) if self.calls else 0.0
+                ),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls = self.executions = self.shared = self.errors = 0
+            self.max_waiters = 0
+
+
+def single_flight_stats() -> dict:
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
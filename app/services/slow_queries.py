@@ -0,0 +1,243 @@
+import datetime
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from sqlalchemy import event
+
+from app.logger_config import get_logger
+
+logger = get_logger("slow_queries")
+
+DEFAULT_THRESHOLD_MS = 200.0
+DEFAULT_MAX_ENTRIES = 200
+DEFAULT_MAX_FINGERPRINTS = 1000
+OTHER_FINGERPRINT = "other"
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|:\w+")
+_IN_LIST = re.compile(r"\bin\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str):
+    """
+    리터럴/바인드 파라미터를 '?'로 바꾸고 IN 목록과 공백을 정규화하여, 값만 다른 쿼리를 같은 지문으로 묶습니다.
+    같은 SQL 문자열이 반복 실행되므로 결과를 캐시합니다. (지문 ID, 정규화된 SQL)을 반환합니다.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _IN_LIST.sub("in (?+)", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip().lower()
+    digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+    return digest, normalized
+
+
+class FingerprintStats:
+    __slots__ = ("statement", "count", "total_ms", "max_ms", "slow_count")
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow_count = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "slow_count": self.slow_count,
+        }
+
+
+class SlowQueryRecorder:
+    """
+    엔진의 모든 쿼리 실행 시간을 지문별로 집계하고, threshold_ms를 넘는 쿼리는 파라미터/소요 시간과 함께
+    최근 max_entries개까지 보관합니다. EXPLAIN은 요청 처리 경로를 막지 않도록 백그라운드 스레드가
+    별도 커넥션으로 실행하며, log_file이 주어지면 완성된 항목을 크기 제한이 있는 회전 파일(JSON Lines)에 남깁니다.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = DEFAULT_THRESHOLD_MS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_fingerprints: int = DEFAULT_MAX_FINGERPRINTS,
+        explain: bool = True,
+        log_file: str = None,
+    ):
+        self.threshold_ms = threshold_ms
+        self.max_fingerprints = max_fingerprints
+        self.explain = explain
+        self.engine = None
+        self._stats = {}
+        self._recent = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self._explain_queue = queue.Queue(maxsize=max_entries)
+        self._thread = None
+        self._file_logger = None
+        if log_file:
+            self._file_logger = logging.getLogger(f"slow_queries.{log_file}")
+            self._file_logger.propagate = False
+            if not self._file_logger.handlers:
+                handler = logging.handlers.RotatingFileHandler(
+                    log_file, maxBytes=10 * 1024 * 1024, backupCount=3, delay=True
+                )
+                self._file_logger.addHandler(handler)
+            self._file_logger.setLevel(logging.INFO)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            threshold_ms=float(os.getenv("SLOW_QUERY_MS", DEFAULT_THRESHOLD_MS)),
+            explain=os.getenv("SLOW_QUERY_EXPLAIN", "1") != "0",
+            log_file=os.getenv("SLOW_QUERY_LOG_FILE") or None,
+        )
+
+    def attach(self, engine):
+        self.engine = engine
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+        return self
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        started = conn.info.get("slow_query_started")
+        if not started:
+            return
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+        if conn.get_execution_options().get("slow_query_skip"):
+            return
+        self.record(statement, parameters, elapsed_ms, executemany)
+
+    def _handle_error(self, context):
+        # 실행이 실패하면 after_cursor_execute가 호출되지 않으므로, 쌓아 둔 시작 시각을 여기서 버립니다.
+        conn = context.connection
+        started = conn.info.get("slow_query_started") if conn is not None else None
+        if started:
+            started.pop()
+
+    def record(self, statement, parameters, elapsed_ms: float, executemany=False):
+        fingerprint_id, normalized = fingerprint(statement)
+        slow = elapsed_ms >= self.threshold_ms
+        with self._lock:
+            stats = self._stats.get(fingerprint_id)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    fingerprint_id = OTHER_FINGERPRINT
+                    stats = self._stats.setdefault(
+                        OTHER_FINGERPRINT, FingerprintStats("(기타)")
+                    )
+                else:
+                    stats = self._stats[fingerprint_id] = FingerprintStats(normalized)
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            if not slow:
+                return
+            stats.slow_count += 1
+            entry = {
+                "fingerprint": fingerprint_id,
+                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "duration_ms": round(elapsed_ms, 3),
+                "statement": statement[:2000],
+                "parameters": repr(parameters)[:500],
+                "plan": None,
+            }
+            self._recent.append(entry)
+
+        if self.explain and not executemany and self._explainable(statement):
+            self._start()
+            try:
+                self._explain_queue.put_nowait((entry, statement, parameters))
+                return
+            except queue.Full:
+                entry["plan"] = "skipped: explain queue full"
+        self._write(entry)
+
+    @staticmethod
+    def _explainable(statement: str) -> bool:
+        return statement.lstrip().lower().startswith(("select", "with"))
+
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="slow-query-explain", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            entry, statement, parameters = self._explain_queue.get()
+            try:
+                entry["plan"] = self._explain(statement, parameters)
+            except Exception as e:
+                entry["plan"] = f"explain failed: {e}"
+            finally:
+                self._write(entry)
+                self._explain_queue.task_done()
+
+    def _explain(self, statement, parameters) -> list:
+        prefix = (
+            "EXPLAIN QUERY PLAN "
+            if self.engine.dialect.name == "sqlite"
+            else "EXPLAIN "
+        )
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(slow_query_skip=True)
+            result = conn.exec_driver_sql(prefix + statement, parameters)
+            return [dict(row._mapping) for row in result]
+
+    def _write(self, entry: dict):
+        if self._file_logger is None:
+            return
+        try:
+            self._file_logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+        except Exception:
+            logger.error("느린 쿼리 기록 실패", exc_info=True)
+
+    def wait_for_explain(self):
+        """대기 중인 EXPLAIN이 모두 끝날 때까지 기다립니다."""
+        self._explain_queue.join()
+
+    def report(self, limit: int = 20, order_by: str = "total_ms") -> dict:
+        with self._lock:
+            stats = [
+                dict(fingerprint=fingerprint_id, **s.to_dict())
+                for fingerprint_id, s in self._stats.items()
+            ]
+            recent = list(reversed(self._recent))
+        stats.sort(key=lambda s: s[order_by], reverse=True)
+        return {
+            "threshold_ms": self.threshold_ms,
+            "fingerprints": stats[:limit],
+            "recent": recent[:limit],
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._recent.clear()
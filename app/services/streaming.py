@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+
+import pandas as pd
+import psutil
+from sqlalchemy import text
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+@dataclass
+class StreamStats:
+    """스트리밍 조회 중 처리한 청크/행 수와 메모리 사용량 기록"""
+
+    chunks: int = 0
+    rows: int = 0
+    peak_chunk_bytes: int = 0
+    peak_rss_bytes: int = 0
+
+    def record(self, chunk: pd.DataFrame):
+        self.chunks += 1
+        self.rows += len(chunk)
+        self.peak_chunk_bytes = max(
+            self.peak_chunk_bytes, int(chunk.memory_usage(deep=True).sum())
+        )
+        self.peak_rss_bytes = max(
+            self.peak_rss_bytes, psutil.Process().memory_info().rss
+        )
+
+    def summary(self) -> str:
+        return (
+            f"{self.rows}행 / {self.chunks}청크, "
+            f"최대 청크 {self.peak_chunk_bytes / 1024:.1f} KiB, "
+            f"최대 RSS {self.peak_rss_bytes / 1024 / 1024:.1f} MiB"
+        )
+
+
+def stream_query(
+    engine,
+    query,
+    params: dict = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    stats: StreamStats = None,
+):
+    """
+    서버 측(unbuffered) 커서로 쿼리를 실행하고 chunk_size 행 단위의 DataFrame을 yield 합니다.
+    PyMySQL에서는 stream_results=True일 때 SSCursor를 사용하므로,
+    결과 전체를 클라이언트 메모리에 올리지 않고 필요한 만큼만 가져옵니다.
+    """
+    if isinstance(query, str):
+        query = text(query)
+
+    with engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, max_row_buffer=chunk_size
+        ).execute(query, params or {})
+        columns = list(result.keys())
+        try:
+            for rows in result.partitions(chunk_size):
+                chunk = pd.DataFrame(rows, columns=columns)
+                if stats is not None:
+                    stats.record(chunk)
+                yield chunk
+        finally:
+            # 소비자가 중간에 멈춰도(예: 첫 행만 확인) 남은 결과를 버리고 커서를 닫습니다.
+            result.close()
+
+
+def collect_findings(chunks, max_rows: int = 100):
+    """
+    청크를 순서대로 소비하면서 앞쪽 max_rows 행만 보관하고 전체 행 수를 셉니다.
+    탐지 결과가 수백만 행이어도 알림에 필요한 요약만 메모리에 남습니다.
+    """
+    kept = []
+    kept_rows = 0
+    total_rows = 0
+    for chunk in chunks:
+        total_rows += len(chunk)
+        if kept_rows < max_rows:
+            kept.append(chunk.head(max_rows - kept_rows))
+            kept_rows += len(kept[-1])
+    findings = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame()
+    return findings, total_rows
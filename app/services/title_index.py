@@ -0,0 +1,248 @@
+import bisect
+import os
+import re
+import threading
+import time
+import unicodedata
+import weakref
+
+from sqlalchemy import event, func, select
+
+from app.logger_config import get_logger
+from app.models import Post
+
+logger = get_logger("title_index")
+
+DEFAULT_BUILD_BATCH_SIZE = 10_000
+DEFAULT_SUGGEST_LIMIT = 10
+# 다른 워커나 API 밖에서 쓴 변경을 반영하기 위한 재확인 주기(초)와, 시그니처가 같아도 다시 빌드하는 주기(초)
+REFRESH_INTERVAL = float(os.getenv("TITLE_INDEX_REFRESH_INTERVAL", "5"))
+MAX_INDEX_AGE = float(os.getenv("TITLE_INDEX_MAX_AGE", "300"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_title(title: str) -> str:
+    """전각/반각·합성 문자를 NFKC로 통일하고 대소문자와 연속 공백을 무시하도록 정규화합니다."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", title).casefold()).strip()
+
+
+class TitleIndex:
+    """
+    게시물 제목 자동완성용 인메모리 접두어 인덱스.
+    (정규화된 제목, id) 튜플을 정렬된 리스트 하나에 두고, 접두어의 시작 위치를 이진 탐색한 뒤
+    접두어가 일치하는 동안만 앞에서부터 limit개를 읽습니다. (O(log n + limit), DB 접근 없음)
+
+    build()가 끝나기 전의 add/remove는 무시합니다. 핸들러는 커밋 후에 호출하므로
+    그 변경은 이후의 build()가 DB에서 읽어 반영합니다. build()는 락 없이 DB를 읽어 새 목록을 만든 뒤
+    교체하므로 빌드 중에도 suggest()는 기존 목록으로 응답하고, 빌드 중에 들어온 add/remove는
+    교체 직후 새 목록에 다시 적용합니다.
+
+    인덱스는 워커(프로세스)마다 따로 있으므로 다른 워커나 API 밖에서 쓴 변경은 add/remove로 들어오지 않습니다.
+    refresh_if_stale()이 refresh_interval마다 (COUNT(*), MAX(id))를 확인해 달라졌으면 백그라운드에서
+    다시 빌드하고, 개수와 최대 id가 그대로인 제목 수정도 max_age마다 다시 빌드해 반영합니다.
+    """
+
+    def __init__(
+        self, refresh_interval: float = REFRESH_INTERVAL, max_age: float = MAX_INDEX_AGE
+    ):
+        self._entries = []  # [(정규화된 제목, id)] 정렬 상태 유지
+        self._titles = {}  # id -> 원래 제목
+        self._pending = None  # 빌드 중에 들어온 변경 [(id, 제목 또는 None)]
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self.ready = False
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.signature = None  # 마지막 빌드 시점의 (COUNT(*), MAX(id))
+        self.built_at = 0.0
+        self._checked_at = 0.0
+        self._refreshing = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _signature(conn):
+        return tuple(conn.execute(select(func.count(Post.id), func.max(Post.id))).one())
+
+    def build(self, engine, batch_size: int = DEFAULT_BUILD_BATCH_SIZE):
+        """posts의 (id, title)을 batch_size행씩 스트리밍으로 읽어 인덱스를 새로 만듭니다."""
+        with self._lock:
+            self._pending = []
+        try:
+            entries = []
+            titles = {}
+            stmt = select(Post.id, Post.title).execution_options(
+                stream_results=True, max_row_buffer=batch_size
+            )
+            with engine.connect() as conn:
+                signature = self._signature(conn)
+                for rows in conn.execute(stmt).partitions(batch_size):
+                    for post_id, title in rows:
+                        if title is None:
+                            continue
+                        entries.append((normalize_title(title), post_id))
+                        titles[post_id] = title
+            entries.sort()
+            with self._lock:
+                self._entries = entries
+                self._titles = titles
+                # 커밋 후에 호출되는 변경이므로 다시 적용해도 결과가 같습니다. (upsert/삭제)
+                for post_id, title in self._pending:
+                    self._apply_locked(post_id, title)
+                self.signature = signature
+                self.built_at = self._checked_at = time.monotonic()
+                self.ready = True
+        finally:
+            with self._lock:
+                self._pending = None
+        logger.info("title index built with %d posts", len(entries))
+        return self
+
+    def ensure_built(self, engine):
+        """아직 빌드되지 않았다면 한 번만 빌드합니다. (동시에 호출되면 나머지는 빌드가 끝나길 기다림)"""
+        if not self.ready:
+            with self._build_lock:
+                if not self.ready:
+                    self.build(engine)
+        return self
+
+    def _remove_locked(self, post_id: int):
+        title = self._titles.pop(post_id, None)
+        if title is None:
+            return
+        key = (normalize_title(title), post_id)
+        i = bisect.bisect_left(self._entries, key)
+        if i < len(self._entries) and self._entries[i] == key:
+            del self._entries[i]
+
+    def _apply_locked(self, post_id: int, title):
+        self._remove_locked(post_id)
+        if title is None:
+            return
+        bisect.insort(self._entries, (normalize_title(title), post_id))
+        self._titles[post_id] = title
+
+    def _change(self, post_id: int, title):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((post_id, title))
+            if self.ready:
+                self._apply_locked(post_id, title)
+
+    def add(self, post_id: int, title: str):
+        """게시물 생성/수정 후 호출합니다. 같은 id가 이미 있으면 기존 제목을 대체합니다."""
+        self._change(post_id, title)
+
+    def remove(self, post_id: int):
+        self._change(post_id, None)
+
+    def refresh(self, engine) -> bool:
+        """DB의 (COUNT(*), MAX(id))가 마지막 빌드와 다르거나 max_age가 지났으면 다시 빌드합니다."""
+        with self._build_lock:
+            if self.ready and time.monotonic() - self.built_at < self.max_age:
+                with engine.connect() as conn:
+                    signature = self._signature(conn)
+                self._checked_at = time.monotonic()
+                if signature == self.signature:
+                    return False
+            self.build(engine)
+            return True
+
+    def refresh_if_stale(self, engine):
+        """
+        refresh_interval이 지났으면 백그라운드 스레드에서 refresh()를 실행합니다.
+        요청은 기다리지 않고 현재 인덱스로 응답하며, 재확인은 한 번에 하나만 실행합니다.
+        """
+        with self._lock:
+            if (
+                not self.ready
+                or self._refreshing
+                or time.monotonic() - self._checked_at < self.refresh_interval
+            ):
+                return None
+            self._refreshing = True
+
+        def _refresh():
+            try:
+                self.refresh(engine)
+            except Exception:
+                logger.error("제목 인덱스 갱신 중 에러 발생", exc_info=True)
+            finally:
+                with self._lock:
+                    self._checked_at = time.monotonic()
+                    self._refreshing = False
+
+        thread = threading.Thread(
+            target=_refresh, name="title-index-refresher", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def suggest(self, prefix: str, limit: int = DEFAULT_SUGGEST_LIMIT) -> list:
+        """정규화된 제목이 prefix로 시작하는 게시물을 제목 순으로 최대 limit개 반환합니다."""
+        prefix = normalize_title(prefix)
+        results = []
+        with self._lock:
+            entries = self._entries
+            i = bisect.bisect_left(entries, (prefix,))
+            while i < len(entries) and len(results) < limit:
+                normalized, post_id = entries[i]
+                if not normalized.startswith(prefix):
+                    break
+                results.append({"id": post_id, "title": self._titles[post_id]})
+                i += 1
+        return results
+
+
+# 엔진별 제목 인덱스. posts 테이블을 다시 만들면(create_all/drop_all) 비웁니다.
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def title_index_for(engine) -> TitleIndex:
+    """엔진의 제목 인덱스를 반환합니다. 아직 빌드되지 않았을 수 있습니다. (ready=False)"""
+    with _indexes_lock:
+        index = _indexes.get(engine)
+        if index is None:
+            index = _indexes[engine] = TitleIndex()
+        return index
+
+
+def ensure_title_index(engine) -> TitleIndex:
+    """
+    빌드된 인덱스를 반환합니다. 처음 호출될 때(워커 시작 직후 또는 첫 요청) DB에서 빌드하고,
+    이후에는 refresh_interval마다 백그라운드에서 DB 변경 여부를 확인합니다.
+    """
+    index = title_index_for(engine).ensure_built(engine)
+    index.refresh_if_stale(engine)
+    return index
+
+
+def warm_title_index(engine) -> threading.Thread:
+    """요청 처리를 막지 않도록 백그라운드 스레드에서 인덱스를 빌드합니다. (gunicorn post_fork에서 호출)"""
+
+    def _build():
+        try:
+            ensure_title_index(engine)
+        except Exception:
+            logger.error("제목 인덱스 빌드 중 에러 발생", exc_info=True)
+
+    thread = threading.Thread(target=_build, name="title-index-builder", daemon=True)
+    thread.start()
+    return thread
+
+
+def clear_title_indexes(engine=None):
+    with _indexes_lock:
+        if engine is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(engine, None)
+
+
+@event.listens_for(Post.__table__, "after_create")
+@event.listens_for(Post.__table__, "after_drop")
+def _clear_title_index(table, connection, **kw):
+    clear_title_indexes(connection.engine)
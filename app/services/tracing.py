@@ -0,0 +1,314 @@
+import contextvars
+import datetime
+import functools
+import inspect
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_SLOW_MS = 200.0
+DEFAULT_BUFFER_SIZE = 1000
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+
+
+class Trace:
+    """
+    요청 하나의 구간별 누적 시간(ms)을 담습니다. 동기 엔드포인트는 스레드풀에서 실행되지만
+    contextvars가 복사되어 같은 Trace 객체를 가리키므로 그대로 누적됩니다.
+    """
+
+    __slots__ = (
+        "method",
+        "path",
+        "started_at",
+        "_started",
+        "spans",
+        "query_count",
+        "endpoint_finished",
+        "status_code",
+        "total_ms",
+    )
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self._started = time.perf_counter()
+        self.spans = {}
+        self.query_count = 0
+        self.endpoint_finished = None
+        self.status_code = None
+        self.total_ms = None
+
+    def add(self, name: str, elapsed_ms: float):
+        self.spans[name] = self.spans.get(name, 0.0) + elapsed_ms
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def breakdown(self) -> dict:
+        """
+        엔드포인트 시간에서 쿼리 실행 시간을 뺀 나머지를 'app'(ORM 객체 생성 + 핸들러 로직)으로
+        따로 보여줍니다.
+        """
+        spans = dict(self.spans)
+        if "endpoint" in spans:
+            spans["app"] = max(
+                spans.pop("endpoint") - spans.get("db.execute", 0.0), 0.0
+            )
+        return spans
+
+    def server_timing(self) -> str:
+        metrics = []
+        for name, elapsed in self.breakdown().items():
+            metric = f"{name};dur={elapsed:.2f}"
+            if name == "db.execute":
+                metric += f';desc="{self.query_count} queries"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={self.elapsed_ms():.2f}")
+        return ", ".join(metrics)
+
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at.isoformat(),
+            "status_code": self.status_code,
+            "total_ms": round(self.total_ms or 0.0, 3),
+            "query_count": self.query_count,
+            "spans": {k: round(v, 3) for k, v in self.breakdown().items()},
+        }
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str):
+    """현재 요청의 trace에 name 구간의 시간을 더합니다. trace가 없으면 아무것도 하지 않습니다."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, (time.perf_counter() - started) * 1000)
+
+
+class TraceBuffer:
+    """샘플링된 trace를 최근 maxlen개만 보관하는 링 버퍼"""
+
+    def __init__(self, maxlen: int = DEFAULT_BUFFER_SIZE):
+        self._traces = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def append(self, trace: Trace):
+        with self._lock:
+            self._traces.append(trace.to_dict())
+
+    def list(self, limit: int = 50, min_ms: float = 0.0, path: str = None) -> list:
+        with self._lock:
+            traces = list(self._traces)
+        result = []
+        for trace in reversed(traces):
+            if trace["total_ms"] < min_ms:
+                continue
+            if path and not trace["path"].startswith(path):
+                continue
+            result.append(trace)
+            if len(result) >= limit:
+                break
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+
+class Tracer:
+    """
+    Server-Timing 헤더 출력 여부와 샘플링 정책을 가집니다.
+    sample_rate 비율의 요청과 slow_ms 이상 걸린 요청은 항상 링 버퍼에 남깁니다.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        slow_ms: float = DEFAULT_SLOW_MS,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.buffer = TraceBuffer(buffer_size)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            enabled=os.getenv("TRACING_ENABLED", "1") != "0",
+            sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", DEFAULT_SAMPLE_RATE)),
+            slow_ms=float(os.getenv("TRACE_SLOW_MS", DEFAULT_SLOW_MS)),
+            buffer_size=int(os.getenv("TRACE_BUFFER_SIZE", DEFAULT_BUFFER_SIZE)),
+        )
+
+    def finish(self, trace: Trace):
+        trace.total_ms = trace.elapsed_ms()
+        if trace.total_ms >= self.slow_ms or random.random() < self.sample_rate:
+            self.buffer.append(trace)
+
+
+tracer = Tracer.from_env()
+
+
+class TracingMiddleware:
+    """
+    요청마다 Trace를 만들어 contextvar에 넣고, 응답 헤더에 Server-Timing을 추가합니다.
+    BaseHTTPMiddleware를 쓰지 않는 순수 ASGI 미들웨어라 응답 본문을 다시 감싸지 않습니다.
+    """
+
+    def __init__(self, app, tracer: Tracer = tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(scope["method"], scope["path"])
+        token = _current_trace.set(trace)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                trace.status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+            self.tracer.finish(trace)
+
+
+# 스레드 ident -> 현재 실행 중인 경로("GET /posts/{post_id}"). 다른 스레드에서 contextvar를 읽을 수 없으므로
+# 샘플링 프로파일러가 스택을 경로별로 나눌 때 사용합니다. 비동기 엔드포인트는 이벤트 루프 스레드를 공유하므로 근사값입니다.
+active_routes = {}
+
+
+def _trace_endpoint(endpoint, path: str, methods=None):
+    """
+    엔드포인트 함수 실행 구간을 'endpoint'로 기록하고, 실행 중인 스레드에 경로를 표시합니다.
+    경로 표시는 프로파일러가 쓰므로 tracing이 꺼져 있거나 샘플링되지 않은 요청에도 남깁니다.
+    시그니처는 functools.wraps로 유지됩니다.
+    """
+    route = f"{','.join(sorted(methods))} {path}" if methods else path
+
+    def _enter(trace):
+        active_routes[threading.get_ident()] = (
+            f"{trace.method} {path}" if trace is not None else route
+        )
+        return time.perf_counter()
+
+    def _exit(trace, started):
+        active_routes.pop(threading.get_ident(), None)
+        if trace is None:
+            return
+        finished = time.perf_counter()
+        trace.add("endpoint", (finished - started) * 1000)
+        trace.endpoint_finished = finished
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            started = _enter(trace)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _exit(trace, started)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        trace = _current_trace.get()
+        started = _enter(trace)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            _exit(trace, started)
+
+    return sync_wrapper
+
+
+class TracingRoute(APIRoute):
+    """
+    엔드포인트가 끝난 뒤 응답이 만들어지기까지(response_model 검증 + JSON 렌더링)를 'serialize'로 기록합니다.
+    app.router.route_class로 지정하면 이후 선언되는 경로에 적용됩니다.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(
+            path, _trace_endpoint(endpoint, path, kwargs.get("methods")), **kwargs
+        )
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            response = await handler(request)
+            trace = _current_trace.get()
+            if trace is not None and trace.endpoint_finished is not None:
+                trace.add(
+                    "serialize", (time.perf_counter() - trace.endpoint_finished) * 1000
+                )
+            return response
+
+        return traced_handler
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_trace.get() is not None:
+        conn.info.setdefault("trace_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _current_trace.get()
+    started = conn.info.get("trace_query_started")
+    if trace is None or not started:
+        return
+    trace.add("db.execute", (time.perf_counter() - started.pop()) * 1000)
+    trace.query_count += 1
+
+
+def _handle_error(context):
+    # 실행이 실패하면 after_cursor_execute가 호출되지 않으므로, 쌓아 둔 시작 시각을 여기서 버립니다.
+    conn = context.connection
+    started = conn.info.get("trace_query_started") if conn is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engines():
+    """모든 Engine의 쿼리 실행 구간을 'db.execute'로 기록합니다. (중복 호출해도 한 번만 등록)"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
@@ -3,8 +3,13 @@
 from fastapi import APIRouter, Depends, Request, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from . import models
 from .database import get_db
+from .services.injection_detector import (
+    InjectionDetector,
+    SecurityEventSink,
+    get_detector,
+    get_event_sink,
+)
 
 # main.py의 app 대신 APIRouter 객체를 생성합니다.
 router = APIRouter()
@@ -12,19 +17,28 @@ router = APIRouter()
 
 # 여기에 SQL Injection에 취약한 엔드포인트를 그대로 옮겨옵니다.
 @router.get("/items/search")
-def search_items(name: str, request: Request, db: Session = Depends(get_db)):
+def search_items(
+    name: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    detector: InjectionDetector = Depends(get_detector),
+    event_sink: SecurityEventSink = Depends(get_event_sink),
+):
     # ... (이전 main.py에 있던 취약한 코드 전체) ...
     client_ip = request.client.host
 
-    if any(keyword in name.lower() for keyword in ["'", ";", "--", "or", "and"]):
-        security_event = models.SecurityEvent(
-            event_type="SQL Injection Attempt",
-            source_ip=client_ip,
-            payload=name,
-            description="Suspicious pattern detected in search query for items.",
+    # 컴파일된 규칙 집합으로 입력을 한 번만 훑고, 탐지 이벤트는 싱크에 넘겨 비동기로 기록합니다.
+    detection = detector.scan(name)
+    if detector.is_suspicious(detection):
+        event_sink.submit(
+            event_type="SQL_INJECTION_ATTEMPT",
+            ip_address=client_ip,
+            description=(
+                f"Suspicious pattern detected in search query for items "
+                f"(score={detection.score}, rules={detection.rule_names[:100]}) "
+                f"payload={name[:200]}"
+            ),
         )
-        db.add(security_event)
-        db.commit()
 
     raw_query = f"SELECT * FROM items WHERE name = '{name}'"
 
@@ -0,0 +1,116 @@
+# benchmarks/conftest.py
+# 사용법:
+#   pytest benchmarks/                               # 기준값(baseline.json)과 비교, 회귀 시 실패
+#   pytest benchmarks/ --benchmark-update-baseline   # 이번 측정값을 기준값으로 저장
+#   BENCHMARK_THRESHOLD=0.1 pytest benchmarks/       # 허용 회귀 비율 조정 (기본 25%)
+
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.main import app, get_db
+from benchmarks.harness import BaselineStore, check_regression, measure
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_RESULTS = os.path.join(BENCHMARK_DIR, "results.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks", "성능 회귀 벤치마크")
+    group.addoption(
+        "--benchmark-baseline",
+        default=os.getenv("BENCHMARK_BASELINE", DEFAULT_BASELINE),
+        help="기준값 JSON 파일 경로",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=float(os.getenv("BENCHMARK_THRESHOLD", "0.25")),
+        help="기준값 대비 허용되는 중앙값 증가 비율 (기본 0.25 = 25%%)",
+    )
+    group.addoption(
+        "--benchmark-update-baseline",
+        action="store_true",
+        help="비교하지 않고 이번 측정값으로 기준값을 갱신합니다.",
+    )
+
+
+class BenchmarkSession:
+    def __init__(self, config):
+        self.baselines = BaselineStore(config.getoption("--benchmark-baseline"))
+        self.threshold = config.getoption("--benchmark-threshold")
+        self.update_baseline = config.getoption("--benchmark-update-baseline")
+        self.results = {}
+
+
+@pytest.fixture(scope="session")
+def benchmark_session(request):
+    session = BenchmarkSession(request.config)
+    yield session
+
+    results = {name: result.to_dict() for name, result in session.results.items()}
+    with open(DEFAULT_RESULTS, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2, sort_keys=True)
+    if session.update_baseline and results:
+        session.baselines.update(results)
+        print(f"\n📌 기준값 갱신: {session.baselines.path} ({len(results)}개)")
+
+
+@pytest.fixture
+def bench(benchmark_session):
+    """bench(name, fn, ...)로 측정하고, 기준값 대비 회귀가 있으면 테스트를 실패시킵니다."""
+
+    def _bench(name: str, fn, **kwargs):
+        result = measure(name, fn, **kwargs)
+        benchmark_session.results[name] = result
+        print(f"\n⏱️ {name}: median {result.median_ms:.3f}ms, p95 {result.p95_ms:.3f}ms")
+        if not benchmark_session.update_baseline:
+            message = check_regression(
+                result,
+                benchmark_session.baselines.get(name),
+                benchmark_session.threshold,
+            )
+            if message:
+                pytest.fail(message)
+        return result
+
+    return _bench
+
+
+# --- 측정 대상 환경 (인메모리 SQLite) ---
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(sqlite_engine):
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,95 @@
+import gc
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class BenchmarkResult:
+    """한 벤치마크의 반복 측정 결과 (단위: ms)"""
+
+    name: str
+    samples_ms: list = field(default_factory=list)
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.samples_ms)
+
+    @property
+    def p95_ms(self) -> float:
+        ordered = sorted(self.samples_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    @property
+    def min_ms(self) -> float:
+        return min(self.samples_ms)
+
+    def to_dict(self) -> dict:
+        return {
+            "median_ms": round(self.median_ms, 4),
+            "p95_ms": round(self.p95_ms, 4),
+            "min_ms": round(self.min_ms, 4),
+            "repeat": len(self.samples_ms),
+        }
+
+
+def measure(name: str, fn, repeat: int = 20, warmup: int = 3, setup=None):
+    """
+    fn을 warmup회 실행한 뒤 repeat회 측정합니다.
+    setup이 주어지면 매 회 측정 구간 밖에서 먼저 호출합니다. (GC는 측정 중에만 끕니다)
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+
+    result = BenchmarkResult(name)
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            fn()
+            result.samples_ms.append((time.perf_counter() - started) * 1000)
+        finally:
+            gc.enable()
+    return result
+
+
+class BaselineStore:
+    """벤치마크별 기준값(median_ms 등)을 JSON 파일에 저장합니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.baselines = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.baselines = json.load(f)
+
+    def get(self, name: str):
+        return self.baselines.get(name)
+
+    def update(self, results: dict):
+        self.baselines.update(results)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.baselines, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def check_regression(result: BenchmarkResult, baseline: dict, threshold: float):
+    """중앙값이 기준값보다 threshold(비율) 넘게 느려졌으면 설명 메시지를, 아니면 None을 반환합니다."""
+    if not baseline:
+        return None
+    allowed = baseline["median_ms"] * (1 + threshold)
+    if result.median_ms <= allowed:
+        return None
+    ratio = result.median_ms / baseline["median_ms"] - 1
+    return (
+        f"{result.name}: median {result.median_ms:.3f}ms가 기준 "
+        f"{baseline['median_ms']:.3f}ms보다 {ratio:.0%} 느립니다. (허용 {threshold:.0%})"
+    )
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.services.log_aggregates import IncrementalLogAggregator
+from app.services.monitoring import load_analysis_queries
+from scripts.create_mock_data import run_data_creation
+from scripts.fixture_snapshot import load_fixture_dataset
+
+# 시드 데이터 크기. 스냅샷으로 캐시되므로 두 번째 실행부터는 복원 비용만 듭니다.
+NUM_LOGS = int(os.getenv("BENCHMARK_NUM_LOGS", "20000"))
+# analysis_queries.sql은 MySQL 문법이므로, 접속 정보가 있을 때만 실제 쿼리를 측정합니다.
+MYSQL_URL = os.getenv("BENCHMARK_MYSQL_URL")
+
+
+@pytest.fixture(scope="module")
+def seeded_sqlite():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    load_fixture_dataset(engine, "run_data_creation", num_logs=NUM_LOGS)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def seeded_mysql():
+    if not MYSQL_URL:
+        pytest.skip(
+            "BENCHMARK_MYSQL_URL이 설정되지 않아 MySQL 쿼리 벤치마크를 건너뜁니다."
+        )
+    engine = create_engine(MYSQL_URL)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    load_fixture_dataset(engine, "run_data_creation", num_logs=NUM_LOGS)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def test_mock_data_generator(sqlite_engine, bench):
+    """scripts/create_mock_data의 ORM 기반 생성 비용 (flush까지, 커밋은 하지 않음)"""
+
+    def generate():
+        with Session(sqlite_engine) as db:
+            run_data_creation(db, num_logs=2000)
+            db.flush()
+            db.rollback()
+
+    bench("mock_data.run_data_creation_2000", generate, repeat=3, warmup=1)
+
+
+def test_incremental_aggregator_full_refresh(seeded_sqlite, bench):
+    """대시보드 요약(1.1 ~ 1.3)을 처음부터 집계하는 비용"""
+
+    def refresh():
+        aggregator = IncrementalLogAggregator()
+        aggregator.refresh(seeded_sqlite)
+        aggregator.results()
+
+    bench("aggregator.full_refresh", refresh, repeat=5, warmup=1)
+
+
+@pytest.mark.parametrize("query_id", ["1.1", "1.2", "1.3", "2.1", "2.2", "2.3", "2.4"])
+def test_analysis_query(seeded_mysql, bench, query_id):
+    query = text(load_analysis_queries()[query_id])
+
+    def run():
+        with seeded_mysql.connect() as conn:
+            conn.execute(query).fetchall()
+
+    bench(f"analysis_query.{query_id}", run, repeat=10, warmup=2)
@@ -0,0 +1,76 @@
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app import models, schemas
+from app.services.title_index import TitleIndex
+from app.services.tracing import tracer
+
+POST_LIST_ADAPTER = TypeAdapter(List[schemas.Post])
+
+
+def _seed_posts(client, count: int):
+    for i in range(count):
+        client.post("/posts", json={"title": f"제목 {i}", "content": "내용 " * 20})
+
+
+def test_create_post(client, bench):
+    payload = {"title": "벤치마크", "content": "내용"}
+    bench("api.create_post", lambda: client.post("/posts", json=payload))
+
+
+def test_read_posts(client, bench):
+    _seed_posts(client, 100)
+    bench("api.read_posts_100", lambda: client.get("/posts?limit=100"))
+
+
+def test_read_post(client, bench):
+    _seed_posts(client, 1)
+    bench("api.read_post", lambda: client.get("/posts/1"))
+
+
+def test_read_post_untraced(client, bench, monkeypatch):
+    """api.read_post와 비교해 Server-Timing/샘플링 추적의 오버헤드를 확인합니다."""
+    _seed_posts(client, 1)
+    monkeypatch.setattr(tracer, "enabled", False)
+    bench("api.read_post_untraced", lambda: client.get("/posts/1"))
+
+
+def test_update_post(client, bench):
+    _seed_posts(client, 1)
+    payload = {"title": "수정", "content": "수정된 내용"}
+    bench("api.update_post", lambda: client.put("/posts/1", json=payload))
+
+
+def test_delete_post(client, bench):
+    created = []
+
+    def setup():
+        response = client.post("/posts", json={"title": "삭제", "content": "x"})
+        created.append(response.json()["id"])
+
+    bench(
+        "api.delete_post",
+        lambda: client.delete(f"/posts/{created.pop()}"),
+        setup=setup,
+    )
+
+
+def test_serialize_post_list(bench):
+    """ORM 객체 1,000개를 schemas.Post 리스트로 검증하고 JSON으로 직렬화하는 비용"""
+    posts = [
+        models.Post(id=i, title=f"제목 {i}", content="내용 " * 20) for i in range(1000)
+    ]
+    bench(
+        "serialize.post_list_1000",
+        lambda: POST_LIST_ADAPTER.dump_json(POST_LIST_ADAPTER.validate_python(posts)),
+    )
+
+
+def test_title_suggest(bench):
+    """10만 개 제목 인덱스에서 접두어 자동완성 10건 조회 (DB 접근 없음)"""
+    index = TitleIndex()
+    index.ready = True
+    for i in range(100_000):
+        index.add(i, f"제목 {i:06d}")
+    bench("index.title_suggest_100k", lambda: index.suggest("제목 0123", 10))
@@ -51,18 +51,11 @@ with tab1:
         col1.metric("최신 빌드 테스트 성공률", "N/A", "데이터 로드 실패")
 
     # KPI 2 & 3: DB 기반 데이터
-    if (
-        db_data
-        and "time_series_requests" in db_data
-        and "slowest_10_endpoints" in db_data
-    ):
-        # <<< 수정: SQL 쿼리(1.1)의 컬럼 'total_requests'와 일치시킴
-        total_requests_24h = db_data["time_series_requests"]["total_requests"].sum()
-
-        # <<< 수정: SQL 쿼리(1.3)의 컬럼 'avg_response_time_ms'와 일치시킴
-        avg_response_time = db_data["slowest_10_endpoints"][
-            "avg_response_time_ms"
-        ].mean()
+    # API 서버가 미리 계산한 KPI를 그대로 사용합니다. (평균 응답 시간은 요청 수 가중 평균)
+    kpis = db_data.get("kpis", {}) if db_data else {}
+    if kpis.get("total_requests") and kpis.get("avg_response_time_ms") is not None:
+        total_requests_24h = kpis["total_requests"]
+        avg_response_time = kpis["avg_response_time_ms"]
 
         col2.metric("최근 24시간 API 총 요청 수", f"{int(total_requests_24h):,} 건")
         col3.metric("최근 24시간 평균 응답 시간", f"{avg_response_time:.2f} ms")
@@ -108,8 +101,9 @@ with tab2:
 
         # 3. 가장 느린 엔드포인트
         with col2:
-            st.subheader("엔드포인트별 평균 응답속도")
+            st.subheader("엔드포인트별 응답속도 (평균 / p50 / p95 / p99)")
             if "slowest_10_endpoints" in db_data:
+                # p50/p95/p99는 시간대별 분위수 스케치를 병합한 추정값입니다. (상대 오차 1% 이내)
                 st.dataframe(db_data["slowest_10_endpoints"], use_container_width=True)
 
 # ======================================================================================
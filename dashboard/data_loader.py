@@ -1,13 +1,12 @@
 # dashboard/data_loader.py
 
 import streamlit as st
+import pandas as pd
 import requests
-import json
-import zipfile
-import io
-from sqlalchemy.exc import OperationalError
 import os
 
+from qa_report_cache import QAReportFetcher, QAReportNotFound
+
 
 # -----------------------------------------------------------------------------
 # 헬퍼 함수: secrets.toml 파일 확인 및 상태 메시지를 화면에 영구적으로 표시
@@ -40,50 +39,67 @@ def _check_and_display_secrets_status():
 
 
 # -----------------------------------------------------------------------------
-# 데이터 소스 1: 운영 DB (MySQL)
+# 데이터 소스 1: 분석 요약 API (FastAPI `/analytics/summary`)
 # -----------------------------------------------------------------------------
-@st.cache_data(ttl=600)
-def load_db_data():
-    """운영 DB에 연결하여 분석 쿼리를 실행하고 결과를 DataFrame으로 반환합니다."""
+# 집계는 API 서버의 백그라운드 작업 하나가 담당하므로, 대시보드 세션 수와 무관하게 DB 부하가 일정합니다.
+ANALYTICS_API_URL = os.getenv("ANALYTICS_API_URL", "http://localhost:8088")
+SUMMARY_TABLES = ["time_series_requests", "top_10_endpoints", "slowest_10_endpoints"]
 
-    # 헬퍼 함수를 호출하여 파일 상태를 확인하고 화면에 표시
-    if not _check_and_display_secrets_status():
-        return None
 
-    try:
-        conn = st.connection("mysql_db", type="sql")
-        with open("../analysis_queries.sql", "r", encoding="utf-8") as f:
-            queries = [q.strip() for q in f.read().split(";") if q.strip()]
+@st.cache_resource
+def _get_summary_client():
+    """모든 세션이 공유하는 HTTP 세션과 마지막 응답(ETag, 본문)을 보관합니다."""
+    return {"session": requests.Session(), "etag": None, "payload": None}
 
-        results = {}
-        query_names = [
-            "time_series_requests",
-            "top_10_endpoints",
-            "slowest_10_endpoints",
-        ]
 
-        for i, query in enumerate(queries):
-            if i < len(query_names):
-                results[query_names[i]] = conn.query(query, ttl=600)
+@st.cache_data(ttl=60)
+def load_db_data():
+    """
+    API 서버가 미리 계산해 둔 분석 요약을 가져와 분석 쿼리(1.1 ~ 1.3)와 같은 형태의
+    DataFrame으로 반환합니다. 요약이 바뀌지 않았으면 304 응답과 이전 본문을 재사용합니다.
+    """
+    client = _get_summary_client()
+    headers = {"If-None-Match": client["etag"]} if client["etag"] else {}
 
-        return results
+    try:
+        response = client["session"].get(
+            f"{ANALYTICS_API_URL}/analytics/summary", headers=headers, timeout=10
+        )
+        if response.status_code != 304 or client["payload"] is None:
+            response.raise_for_status()
+            client["payload"] = response.json()
+            client["etag"] = response.headers.get("ETag")
 
-    except OperationalError as e:
+    except requests.exceptions.ConnectionError as e:
         st.error(
-            f"데이터베이스 연결 오류가 발생했습니다. 'secrets.toml'의 DB 이름과 `docker-compose.yml`의 `MYSQL_DATABASE` 값이 일치하는지 확인해주세요. 원본 오류: {e}"
+            f"분석 API 서버에 연결할 수 없습니다. `ANALYTICS_API_URL`({ANALYTICS_API_URL})과 API 컨테이너 상태를 확인해주세요. 원본 오류: {e}"
         )
         return None
     except Exception as e:
-        st.error(f"데이터베이스 처리 중 예측하지 못한 오류 발생: {e}")
+        st.error(f"분석 요약 처리 중 예측하지 못한 오류 발생: {e}")
         return None
 
+    payload = client["payload"]
+    data = {name: pd.DataFrame(payload.get(name, [])) for name in SUMMARY_TABLES}
+    data["kpis"] = payload.get("kpis", {})
+    return data
+
 
 # -----------------------------------------------------------------------------
 # 데이터 소스 2: QA 테스트 결과 (GitHub Artifacts)
 # -----------------------------------------------------------------------------
+@st.cache_resource
+def _get_qa_report_fetcher(repo: str, token: str):
+    """세션(커넥션 풀)과 ETag/아티팩트 디스크 캐시를 프로세스 수명 동안 재사용합니다."""
+    return QAReportFetcher(repo, token)
+
+
 @st.cache_data(ttl=600)
 def load_latest_qa_report():
-    """GitHub API를 통해 가장 최근의 QA 테스트 리포트(JSON)를 가져옵니다."""
+    """
+    GitHub API를 통해 가장 최근의 QA 테스트 리포트(JSON)를 가져옵니다.
+    최신 run ID가 이전과 같으면 조건부 요청(304) 한 번과 디스크 캐시만으로 끝납니다.
+    """
 
     # 헬퍼 함수를 호출하여 파일 상태를 확인하고 화면에 표시
     if not _check_and_display_secrets_status():
@@ -96,54 +112,14 @@ def load_latest_qa_report():
             )
             return None, None, "필수 secret 키 누락"
 
-        token = st.secrets["GITHUB_TOKEN"]
-        repo = st.secrets["GITHUB_REPO"]
-
-        headers = {"Authorization": f"token {token}"}
-        runs_url = f"https://api.github.com/repos/{repo}/actions/workflows/python-ci.yml/runs?branch=main&status=success&per_page=1"
-        response = requests.get(runs_url, headers=headers)
-        response.raise_for_status()
-
-        workflow_runs = response.json().get("workflow_runs", [])
-        if not workflow_runs:
-            return (
-                None,
-                None,
-                "조건에 맞는 성공한 워크플로우 실행 기록을 찾을 수 없습니다.",
-            )
-
-        latest_run = workflow_runs[0]
-        latest_run_id = latest_run["id"]
-        commit_message = latest_run.get("head_commit", {}).get(
-            "message", "커밋 메시지 없음"
-        )
-
-        artifacts_url = f"https://api.github.com/repos/{repo}/actions/runs/{latest_run_id}/artifacts"
-        response = requests.get(artifacts_url, headers=headers)
-        response.raise_for_status()
-
-        artifacts = response.json().get("artifacts", [])
-        artifact_info = next(
-            (item for item in artifacts if item["name"] == "qa-test-report"), None
+        fetcher = _get_qa_report_fetcher(
+            st.secrets["GITHUB_REPO"], st.secrets["GITHUB_TOKEN"]
         )
-
-        if not artifact_info:
-            return (
-                None,
-                None,
-                "워크플로우 실행에서 'qa-test-report' 아티팩트를 찾을 수 없습니다.",
-            )
-
-        download_url = artifact_info["archive_download_url"]
-        response = requests.get(download_url, headers=headers)
-        response.raise_for_status()
-
-        with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-            with z.open("pytest-report.json") as f:
-                report_data = json.load(f)
-
+        report_data, commit_message = fetcher.latest_report()
         return report_data, commit_message, None
 
+    except QAReportNotFound as e:
+        return None, None, str(e)
     except requests.exceptions.HTTPError as e:
         error_message = f"GitHub API 요청 실패 (HTTP {e.response.status_code}): {e}"
         st.error(error_message)
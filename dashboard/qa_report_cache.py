@@ -0,0 +1,156 @@
+# dashboard/qa_report_cache.py
+
+import json
+import os
+import shutil
+import zipfile
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GITHUB_API_URL = "https://api.github.com"
+REPORT_ARTIFACT_NAME = "qa-test-report"
+REPORT_FILE_NAME = "pytest-report.json"
+
+
+class QAReportNotFound(Exception):
+    """성공한 워크플로우 실행이나 QA 리포트 아티팩트를 찾을 수 없을 때 발생합니다."""
+
+
+class QAReportFetcher:
+    """
+    GitHub Actions의 최신 QA 리포트를 가져오되,
+    - 커넥션 풀을 가진 requests.Session을 재사용하고,
+    - API 응답은 ETag/If-None-Match 조건부 요청으로 변경이 없으면 304로 끝내며,
+    - 아티팩트는 실행(run) ID별 디스크 캐시에 스트리밍으로 저장합니다.
+    최신 run ID가 바뀌지 않았다면 아티팩트 목록 조회와 zip 다운로드를 모두 건너뜁니다.
+    """
+
+    def __init__(
+        self,
+        repo: str,
+        token: str,
+        cache_dir: str = ".qa_report_cache",
+        api_url: str = GITHUB_API_URL,
+        keep_runs: int = 5,
+        timeout: float = 30.0,
+    ):
+        self.repo = repo
+        self.api_url = api_url.rstrip("/")
+        self.cache_dir = cache_dir
+        self.keep_runs = keep_runs
+        self.timeout = timeout
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self.session.headers.update(
+            {
+                "Authorization": f"token {token}",
+                "Accept": "application/vnd.github+json",
+            }
+        )
+
+        self._etag_file = os.path.join(cache_dir, "etags.json")
+        self._etags = {}
+        if os.path.exists(self._etag_file):
+            with open(self._etag_file, "r", encoding="utf-8") as f:
+                self._etags = json.load(f)
+
+    # --- 조건부 GET (ETag) ---
+
+    def _get_json(self, url: str) -> dict:
+        cached = self._etags.get(url)
+        headers = {"If-None-Match": cached["etag"]} if cached else {}
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached:
+            return cached["body"]
+        response.raise_for_status()
+
+        body = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etags[url] = {"etag": etag, "body": body}
+            self._save_etags()
+        return body
+
+    def _save_etags(self):
+        tmp_path = self._etag_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._etags, f, ensure_ascii=False)
+        os.replace(tmp_path, self._etag_file)
+
+    # --- run ID별 아티팩트 캐시 ---
+
+    def _run_dir(self, run_id) -> str:
+        return os.path.join(self.cache_dir, "runs", str(run_id))
+
+    def _download_report(self, run_id) -> str:
+        """아티팩트 zip을 디스크로 스트리밍하고 리포트 파일만 꺼내어 경로를 반환합니다."""
+        artifacts = self._get_json(
+            f"{self.api_url}/repos/{self.repo}/actions/runs/{run_id}/artifacts"
+        ).get("artifacts", [])
+        artifact_info = next(
+            (item for item in artifacts if item["name"] == REPORT_ARTIFACT_NAME), None
+        )
+        if not artifact_info:
+            raise QAReportNotFound(
+                f"워크플로우 실행에서 '{REPORT_ARTIFACT_NAME}' 아티팩트를 찾을 수 없습니다."
+            )
+
+        run_dir = self._run_dir(run_id)
+        os.makedirs(run_dir, exist_ok=True)
+        zip_path = os.path.join(run_dir, "artifact.zip.part")
+        with self.session.get(
+            artifact_info["archive_download_url"], stream=True, timeout=self.timeout
+        ) as response:
+            response.raise_for_status()
+            with open(zip_path, "wb") as f:
+                for block in response.iter_content(chunk_size=64 * 1024):
+                    f.write(block)
+
+        report_path = os.path.join(run_dir, REPORT_FILE_NAME)
+        with zipfile.ZipFile(zip_path) as z:
+            with z.open(REPORT_FILE_NAME) as src, open(
+                report_path + ".part", "wb"
+            ) as dst:
+                shutil.copyfileobj(src, dst)
+        os.replace(report_path + ".part", report_path)
+        os.remove(zip_path)
+        self._prune_runs()
+        return report_path
+
+    def _prune_runs(self):
+        runs_root = os.path.join(self.cache_dir, "runs")
+        run_dirs = sorted(
+            (os.path.join(runs_root, name) for name in os.listdir(runs_root)),
+            key=os.path.getmtime,
+            reverse=True,
+        )
+        for old_dir in run_dirs[self.keep_runs :]:
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    def latest_report(self):
+        """(리포트 JSON, 커밋 메시지)를 반환합니다."""
+        runs = self._get_json(
+            f"{self.api_url}/repos/{self.repo}/actions/workflows/python-ci.yml/runs"
+            "?branch=main&status=success&per_page=1"
+        )
+        workflow_runs = runs.get("workflow_runs", [])
+        if not workflow_runs:
+            raise QAReportNotFound(
+                "조건에 맞는 성공한 워크플로우 실행 기록을 찾을 수 없습니다."
+            )
+
+        latest_run = workflow_runs[0]
+        commit_message = (latest_run.get("head_commit") or {}).get(
+            "message", "커밋 메시지 없음"
+        )
+
+        report_path = os.path.join(self._run_dir(latest_run["id"]), REPORT_FILE_NAME)
+        if not os.path.exists(report_path):
+            report_path = self._download_report(latest_run["id"])
+
+        with open(report_path, "r", encoding="utf-8") as f:
+            return json.load(f), commit_message
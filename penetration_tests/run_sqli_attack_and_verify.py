@@ -1,10 +1,12 @@
+import asyncio
 import os
 import json
 import requests
 import time
+import httpx
 import sqlalchemy
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 # --- 👇 1단계: 모델 임포트를 위한 경로 설정 및 import 추가 ---
 import sys
@@ -24,6 +26,19 @@ DB_URL = os.getenv(
 API_ENDPOINT = f"{TARGET_URL}/test-api/items/search"
 PAYLOADS_FILE = os.path.join(os.path.dirname(__file__), "payloads.json")
 REPORT_FILE = "penetration_test_report.md"
+# 동시에 보낼 공격 요청 수 (커넥션 풀 크기와 같게 맞춥니다)
+ATTACK_CONCURRENCY = int(os.getenv("ATTACK_CONCURRENCY", "10"))
+# 시간 기반 공격을 위해 timeout을 충분히 길게 설정 (예: 10초)
+ATTACK_TIMEOUT = float(os.getenv("ATTACK_TIMEOUT", "10"))
+# 탐지 이벤트의 description에 기록되는 페이로드 표식과, 조인에 사용하는 최대 길이
+PAYLOAD_MARKER = "payload="
+PAYLOAD_KEY_LENGTH = 200
+# 공격 시작 시각 이전의 이벤트까지 조회할 여유 (클라이언트/DB 서버 시계 차이 보정)
+CLOCK_SKEW_MARGIN = timedelta(seconds=60)
+# 탐지 이벤트는 서버의 SecurityEventSink가 비동기로 모아 기록합니다. (flush_interval 0.5초 + DB 쓰기)
+# 이벤트 수를 이 간격으로 다시 세어 더 늘지 않거나 제한 시간이 지나면 검증을 시작합니다.
+EVENT_SETTLE_INTERVAL = float(os.getenv("EVENT_SETTLE_INTERVAL", "1.0"))
+EVENT_SETTLE_TIMEOUT = float(os.getenv("EVENT_SETTLE_TIMEOUT", "5.0"))
 
 # DB 연결 설정
 try:
@@ -55,121 +70,177 @@ def wait_for_api(url, timeout=60):
 
 
 # 🔴 --- Red Team: 공격 페이즈 --- 🔴
-def execute_attack_phase():
-    """payloads.json을 읽어와 SQL Injection 공격을 수행합니다."""
-    print("\n--- 🔴 Starting Attack Phase (Red Team) 🔴 ---")
-    attack_results = []
-
-    with open(PAYLOADS_FILE, "r", encoding="utf-8") as f:
-        payload_data = json.load(f)
-
-    for scenario in payload_data["scenarios"]:
-        name = scenario["name"]
-        payload = scenario["payload"]
-        technique = scenario.get("technique", "Unknown")  # technique 필드 사용
-
-        print(f"[*] Executing scenario: {name} (Technique: {technique})")
-
-        result = {
-            "name": name,
-            "payload": payload,
-            "success": False,
-            "response": "",
-            "technique": technique,
-        }
+def judge_attack(technique, status_code, text, elapsed_time, timed_out=False):
+    """technique별 기준으로 공격 성공 여부를 판단하고 (성공 여부, 메시지)를 반환합니다."""
+    # 1. 시간 기반(Time-Based) 공격 성공 조건: 응답 시간이 특정 임계값(예: 4초) 이상
+    if technique == "Time-Based":
+        if timed_out:
+            return (
+                True,
+                "SUCCESS: Time-based attack detected (Request timed out as expected).",
+            )
+        if elapsed_time > 4.0:
+            return (
+                True,
+                f"SUCCESS: Time-based attack detected. Response time: {elapsed_time:.2f}s",
+            )
+        return (
+            False,
+            f"FAILED: No significant time delay detected. Response time: {elapsed_time:.2f}s",
+        )
+    if timed_out:
+        return False, "FAILED: Request timed out"
+
+    # 2. 오류 기반(Error-Based) 공격 성공 조건: 500 에러 또는 응답에 DB 에러 메시지 포함
+    if technique == "Error-Based":
+        if status_code == 500 or any(
+            err in text.lower() for err in ["sql syntax", "error", "warning", "fatal"]
+        ):
+            return (
+                True,
+                f"SUCCESS: Error-based attack detected with status {status_code}.",
+            )
+        return False, "FAILED: No database error observed in response."
 
+    # 3. 유니언 기반(UNION-Based) 공격 성공 조건: 정상 응답(200)이면서, 결과가 1개 초과로 반환 (모든 데이터를 훔쳤다고 가정)
+    if technique == "UNION-Based":
         try:
-            start_time = time.time()
-            # 시간 기반 공격을 위해 timeout을 충분히 길게 설정 (예: 10초)
-            response = requests.get(API_ENDPOINT, params={"name": payload}, timeout=10)
-            elapsed_time = time.time() - start_time
+            results = json.loads(text).get("results", []) if status_code == 200 else []
+        except (json.JSONDecodeError, AttributeError):
+            return (
+                False,
+                "FAILED: Response was not valid JSON, which might indicate an error page.",
+            )
+        if len(results) > 1:
+            return (
+                True,
+                f"SUCCESS: UNION-based attack seems successful, returned {len(results)} items.",
+            )
+        return False, "FAILED: UNION-based attack did not return expected data."
 
+    # 4. 기타 (Boolean-Based 등) : 일단 200 응답이면 성공으로 간주, 추가 검증 필요
+    if status_code == 200:
+        return (
+            True,
+            "SUCCESS (provisional): Attack sent and received HTTP 200. Manual verification or log check needed.",
+        )
+    return False, f"FAILED: Received unexpected status code {status_code}"
+
+
+async def _attack(client, semaphore, scenario):
+    technique = scenario.get("technique", "Unknown")  # technique 필드 사용
+    result = {
+        "name": scenario["name"],
+        "payload": scenario["payload"],
+        "success": False,
+        "response": "",
+        "technique": technique,
+        "latency_s": None,
+    }
+    async with semaphore:
+        start_time = time.perf_counter()
+        try:
+            response = await client.get(
+                API_ENDPOINT, params={"name": scenario["payload"]}
+            )
             result["response"] = response.text
+            status_code, text, timed_out = response.status_code, response.text, False
+        except httpx.TimeoutException as e:
+            # 시간 기반 공격 테스트 중 타임아웃은 '성공'일 수 있음
+            result["response"] = str(e)
+            status_code, text, timed_out = None, "", True
+        except httpx.HTTPError as e:
+            result["response"] = str(e)
+            result["latency_s"] = time.perf_counter() - start_time
+            print(f"[-] {result['name']}: FAILED: Request failed - {e}")
+            return result
+        result["latency_s"] = time.perf_counter() - start_time
 
-            # --- 수정된 부분: technique에 따른 성공 여부 판단 ---
-            success = False
+    result["success"], message = judge_attack(
+        technique, status_code, text, result["latency_s"], timed_out
+    )
+    print(
+        f"[{'+' if result['success'] else '-'}] {result['name']} ({technique}): {message}"
+    )
+    return result
 
-            # 1. 시간 기반(Time-Based) 공격 성공 조건: 응답 시간이 특정 임계값(예: 4초) 이상
-            if technique == "Time-Based":
-                if elapsed_time > 4.0:
-                    success = True
-                    print(
-                        f"  [+] SUCCESS: Time-based attack detected. Response time: {elapsed_time:.2f}s"
-                    )
-                else:
-                    print(
-                        f"  [-] FAILED: No significant time delay detected. Response time: {elapsed_time:.2f}s"
-                    )
-
-            # 2. 오류 기반(Error-Based) 공격 성공 조건: 500 에러 또는 응답에 DB 에러 메시지 포함
-            elif technique == "Error-Based":
-                if response.status_code == 500 or any(
-                    err in response.text.lower()
-                    for err in ["sql syntax", "error", "warning", "fatal"]
-                ):
-                    success = True
-                    print(
-                        f"  [+] SUCCESS: Error-based attack detected with status {response.status_code}."
-                    )
-                else:
-                    print("  [-] FAILED: No database error observed in response.")
-
-            # 3. 유니언 기반(UNION-Based) 공격 성공 조건: 정상 응답(200)이면서, 결과가 1개 초과로 반환 (모든 데이터를 훔쳤다고 가정)
-            elif technique == "UNION-Based":
-                try:
-                    if (
-                        response.status_code == 200
-                        and len(response.json().get("results", [])) > 1
-                    ):
-                        success = True
-                        print(
-                            f"  [+] SUCCESS: UNION-based attack seems successful, returned {len(response.json().get('results',[]))} items."
-                        )
-                    else:
-                        print(
-                            "  [-] FAILED: UNION-based attack did not return expected data."
-                        )
-                except json.JSONDecodeError:
-                    print(
-                        "  [-] FAILED: Response was not valid JSON, which might indicate an error page."
-                    )
-
-            # 4. 기타 (Boolean-Based 등) : 일단 200 응답이면 성공으로 간주, 추가 검증 필요
-            else:
-                if response.status_code == 200:
-                    success = (
-                        True  # 일단 성공으로 간주하고, Blue Team에서 로그 등을 확인
-                    )
-                    print(
-                        "  [?] SUCCESS (provisional): Attack sent and received HTTP 200. Manual verification or log check needed."
-                    )
-                else:
-                    print(
-                        f"  [-] FAILED: Received unexpected status code {response.status_code}"
-                    )
 
-            result["success"] = success
+async def _run_attacks(scenarios, concurrency):
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=ATTACK_TIMEOUT) as client:
+        return await asyncio.gather(
+            *(_attack(client, semaphore, scenario) for scenario in scenarios)
+        )
 
-        except requests.RequestException as e:
-            result["response"] = str(e)
-            # 시간 기반 공격 테스트 중 타임아웃은 '성공'일 수 있음
-            if technique == "Time-Based" and "Read timed out" in str(e):
-                result["success"] = True
-                print(
-                    "  [+] SUCCESS: Time-based attack detected (Request timed out as expected)."
-                )
-            else:
-                print(f"  [-] FAILED: Request failed - {e}")
 
-        attack_results.append(result)
-        time.sleep(1)
+def execute_attack_phase(concurrency=ATTACK_CONCURRENCY):
+    """
+    payloads.json을 읽어와 SQL Injection 공격을 수행합니다.
+    하나의 커넥션 풀(httpx.AsyncClient)로 최대 concurrency개의 요청을 동시에 보내고,
+    (공격 결과 목록, 처리량 통계)를 반환합니다.
+    """
+    print("\n--- 🔴 Starting Attack Phase (Red Team) 🔴 ---")
 
-    return attack_results
+    with open(PAYLOADS_FILE, "r", encoding="utf-8") as f:
+        payload_data = json.load(f)
+    scenarios = payload_data["scenarios"]
+
+    print(f"[*] Executing {len(scenarios)} scenarios (concurrency={concurrency})")
+    started_at = datetime.now(timezone.utc)
+    wall_start = time.perf_counter()
+    attack_results = asyncio.run(_run_attacks(scenarios, concurrency))
+    wall_time = time.perf_counter() - wall_start
+
+    latencies = sorted(r["latency_s"] for r in attack_results if r["latency_s"])
+    attack_stats = {
+        "started_at": started_at,
+        "concurrency": concurrency,
+        "requests": len(attack_results),
+        "wall_time_s": wall_time,
+        "throughput_rps": len(attack_results) / wall_time if wall_time else 0.0,
+        "p50_latency_s": latencies[len(latencies) // 2] if latencies else None,
+        "max_latency_s": latencies[-1] if latencies else None,
+    }
+    print(
+        f"[*] {attack_stats['requests']} requests in {wall_time:.2f}s "
+        f"({attack_stats['throughput_rps']:.1f} req/s)"
+    )
+    return attack_results, attack_stats
 
 
 # 🔵 --- Blue Team: 검증 페이즈 --- 🔵
-def execute_verification_phase(attack_results):
-    """공격 후 DB 상태를 확인하여 영향도와 탐지 여부를 검증합니다."""
+def payload_key(payload):
+    """탐지 이벤트와 공격 페이로드를 조인할 때 쓰는 키 (description 길이 제한으로 앞부분만 비교)"""
+    return payload.strip()[:PAYLOAD_KEY_LENGTH]
+
+
+def wait_for_events_to_settle(
+    count_events,
+    expected,
+    interval=EVENT_SETTLE_INTERVAL,
+    timeout=EVENT_SETTLE_TIMEOUT,
+    sleep=time.sleep,
+    clock=time.monotonic,
+):
+    """
+    count_events()가 expected 이상이 되거나, interval 간격으로 두 번 연속 같은 값이 나오거나,
+    timeout이 지날 때까지 기다린 뒤 마지막 이벤트 수를 반환합니다.
+    """
+    deadline = clock() + timeout
+    previous = None
+    while True:
+        count = count_events()
+        if count >= expected or count == previous or clock() >= deadline:
+            return count
+        previous = count
+        sleep(interval)
+
+
+def execute_verification_phase(attack_results, since):
+    """공격 후 DB 상태를 확인하여 영향도와 탐지 여부를 검증합니다. (since: 공격 시작 시각)"""
     print("\n--- 🔵 Starting Verification Phase (Blue Team) 🔵 ---")
     verification_results = {"impact_analysis": [], "detection_verification": []}
     db = SessionLocal()
@@ -192,43 +263,67 @@ def execute_verification_phase(attack_results):
         )
 
         # --- 2. 탐지 능력 검증 (Detection Verification) ---
+        # 공격 시작 이후의 탐지 이벤트를 한 번의 쿼리로 가져와, 메모리에서 페이로드와 조인합니다.
         print("[*] Performing Detection Verification...")
         try:
-            # events_query = sqlalchemy.text("SELECT event_type, description FROM security_events WHERE event_type = 'SQL_INJECTION_ATTEMPT'")
-            # events = db.execute(events_query).fetchall()
-            events = (
-                db.query(SecurityEvent)
-                .filter(SecurityEvent.event_type == "SQL_INJECTION_ATTEMPT")
-                .all()
+            event_filter = (
+                SecurityEvent.event_type == "SQL_INJECTION_ATTEMPT",
+                SecurityEvent.timestamp >= since - CLOCK_SKEW_MARGIN,
             )
 
+            def count_events():
+                count = (
+                    db.query(sqlalchemy.func.count(SecurityEvent.id))
+                    .filter(*event_filter)
+                    .scalar()
+                )
+                # REPEATABLE READ에서는 같은 트랜잭션의 스냅샷만 보이므로, 매번 트랜잭션을 끝냅니다.
+                db.rollback()
+                return count
+
+            settled = wait_for_events_to_settle(count_events, len(attack_results))
+            print(f"  [*] {settled} detection events recorded after settling.")
+            events = db.query(SecurityEvent.description).filter(*event_filter).all()
+            detected_payloads = {
+                payload_key(description.split(PAYLOAD_MARKER, 1)[1])
+                for (description,) in events
+                if description and PAYLOAD_MARKER in description
+            }
+            for result in attack_results:
+                result["detected"] = payload_key(result["payload"]) in detected_payloads
+
             # 성공한 공격 시도 수만큼 로그가 있어야 함
-            successful_attacks = sum(1 for r in attack_results if r["success"])
+            successful_attacks = [r for r in attack_results if r["success"]]
+            undetected = [r for r in successful_attacks if not r["detected"]]
 
-            if len(events) >= successful_attacks and successful_attacks > 0:
-                detect_msg = f"SUCCESS: Found {len(events)} 'SQL_INJECTION_ATTEMPT' events. Matched or exceeded the {successful_attacks} successful attacks."
-                print(f"  [+] {detect_msg}")
-                verification_results["detection_verification"].append(
-                    {
-                        "check": "Log Existence",
-                        "status": "SUCCESS",
-                        "details": detect_msg,
-                    }
-                )
-            elif successful_attacks == 0:
+            if successful_attacks and len(events) >= len(successful_attacks):
+                detect_msg = f"SUCCESS: Found {len(events)} 'SQL_INJECTION_ATTEMPT' events. Matched or exceeded the {len(successful_attacks)} successful attacks."
+                status = "SUCCESS"
+            elif not successful_attacks:
                 detect_msg = "INFO: No attacks were successful, so no detection logs are expected."
-                print(f"  [*] {detect_msg}")
-                verification_results["detection_verification"].append(
-                    {"check": "Log Existence", "status": "INFO", "details": detect_msg}
-                )
+                status = "INFO"
             else:
-                detect_msg = f"FAILURE: Expected at least {successful_attacks} 'SQL_INJECTION_ATTEMPT' events, but found only {len(events)}."
-                print(f"  [-] {detect_msg}")
+                detect_msg = f"FAILURE: Expected at least {len(successful_attacks)} 'SQL_INJECTION_ATTEMPT' events, but found only {len(events)}."
+                status = "FAILURE"
+            print(f"  [*] {detect_msg}")
+            verification_results["detection_verification"].append(
+                {"check": "Log Existence", "status": status, "details": detect_msg}
+            )
+
+            if successful_attacks:
+                if undetected:
+                    names = ", ".join(r["name"] for r in undetected)
+                    correlate_msg = f"FAILURE: {len(undetected)} successful attacks have no matching event: {names}"
+                    status = "FAILURE"
+                else:
+                    correlate_msg = f"SUCCESS: All {len(successful_attacks)} successful attacks matched an event by payload."
+                    status = "SUCCESS"
+                print(f"  [*] {correlate_msg}")
                 verification_results["detection_verification"].append(
                     {
-                        "check": "Log Existence",
-                        "status": "FAILURE",
-                        "details": detect_msg,
+                        "check": "Payload Correlation",
+                        "status": status,
+                        "details": correlate_msg,
                     }
                 )
         except Exception as e:
@@ -246,7 +341,7 @@ def execute_verification_phase(attack_results):
 
 
 # 📝 --- 보고서 생성 --- 📝
-def generate_report(attack_results, verification_results):
+def generate_report(attack_results, verification_results, attack_stats):
     """테스트 결과를 종합하여 Markdown 보고서를 생성합니다."""
     print("\n--- 📝 Generating Report 📝 ---")
 
@@ -263,6 +358,7 @@ This report details the results of an automated SQL Injection attack and verific
 - **Attack Scenarios Executed:** {len(attack_results)}
 - **Successful Attacks:** {sum(1 for r in attack_results if r['success'])}
 - **Attack Detection Verified:** {'✅' if any(r['status'] == 'SUCCESS' for r in verification_results['detection_verification']) else '❌'}
+- **Throughput:** {attack_stats['throughput_rps']:.1f} req/s ({attack_stats['requests']} requests in {attack_stats['wall_time_s']:.2f}s, concurrency {attack_stats['concurrency']})
 
 **Overall Assessment:**
 """
@@ -281,10 +377,12 @@ This report details the results of an automated SQL Injection attack and verific
     else:  # not attack_succeeded and detection_failed (공격은 실패했는데 로그 시스템도 실패)
         report_content += "**⚪️ INFO: The attack was not successful, but detection logs are incomplete. The logging system may have issues.**\n"
 
-    report_content += "\n## 🔴 Red Team: Attack Phase Results\n\n| Status | Technique | Scenario | Payload |\n| :----: | --------- | -------- | ------- |\n"
+    report_content += "\n## 🔴 Red Team: Attack Phase Results\n\n| Status | Detected | Technique | Scenario | Latency | Payload |\n| :----: | :------: | --------- | -------- | ------: | ------- |\n"
     for res in attack_results:
         status_icon = "✅" if res["success"] else "❌"
-        report_content += f"| {status_icon} | {res['technique']} | {res['name']} | `{res['payload']}` |\n"
+        detected_icon = "✅" if res.get("detected") else "❌"
+        latency = f"{res['latency_s']:.3f}s" if res["latency_s"] is not None else "-"
+        report_content += f"| {status_icon} | {detected_icon} | {res['technique']} | {res['name']} | {latency} | `{res['payload']}` |\n"
 
     report_content += "\n## 🔵 Blue Team: Verification Phase Results\n\n"
     report_content += "### Impact Analysis (Blast Radius)\n"
@@ -308,9 +406,13 @@ def main():
     if not wait_for_api(f"{TARGET_URL}/posts/"):
         exit(1)
 
-    attack_results = execute_attack_phase()
-    verification_results = execute_verification_phase(attack_results)
-    is_failure_condition_met = generate_report(attack_results, verification_results)
+    attack_results, attack_stats = execute_attack_phase()
+    verification_results = execute_verification_phase(
+        attack_results, attack_stats["started_at"]
+    )
+    is_failure_condition_met = generate_report(
+        attack_results, verification_results, attack_stats
+    )
 
     if is_failure_condition_met:
         print("\n❌ Test workflow completed with CRITICAL FINDINGS.")
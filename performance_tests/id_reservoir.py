@@ -0,0 +1,78 @@
+import bisect
+import itertools
+import random
+import threading
+
+DISTRIBUTIONS = ("uniform", "zipf")
+
+
+class IdReservoir:
+    """
+    부하 테스트 중 생성/조회된 게시물 ID를 최대 capacity개까지만 보관합니다.
+    가득 차면 Reservoir Sampling(Algorithm R)으로 교체하므로 메모리가 일정하고,
+    지금까지 본 ID 전체에서 고르게 표본을 유지합니다.
+
+    choice()는 uniform(균등) 또는 zipf(앞 순위일수록 자주 선택되는 핫키) 분포로 ID를 고릅니다.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        distribution: str = "uniform",
+        zipf_s: float = 1.1,
+        rng: random.Random = None,
+    ):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"지원하지 않는 분포입니다: {distribution}")
+        self.capacity = capacity
+        self.distribution = distribution
+        self.rng = rng or random.Random()
+        self._ids = []
+        self._positions = {}
+        self._seen = 0
+        self._lock = threading.Lock()
+        # 순위 k(0부터)의 가중치 1/(k+1)^s 누적합. 용량만큼 한 번만 계산합니다.
+        self._zipf_cumulative = list(
+            itertools.accumulate(1 / (k + 1) ** zipf_s for k in range(capacity))
+        )
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, post_id: int):
+        with self._lock:
+            if post_id in self._positions:
+                return
+            self._seen += 1
+            if len(self._ids) < self.capacity:
+                self._positions[post_id] = len(self._ids)
+                self._ids.append(post_id)
+                return
+            slot = self.rng.randrange(self._seen)
+            if slot < self.capacity:
+                del self._positions[self._ids[slot]]
+                self._ids[slot] = post_id
+                self._positions[post_id] = slot
+
+    def discard(self, post_id: int):
+        """삭제된 ID를 제거합니다. 마지막 원소를 빈 자리로 옮겨 O(1)에 처리합니다."""
+        with self._lock:
+            slot = self._positions.pop(post_id, None)
+            if slot is None:
+                return
+            last = self._ids.pop()
+            if slot < len(self._ids):
+                self._ids[slot] = last
+                self._positions[last] = slot
+
+    def choice(self):
+        """분포에 따라 ID 하나를 고릅니다. 비어 있으면 None."""
+        with self._lock:
+            size = len(self._ids)
+            if size == 0:
+                return None
+            if self.distribution == "uniform":
+                return self._ids[self.rng.randrange(size)]
+            total = self._zipf_cumulative[size - 1]
+            rank = bisect.bisect_left(self._zipf_cumulative, self.rng.random() * total)
+            return self._ids[min(rank, size - 1)]
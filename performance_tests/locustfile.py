@@ -1,68 +1,196 @@
 import random
+
 from faker import Faker
-from locust import HttpUser, task, between
+from locust import HttpUser, between, constant, events, task
+
+from id_reservoir import DISTRIBUTIONS, IdReservoir
 
 # 동적 테스트 데이터를 생성하기 위한 Faker 인스턴스
 fake = Faker()
 
+# 실행 예시 (프로파일은 사용자 클래스 이름으로 선택합니다):
+#   locust -f performance_tests/locustfile.py ReadHeavyUser --key-distribution zipf
+#   python performance_tests/run_profile.py --profile HotKeyUser --users 50 --run-time 1m
+
 
-class PostUser(HttpUser):
+@events.init_command_line_parser.add_listener
+def _add_workload_options(parser):
+    parser.add_argument(
+        "--key-distribution",
+        choices=DISTRIBUTIONS,
+        default="uniform",
+        help="조회/수정/삭제 대상 ID를 고르는 분포",
+    )
+    parser.add_argument("--zipf-s", type=float, default=1.1, help="Zipf 분포의 지수")
+    parser.add_argument(
+        "--reservoir-size", type=int, default=1000, help="유저별로 보관할 최대 ID 개수"
+    )
+
+
+class PostApiUser(HttpUser):
     """
-    게시판(Post) API를 사용하는 가상 유저를 정의합니다.
+    모든 프로파일이 공유하는 게시판(Post) API 작업 모음.
+    게시물 ID는 유저마다 크기가 제한된 IdReservoir에 보관하며, 시작 시 기존 게시물로 채웁니다.
     """
 
-    # 1. 테스트 대상 서버의 주소
+    abstract = True
     host = "http://127.0.0.1:8000"
-
-    # 2. 가상 유저가 각 작업을 수행한 후 대기할 시간 (1초 ~ 3초 사이)
-    #    실제 사용자의 행동 패턴을 모방합니다.
     wait_time = between(0.1, 0.5)
+    page_size = 100
 
-    # 3. 테스트 중에 생성된 게시물의 ID를 저장할 클래스 변수
-    post_ids = []
+    def on_start(self):
+        options = self.environment.parsed_options
+        self.post_ids = IdReservoir(
+            capacity=getattr(options, "reservoir_size", 1000),
+            distribution=getattr(options, "key_distribution", "uniform"),
+            zipf_s=getattr(options, "zipf_s", 1.1),
+        )
+        self.max_seen_id = 0
+        response = self.client.get(
+            f"/posts?limit={self.post_ids.capacity}", name="/posts (seed ids)"
+        )
+        if response.status_code == 200:
+            for post in response.json():
+                self._remember(post["id"])
 
-    @task(10)  # 가중치 10: 가장 빈번하게 실행될 작업
-    def list_posts(self):
-        """전체 게시물 목록을 조회하는 작업"""
-        self.client.get("/posts", name="/posts (list all)")
+    def _remember(self, post_id: int):
+        self.post_ids.add(post_id)
+        self.max_seen_id = max(self.max_seen_id, post_id)
 
-    @task(1)  # 가중치 1: 가장 드물게 실행될 작업
-    def create_post(self):
-        """새로운 게시물을 생성하는 작업"""
-        headers = {"Content-Type": "application/json"}
-        post_data = {
+    def _post_data(self) -> dict:
+        return {
             "title": fake.sentence(nb_words=4),
             "content": fake.text(max_nb_chars=200),
         }
 
+    # --- CRUD 작업 ---
+
+    def list_posts(self):
+        self.client.get(f"/posts?limit={self.page_size}", name="/posts (list)")
+
+    def paginate_deep(self):
+        """목록의 깊은 페이지(offset이 큰 구간)를 조회합니다."""
+        skip = random.randrange(max(self.max_seen_id - self.page_size, 0) + 1)
+        self.client.get(
+            f"/posts?skip={skip}&limit={self.page_size}", name="/posts?skip=[deep]"
+        )
+
+    def create_post(self):
         with self.client.post(
             "/posts",
-            json=post_data,
-            headers=headers,
+            json=self._post_data(),
             name="/posts (create)",
             catch_response=True,
         ) as response:
-            # 요청이 성공적으로 처리되었을 경우 (201 Created)
             if response.status_code == 201:
                 try:
-                    # 응답 JSON에서 새로 생성된 post의 id를 추출하여 리스트에 추가
-                    new_post_id = response.json()["id"]
-                    self.__class__.post_ids.append(new_post_id)
+                    self._remember(response.json()["id"])
                     response.success()
                 except Exception as e:
                     response.failure(f"Failed to parse JSON or find id: {e}")
             else:
                 response.failure(f"Status code was {response.status_code}")
 
-    @task(5)  # 가중치 5: 중간 빈도로 실행될 작업
     def view_post(self):
-        """특정 게시물 하나를 조회하는 작업"""
-        # 생성된 게시물이 하나도 없으면 이 작업은 실행하지 않음
-        if not self.post_ids:
+        post_id = self.post_ids.choice()
+        if post_id is None:
+            return
+        # /posts/1, /posts/2 등을 모두 /posts/[id]로 그룹화합니다.
+        with self.client.get(
+            f"/posts/{post_id}", name="/posts/[id] (view)", catch_response=True
+        ) as response:
+            self._check_existing(response, post_id)
+
+    def update_post(self):
+        post_id = self.post_ids.choice()
+        if post_id is None:
             return
+        with self.client.put(
+            f"/posts/{post_id}",
+            json=self._post_data(),
+            name="/posts/[id] (update)",
+            catch_response=True,
+        ) as response:
+            self._check_existing(response, post_id)
+
+    def delete_post(self):
+        post_id = self.post_ids.choice()
+        if post_id is None:
+            return
+        self.post_ids.discard(post_id)
+        with self.client.delete(
+            f"/posts/{post_id}", name="/posts/[id] (delete)", catch_response=True
+        ) as response:
+            self._check_existing(response, post_id)
+
+    def _check_existing(self, response, post_id: int):
+        # 다른 유저가 먼저 삭제한 게시물의 404는 실패로 보지 않고 목록에서만 제거합니다.
+        if response.status_code == 404:
+            self.post_ids.discard(post_id)
+            response.success()
+
+
+class ReadHeavyUser(PostApiUser):
+    """조회 위주의 일반적인 트래픽 (목록/단건 조회 90%)"""
+
+    @task(10)
+    def list_task(self):
+        self.list_posts()
+
+    @task(8)
+    def view_task(self):
+        self.view_post()
+
+    @task(1)
+    def create_task(self):
+        self.create_post()
+
+    @task(1)
+    def update_task(self):
+        self.update_post()
+
+
+class WriteBurstUser(PostApiUser):
+    """대기 없이 생성/수정/삭제를 몰아서 보내는 쓰기 폭주 트래픽"""
+
+    wait_time = constant(0)
+
+    @task(6)
+    def create_task(self):
+        self.create_post()
+
+    @task(3)
+    def update_task(self):
+        self.update_post()
+
+    @task(1)
+    def delete_task(self):
+        self.delete_post()
+
+
+class DeepPaginationUser(PostApiUser):
+    """offset이 큰 페이지를 반복 조회하는 트래픽 (OFFSET 스캔 비용 확인용)"""
+
+    @task(9)
+    def paginate_task(self):
+        self.paginate_deep()
+
+    @task(1)
+    def create_task(self):
+        self.create_post()
+
+
+class HotKeyUser(PostApiUser):
+    """소수의 인기 게시물에 조회/수정이 몰리는 트래픽 (항상 zipf 분포로 ID를 고릅니다)"""
+
+    def on_start(self):
+        super().on_start()
+        self.post_ids.distribution = "zipf"
 
-        # 지금까지 생성된 게시물 ID 중 하나를 무작위로 선택
-        post_id = random.choice(self.post_ids)
+    @task(9)
+    def view_task(self):
+        self.view_post()
 
-        # Locust 리포트에서 /posts/1, /posts/2 등을 모두 /posts/[id]로 그룹화하기 위해 name 파라미터 사용
-        self.client.get(f"/posts/{post_id}", name="/posts/[id] (view one)")
+    @task(1)
+    def update_task(self):
+        self.update_post()
@@ -0,0 +1,217 @@
+# performance_tests/replay_access_logs.py
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+
+import httpx
+from sqlalchemy import func, select
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import AccessLog, Route, route_template
+from app.services.quantile_sketch import LatencySketch
+from app.services.streaming import stream_query
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """리포트에서 /posts/1, /posts/2 등을 '/posts/{id}'로 묶기 위한 키 (routes.template과 같은 규칙)"""
+    return f"{method} {route_template(path)}"
+
+
+async def iter_access_logs(engine, start, end, chunk_size: int = 5_000):
+    """
+    [start, end) 구간의 access_logs를 timestamp 순서로 스트리밍합니다.
+    DB 조회는 스레드에서 청크 단위로 진행하므로 이벤트 루프(요청 발송)를 막지 않습니다.
+    """
+    query = (
+        select(
+            AccessLog.timestamp,
+            AccessLog.method,
+            # 원래 경로는 템플릿과 다를 때만 raw_path에 저장되어 있습니다.
+            func.coalesce(AccessLog.raw_path, Route.template).label("path"),
+            AccessLog.status_code,
+            AccessLog.response_time_ms,
+        )
+        .join_from(AccessLog, Route, AccessLog.route_id == Route.id)
+        .where(AccessLog.timestamp >= start, AccessLog.timestamp < end)
+        .order_by(AccessLog.timestamp, AccessLog.id)
+    )
+    chunks = stream_query(engine, query, chunk_size=chunk_size)
+    try:
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                return
+            for row in chunk.itertuples(index=False):
+                yield row
+    finally:
+        chunks.close()
+
+
+@dataclass
+class ReplayReport:
+    """엔드포인트별 기록된 응답 시간과 재생 응답 시간의 스케치, 오류/지연 통계"""
+
+    recorded: dict = field(default_factory=dict)
+    replayed: dict = field(default_factory=dict)
+    sent: int = 0
+    skipped: int = 0
+    errors: int = 0
+    status_mismatches: int = 0
+    max_lag_ms: float = 0.0
+
+    def record(self, key: str, recorded_ms: float, replayed_ms: float):
+        self.recorded.setdefault(key, LatencySketch()).add(recorded_ms)
+        self.replayed.setdefault(key, LatencySketch()).add(replayed_ms)
+
+    def summary(self) -> dict:
+        endpoints = {}
+        for key, replayed in sorted(self.replayed.items()):
+            recorded = self.recorded[key]
+            stats = {"count": replayed.count}
+            for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+                before, after = recorded.quantile(q), replayed.quantile(q)
+                stats[f"recorded_{name}_ms"] = round(before, 3)
+                stats[f"replayed_{name}_ms"] = round(after, 3)
+                stats[f"{name}_ratio"] = round(after / before, 3) if before else None
+            endpoints[key] = stats
+        return {
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "status_mismatches": self.status_mismatches,
+            "max_schedule_lag_ms": round(self.max_lag_ms, 3),
+            "endpoints": endpoints,
+        }
+
+
+async def replay(
+    rows,
+    client: httpx.AsyncClient,
+    speed: float = 1.0,
+    concurrency: int = 50,
+    include_writes: bool = False,
+) -> ReplayReport:
+    """
+    기록된 요청을 원래의 도착 간격을 speed배로 줄여 다시 보냅니다. (speed=0이면 최대한 빠르게)
+    동시에 진행 중인 요청 수는 concurrency로 제한되며, 제한 때문에 예정 시각보다 늦게 보낸
+    최대 지연(max_schedule_lag_ms)을 함께 기록합니다.
+    """
+    report = ReplayReport()
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    tasks = set()
+    first_timestamp = None
+    started = loop.time()
+
+    async def _send(row):
+        try:
+            request_started = time.perf_counter()
+            body = None
+            if row.method in ("POST", "PUT", "PATCH"):
+                body = {"title": "replay", "content": "replayed request"}
+            response = await client.request(row.method, row.path, json=body)
+            elapsed_ms = (time.perf_counter() - request_started) * 1000
+            report.record(
+                endpoint_key(row.method, row.path), row.response_time_ms, elapsed_ms
+            )
+            if response.status_code != row.status_code:
+                report.status_mismatches += 1
+        except httpx.HTTPError:
+            report.errors += 1
+        finally:
+            semaphore.release()
+
+    async for row in rows:
+        if not include_writes and row.method not in READ_METHODS:
+            report.skipped += 1
+            continue
+        if first_timestamp is None:
+            first_timestamp = row.timestamp
+        if speed > 0:
+            offset = (row.timestamp - first_timestamp).total_seconds() / speed
+            delay = started + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                report.max_lag_ms = max(report.max_lag_ms, -delay * 1000)
+
+        await semaphore.acquire()
+        report.sent += 1
+        task = asyncio.create_task(_send(row))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+    return report
+
+
+async def _main_async(args):
+    from app.database import engine
+
+    start = datetime.datetime.fromisoformat(args.start)
+    end = datetime.datetime.fromisoformat(args.end)
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.target, limits=limits, timeout=args.timeout
+    ) as client:
+        return await replay(
+            iter_access_logs(engine, start, end),
+            client,
+            speed=args.speed,
+            concurrency=args.concurrency,
+            include_writes=args.include_writes,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="access_logs에 기록된 실제 트래픽을 대상 서버에 다시 재생합니다."
+    )
+    parser.add_argument("--target", default="http://127.0.0.1:8000")
+    parser.add_argument("--start", required=True, help="재생 구간 시작 (ISO 8601)")
+    parser.add_argument("--end", required=True, help="재생 구간 끝 (ISO 8601)")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="재생 배속 (0이면 최대한 빠르게)"
+    )
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--include-writes",
+        action="store_true",
+        help="POST/PUT/DELETE도 재생합니다. (대상 DB가 변경됩니다)",
+    )
+    parser.add_argument("--output", default="replay-report.json")
+    args = parser.parse_args()
+
+    print(f"▶️ 재생 시작: {args.start} ~ {args.end} -> {args.target} (x{args.speed})")
+    report = asyncio.run(_main_async(args))
+    summary = report.summary()
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(
+        f"✅ {summary['sent']:,}건 재생 (건너뜀 {summary['skipped']:,}, 오류 {summary['errors']:,}, "
+        f"상태 코드 불일치 {summary['status_mismatches']:,}) -> {args.output}"
+    )
+    for key, stats in summary["endpoints"].items():
+        print(
+            f"  - {key}: p95 {stats['recorded_p95_ms']}ms -> {stats['replayed_p95_ms']}ms "
+            f"(x{stats['p95_ratio']})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# performance_tests/run_profile.py
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from performance_tests.id_reservoir import DISTRIBUTIONS
+
+PERFORMANCE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOCUSTFILE = os.path.join(PERFORMANCE_DIR, "locustfile.py")
+PROFILES = ["ReadHeavyUser", "WriteBurstUser", "DeepPaginationUser", "HotKeyUser"]
+# locust --csv의 *_stats.csv 백분위 컬럼 -> 결과 JSON 키
+PERCENTILE_COLUMNS = {
+    "50%": "p50_ms",
+    "75%": "p75_ms",
+    "90%": "p90_ms",
+    "95%": "p95_ms",
+    "99%": "p99_ms",
+    "99.9%": "p999_ms",
+    "100%": "max_ms",
+}
+COMPARE_METRICS = ["p50_ms", "p95_ms", "p99_ms", "requests_per_s"]
+
+
+def _number(value: str):
+    if value in ("", "N/A", None):
+        return None
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def stats_csv_to_endpoints(stats_csv_path: str) -> dict:
+    """locust *_stats.csv를 {'METHOD name': 지표} 형태의 엔드포인트별 딕셔너리로 바꿉니다."""
+    endpoints = {}
+    with open(stats_csv_path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            key = f"{row['Type']} {row['Name']}".strip()
+            metrics = {
+                "requests": _number(row["Request Count"]),
+                "failures": _number(row["Failure Count"]),
+                "avg_ms": _number(row["Average Response Time"]),
+                "requests_per_s": _number(row["Requests/s"]),
+            }
+            for column, name in PERCENTILE_COLUMNS.items():
+                metrics[name] = _number(row.get(column))
+            endpoints[key] = metrics
+    return endpoints
+
+
+def compare_results(current: dict, baseline: dict) -> list:
+    """두 실행 결과의 엔드포인트별 주요 지표 변화율을 (엔드포인트, 지표, 이전, 현재, 변화율) 목록으로 반환합니다."""
+    rows = []
+    for endpoint, metrics in current["endpoints"].items():
+        previous = baseline["endpoints"].get(endpoint)
+        if not previous:
+            continue
+        for metric in COMPARE_METRICS:
+            before, after = previous.get(metric), metrics.get(metric)
+            if before and after is not None:
+                rows.append((endpoint, metric, before, after, after / before - 1))
+    return rows
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="locust 프로파일을 headless로 실행하고 엔드포인트별 백분위 결과를 JSON으로 저장합니다."
+    )
+    parser.add_argument("--profile", choices=PROFILES, default="ReadHeavyUser")
+    parser.add_argument("--host", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--spawn-rate", type=float, default=5)
+    parser.add_argument("--run-time", default="1m")
+    parser.add_argument(
+        "--key-distribution", choices=DISTRIBUTIONS, default=DISTRIBUTIONS[0]
+    )
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args()
+
+    output = args.output or f"locust-{args.profile}.json"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_prefix = os.path.join(tmp_dir, "run")
+        command = [
+            sys.executable,
+            "-m",
+            "locust",
+            "-f",
+            LOCUSTFILE,
+            args.profile,
+            "--headless",
+            "--only-summary",
+            "--host",
+            args.host,
+            "--users",
+            str(args.users),
+            "--spawn-rate",
+            str(args.spawn_rate),
+            "--run-time",
+            args.run_time,
+            "--key-distribution",
+            args.key_distribution,
+            "--csv",
+            csv_prefix,
+        ]
+        print(f"▶️ 프로파일 실행: {args.profile} ({args.users} users, {args.run_time})")
+        completed = subprocess.run(command)
+        endpoints = stats_csv_to_endpoints(f"{csv_prefix}_stats.csv")
+
+    result = {
+        "profile": args.profile,
+        "git_commit": _git_commit(),
+        "finished_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "settings": {
+            "host": args.host,
+            "users": args.users,
+            "spawn_rate": args.spawn_rate,
+            "run_time": args.run_time,
+            "key_distribution": args.key_distribution,
+        },
+        "locust_exit_code": completed.returncode,
+        "endpoints": endpoints,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"✅ 결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"📊 이전 결과({baseline.get('git_commit')})와 비교:")
+        for endpoint, metric, before, after, change in compare_results(
+            result, baseline
+        ):
+            print(f"  - {endpoint} {metric}: {before} -> {after} ({change:+.1%})")
+
+    sys.exit(completed.returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# scripts/archive_access_logs.py
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine
+from app.services.log_archive import ANALYSIS_QUERIES, ColdArchive, run_analysis
+
+
+def _parse_datetime(value: str):
+    return datetime.datetime.fromisoformat(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="오래된 access_logs 행을 일 단위 Brotli NDJSON 아카이브로 옮기고 핫 테이블에서 삭제합니다."
+    )
+    parser.add_argument("--output", default="archives/access_logs")
+    parser.add_argument("--older-than-days", type=int, default=90)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument(
+        "--query",
+        choices=sorted(ANALYSIS_QUERIES),
+        help="아카이브 대신, 핫 테이블과 아카이브를 합친 구간에 분석 쿼리를 실행합니다.",
+    )
+    parser.add_argument(
+        "--since", type=_parse_datetime, help="조회 시작 (UTC, ISO 8601)"
+    )
+    parser.add_argument("--until", type=_parse_datetime, help="조회 끝 (UTC, 미포함)")
+    args = parser.parse_args()
+
+    if args.query:
+        result = run_analysis(engine, args.output, args.query, args.since, args.until)
+        print(result.to_string(index=False))
+        return
+
+    print(f"▶️ {args.older_than_days}일 이전 access_logs 아카이브 시작: {args.output}")
+    started = time.perf_counter()
+    archive = ColdArchive(args.output)
+    summary = archive.archive(
+        engine, older_than_days=args.older_than_days, chunk_size=args.chunk_size
+    )
+    elapsed = time.perf_counter() - started
+
+    total_bytes = sum(part["bytes"] for part in archive.parts)
+    print(
+        f"✅ {summary['archived_rows']:,}행 아카이브, {summary['deleted_rows']:,}행 삭제 "
+        f"({elapsed:.2f}s, 기준 {summary['cutoff']}). "
+        f"아카이브 전체: 파트 {len(archive.parts)}개, {total_bytes / 1024:,.1f} KB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# scripts/export_access_logs_snapshot.py
+
+import argparse
+import os
+import sys
+import time
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine
+from app.services.log_snapshot import LogSnapshot, export_access_logs
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="access_logs 테이블을 컬럼형 스냅샷으로 내보냅니다. (이미 있으면 새 행만 추가)"
+    )
+    parser.add_argument("--output", default="snapshots/access_logs")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"▶️ access_logs 스냅샷 내보내기 시작: {args.output}")
+    started = time.perf_counter()
+    exported = export_access_logs(engine, args.output, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    snapshot = LogSnapshot(args.output)
+    print(
+        f"✅ {exported:,}행 추가 완료 ({elapsed:.2f}s). "
+        f"스냅샷 전체: {len(snapshot):,}행, 워터마크 id={snapshot.meta['watermark']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# scripts/fixture_snapshot.py
+
+import argparse
+import datetime
+import hashlib
+import inspect
+import json
+import os
+import random
+import sys
+
+from faker import Faker
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.orm import Session
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import models
+from app.models import AccessLog, Route, SecurityEvent, clear_route_cache
+from scripts import create_mock_data
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SNAPSHOT_DIR = os.getenv(
+    "FIXTURE_SNAPSHOT_DIR", os.path.join(PROJECT_ROOT, ".fixture_snapshots")
+)
+DEFAULT_SEED = 42
+GENERATORS = {
+    "run_data_creation": create_mock_data.run_data_creation,
+    "run_normal_data_creation": create_mock_data.run_normal_data_creation,
+}
+# 스냅샷에 담는 테이블(참조되는 routes 사전 테이블 먼저)과, 복원 시점에 맞춰 이동시킬 시간 컬럼
+SNAPSHOT_TABLES = [Route.__table__, AccessLog.__table__, SecurityEvent.__table__]
+TIME_COLUMN = "timestamp"
+
+
+def snapshot_key(generator: str, num_logs: int, seed: int = DEFAULT_SEED) -> str:
+    """
+    생성 함수 이름/인자/시드와, 데이터 생성 모듈 및 모델의 소스 코드를 해시합니다.
+    생성 로직이나 스키마가 바뀌면 키가 달라지므로 오래된 스냅샷을 쓰지 않습니다.
+    """
+    source = inspect.getsource(create_mock_data) + inspect.getsource(models)
+    fingerprint = json.dumps(
+        {
+            "generator": generator,
+            "num_logs": num_logs,
+            "seed": seed,
+            "source": hashlib.sha256(source.encode("utf-8")).hexdigest(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+
+def _snapshot_paths(snapshot_dir: str, key: str):
+    base = os.path.join(snapshot_dir, key)
+    return base + ".sqlite", base + ".json"
+
+
+def build_snapshot(
+    generator: str, num_logs: int, seed: int, db_path: str, meta_path: str
+):
+    """시드를 고정하고 생성 함수를 한 번 실행하여 결과를 SQLite 파일로 저장합니다."""
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    engine = create_engine(f"sqlite:///{tmp_path}")
+    try:
+        models.Base.metadata.create_all(engine, tables=SNAPSHOT_TABLES)
+        random.seed(seed)
+        Faker.seed(seed)
+        built_at = datetime.datetime.now(datetime.timezone.utc)
+        with Session(engine) as db:
+            GENERATORS[generator](db, num_logs=num_logs)
+            db.commit()
+    finally:
+        engine.dispose()
+
+    os.replace(tmp_path, db_path)
+    tmp_meta = meta_path + ".tmp"
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "generator": generator,
+                "num_logs": num_logs,
+                "seed": seed,
+                "built_at": built_at.isoformat(),
+            },
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    os.replace(tmp_meta, meta_path)
+
+
+def ensure_snapshot(
+    generator: str,
+    num_logs: int,
+    seed: int = DEFAULT_SEED,
+    snapshot_dir: str = DEFAULT_SNAPSHOT_DIR,
+):
+    """스냅샷이 없으면 만들고, (SQLite 경로, 메타데이터, 새로 만들었는지 여부)를 반환합니다."""
+    os.makedirs(snapshot_dir, exist_ok=True)
+    db_path, meta_path = _snapshot_paths(
+        snapshot_dir, snapshot_key(generator, num_logs, seed)
+    )
+    built = False
+    if not (os.path.exists(db_path) and os.path.exists(meta_path)):
+        print(
+            f"  - 픽스처 스냅샷 생성 중: {generator}(num_logs={num_logs}, seed={seed})"
+        )
+        build_snapshot(generator, num_logs, seed, db_path, meta_path)
+        built = True
+    with open(meta_path, "r", encoding="utf-8") as f:
+        return db_path, json.load(f), built
+
+
+def restore_snapshot(
+    db_path: str, meta: dict, target_engine, batch_size: int = 50_000
+) -> dict:
+    """
+    스냅샷의 행을 대상 DB에 executemany 배치로 그대로 복사합니다.
+    모의 데이터는 '현재 시각' 기준으로 만들어지므로, 모든 timestamp를 (지금 - 생성 시각)만큼 옮겨
+    '최근 24시간' 같은 시간 조건이 생성 직후와 똑같이 동작하게 합니다.
+    """
+    built_at = datetime.datetime.fromisoformat(meta["built_at"])
+    shift = datetime.datetime.now(datetime.timezone.utc) - built_at
+    source_engine = create_engine(f"sqlite:///{db_path}")
+    counts = {}
+    try:
+        with source_engine.connect() as source, target_engine.begin() as target:
+            for table in reversed(SNAPSHOT_TABLES):
+                target.execute(delete(table))
+            for table in SNAPSHOT_TABLES:
+                counts[table.name] = 0
+                result = source.execution_options(stream_results=True).execute(
+                    select(table).order_by(table.c.id)
+                )
+                for partition in result.mappings().partitions(batch_size):
+                    rows = [dict(row) for row in partition]
+                    for row in rows:
+                        if row.get(TIME_COLUMN) is not None:
+                            row[TIME_COLUMN] = row[TIME_COLUMN] + shift
+                    target.execute(insert(table), rows)
+                    counts[table.name] += len(rows)
+    finally:
+        source_engine.dispose()
+        # routes를 스냅샷의 id로 다시 채웠으므로 대상 엔진의 경로 캐시를 비웁니다.
+        clear_route_cache(target_engine)
+    return counts
+
+
+def load_fixture_dataset(
+    target_engine,
+    generator: str = "run_data_creation",
+    num_logs: int = 5000,
+    seed: int = DEFAULT_SEED,
+    snapshot_dir: str = DEFAULT_SNAPSHOT_DIR,
+) -> dict:
+    """캐시된 스냅샷(없으면 새로 생성)을 대상 DB에 복원하고 테이블별 행 수를 반환합니다."""
+    db_path, meta, _ = ensure_snapshot(generator, num_logs, seed, snapshot_dir)
+    return restore_snapshot(db_path, meta, target_engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="분석 테스트용 모의 데이터 스냅샷을 미리 만들어 둡니다."
+    )
+    parser.add_argument("--generator", choices=sorted(GENERATORS), nargs="+")
+    parser.add_argument("--num-logs", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", default=DEFAULT_SNAPSHOT_DIR)
+    args = parser.parse_args()
+
+    for generator in args.generator or sorted(GENERATORS):
+        db_path, meta, built = ensure_snapshot(
+            generator, args.num_logs, args.seed, args.output
+        )
+        status = "생성 완료" if built else "이미 존재"
+        print(f"✅ {generator}: {status} -> {db_path} (built_at={meta['built_at']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# scripts/ingest_access_logs.py
+
+import argparse
+import os
+import sys
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine
+from app.services.log_ingest import (
+    TIME_UNITS,
+    IngestCheckpoint,
+    IngestStats,
+    ingest_file,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="gunicorn/uvicorn 액세스 로그 파일(.gz 포함)을 access_logs 테이블에 일괄 적재합니다."
+    )
+    parser.add_argument("files", nargs="+", help="적재할 로그 파일 경로")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument(
+        "--time-unit",
+        choices=sorted(TIME_UNITS),
+        default="us",
+        help="로그 끝의 응답 시간 필드 단위 (gunicorn %%(D)s=us, %%(M)s=ms)",
+    )
+    parser.add_argument("--checkpoint", default="ingest_checkpoint.json")
+    args = parser.parse_args()
+
+    checkpoint = IngestCheckpoint(args.checkpoint)
+    total = IngestStats()
+    for log_path in args.files:
+        print(f"▶️ 적재 시작: {log_path}")
+        stats = ingest_file(
+            engine,
+            log_path,
+            checkpoint,
+            batch_size=args.batch_size,
+            time_unit=args.time_unit,
+        )
+        print(f"  - {stats.summary()}")
+        total.lines += stats.lines
+        total.inserted += stats.inserted
+        total.skipped += stats.skipped
+        total.batches += stats.batches
+
+    print(f"✅ 전체 적재 완료: {total.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+-- ===================================================================================
+-- access_logs 컴팩트 인코딩 마이그레이션 (MySQL 8 / MariaDB 10.0.5 이상)
+-- path(VARCHAR 255) -> routes 사전 테이블 키(route_id) + 템플릿과 다를 때만 남기는 raw_path
+-- ip_address(VARCHAR 50) -> VARBINARY(16) (INET6_ATON 형식)
+-- 템플릿 규칙은 app.models.route_template()과 같습니다. (쿼리 문자열 제거, 숫자/UUID 구간 -> {id})
+-- ===================================================================================
+
+CREATE TABLE IF NOT EXISTS routes (
+    id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    template VARCHAR(255) NOT NULL,
+    UNIQUE KEY uq_routes_template (template)
+);
+
+INSERT IGNORE INTO routes (template)
+SELECT DISTINCT
+    REGEXP_REPLACE(
+        SUBSTRING_INDEX(path, '?', 1),
+        '/([0-9]+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})(?=/|$)',
+        '/{id}'
+    )
+FROM
+    access_logs;
+
+ALTER TABLE access_logs
+    ADD COLUMN route_id INT NULL,
+    ADD COLUMN raw_path VARCHAR(255) NULL,
+    ADD COLUMN ip_packed VARBINARY(16) NULL;
+
+UPDATE
+    access_logs
+JOIN
+    routes ON routes.template = REGEXP_REPLACE(
+        SUBSTRING_INDEX(access_logs.path, '?', 1),
+        '/([0-9]+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})(?=/|$)',
+        '/{id}'
+    )
+SET
+    access_logs.route_id = routes.id,
+    access_logs.raw_path = IF(access_logs.path = routes.template, NULL, access_logs.path),
+    access_logs.ip_packed = INET6_ATON(access_logs.ip_address);
+
+ALTER TABLE access_logs
+    DROP COLUMN path,
+    DROP COLUMN ip_address,
+    CHANGE COLUMN ip_packed ip_address VARBINARY(16) NOT NULL,
+    MODIFY COLUMN route_id INT NOT NULL,
+    ADD INDEX ix_access_logs_route_id (route_id),
+    ADD CONSTRAINT fk_access_logs_route_id FOREIGN KEY (route_id) REFERENCES routes (id);
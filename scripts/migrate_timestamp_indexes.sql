@@ -0,0 +1,15 @@
+-- ===================================================================================
+-- 모니터링 규칙용 timestamp 인덱스 마이그레이션 (MySQL 8 / MariaDB 10.0.5 이상)
+-- create_all()은 이미 있는 테이블에 인덱스를 추가하지 않으므로, 기존 DB에서는 이 스크립트를 한 번 실행합니다.
+-- 인덱스 이름은 SQLAlchemy(index=True)가 새 테이블에 만드는 이름과 같습니다. (ix_<테이블>_<컬럼>)
+-- InnoDB 온라인 DDL(ALGORITHM=INPLACE, LOCK=NONE)로 만들므로 빌드 중에도 로그 INSERT가 막히지 않습니다.
+-- 이미 인덱스가 있으면 'Duplicate key name' 에러가 나며, 그 문장은 건너뛰면 됩니다.
+-- ===================================================================================
+
+ALTER TABLE access_logs
+    ADD INDEX ix_access_logs_timestamp (timestamp),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE security_events
+    ADD INDEX ix_security_events_timestamp (timestamp),
+    ALGORITHM=INPLACE, LOCK=NONE;
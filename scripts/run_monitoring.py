@@ -0,0 +1,64 @@
+# scripts/run_monitoring.py
+
+import argparse
+import os
+import sys
+import threading
+
+from sqlalchemy import create_engine
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SQLALCHEMY_DATABASE_URL
+from app.services.monitoring import DEFAULT_RULES, RuleScheduler, WatermarkStore
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="analysis_queries.sql의 탐지 쿼리를 주기적으로 실행하는 모니터링 스케줄러"
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=4,
+        help="동시에 실행할 규칙 수이자 사용할 최대 DB 커넥션 수",
+    )
+    parser.add_argument("--state-file", default="monitoring_watermarks.json")
+    parser.add_argument(
+        "--once", action="store_true", help="모든 규칙을 한 번씩만 실행하고 종료"
+    )
+    args = parser.parse_args()
+
+    # 스케줄러 전용 엔진: 커넥션 수를 규칙 동시 실행 수로 제한합니다.
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=args.max_connections,
+        max_overflow=0,
+        pool_recycle=3600,
+    )
+    scheduler = RuleScheduler(
+        engine,
+        DEFAULT_RULES,
+        WatermarkStore(args.state_file),
+        max_concurrency=args.max_connections,
+    )
+
+    if args.once:
+        for rule in DEFAULT_RULES:
+            result = scheduler.run_rule(rule)
+            status = "새 데이터 없음" if result is None else f"{result}건 탐지"
+            print(f"  - {rule.name}: {status}")
+        return
+
+    stop_event = threading.Event()
+    try:
+        scheduler.run_forever(stop_event)
+    except KeyboardInterrupt:
+        stop_event.set()
+        print("\n⏹️ 모니터링 스케줄러를 종료합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session  # ✅ Session import
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app, get_db
@@ -45,6 +47,10 @@ def test_client(db_session):
 
 
 # --- 👇 데이터 분석 테스트용 Fixture (이 부분을 완성) ---
+# 분석 테스트용 모의 로그 개수. 대용량 검증 시 FIXTURE_NUM_LOGS=1000000 처럼 지정합니다.
+FIXTURE_NUM_LOGS = int(os.getenv("FIXTURE_NUM_LOGS", "5000"))
+
+
 @pytest.fixture(scope="session")
 def mysql_engine():
     """테스트용 MySQL DB 엔진을 생성합니다."""
@@ -62,27 +68,21 @@ def setup_test_data(mysql_engine):
     MySQL 테스트 DB에 연결하고, 테이블을 재생성한 후
     scripts/create_mock_data.py를 호출하여 모의 데이터를 생성합니다.
     """
-    # ✅ 1. 'scripts' 폴더에서 데이터 생성 함수를 불러옵니다.
-    from scripts.create_mock_data import run_data_creation
+    # ✅ 1. 'scripts' 폴더에서 스냅샷 복원 함수를 불러옵니다.
+    from scripts.fixture_snapshot import load_fixture_dataset
 
     print("\n[Fixture 준비] MySQL 테스트 데이터를 설정합니다...")
     AnalysisBase.metadata.drop_all(bind=mysql_engine)
     AnalysisBase.metadata.create_all(bind=mysql_engine)
 
-    # ✅ 2. DB와 통신할 세션을 생성하고, 에러가 발생해도 세션을 확실히 닫도록 try...finally 사용
-    db = Session(mysql_engine)
+    # ✅ 2. 같은 인자/시드로 만든 스냅샷이 있으면 그대로 일괄 복원하고, 없을 때만 새로 생성합니다.
     try:
-        # ✅ 3. 생성한 세션을 인자로 넘겨주어 데이터 생성을 실행합니다.
-        run_data_creation(db)
-
-        # ✅ 4. 모든 데이터가 추가되었으면 DB에 최종 저장(commit)합니다.
-        db.commit()
+        counts = load_fixture_dataset(
+            mysql_engine, "run_data_creation", num_logs=FIXTURE_NUM_LOGS
+        )
+        print(f"  - 스냅샷 복원 완료: {counts}")
     except Exception as e:
         print(f"데이터 생성 중 에러 발생: {e}")
-        db.rollback()  # 에러 발생 시 작업을 모두 되돌립니다.
-    finally:
-        # ✅ 5. 작업이 성공하든 실패하든 항상 세션을 닫아줍니다.
-        db.close()
 
     print("[Fixture 준비] 데이터 설정 완료.")
     yield
@@ -97,23 +97,20 @@ def setup_normal_operation_data(mysql_engine):
     MySQL 테스트 DB에 '정상 상태'의 데이터만 생성합니다.
     이 Fixture는 이상 징후가 없어야 통과하는 모니터링 테스트에서 사용됩니다.
     """
-    # ❗️ '정상 상태' 데이터 생성 함수를 불러옵니다.
-    from scripts.create_mock_data import run_normal_data_creation
+    # ❗️ '정상 상태' 데이터 스냅샷을 복원합니다.
+    from scripts.fixture_snapshot import load_fixture_dataset
 
     print("\n[Fixture 준비] MySQL '정상 상태' 데이터를 설정합니다...")
     AnalysisBase.metadata.drop_all(bind=mysql_engine)
     AnalysisBase.metadata.create_all(bind=mysql_engine)
 
-    db = Session(mysql_engine)
     try:
-        # '정상 상태' 데이터 생성 함수 호출
-        run_normal_data_creation(db)
-        db.commit()
+        counts = load_fixture_dataset(
+            mysql_engine, "run_normal_data_creation", num_logs=FIXTURE_NUM_LOGS
+        )
+        print(f"  - 스냅샷 복원 완료: {counts}")
     except Exception as e:
         print(f"정상 상태 데이터 생성 중 에러 발생: {e}")
-        db.rollback()
-    finally:
-        db.close()
 
     print("[Fixture 준비] '정상 상태' 데이터 설정 완료.")
     yield
@@ -0,0 +1,93 @@
+import datetime
+
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import StatementError
+
+from app.models import AccessLog, Route, encode_access_log_rows, route_template
+
+
+def _log(path, ip="10.0.0.1"):
+    return AccessLog(
+        ip_address=ip,
+        timestamp=datetime.datetime(2025, 10, 10, 12, 0),
+        method="GET",
+        path=path,
+        status_code=200,
+        response_time_ms=10.0,
+    )
+
+
+@pytest.mark.parametrize(
+    "path, template",
+    [
+        ("/posts", "/posts"),
+        ("/posts/15", "/posts/{id}"),
+        ("/users/3/posts/4?x=1", "/users/{id}/posts/{id}"),
+        ("/items/0b7e3c1a-9a7e-4f6b-8d2a-3c5e7f9a1b2c", "/items/{id}"),
+        ("/admin/.git", "/admin/.git"),
+        ("/v2/posts", "/v2/posts"),
+    ],
+)
+def test_route_template(path, template):
+    assert route_template(path) == template
+
+
+def test_paths_are_stored_as_route_keys(db_session):
+    """같은 템플릿은 routes 한 행을 공유하고, 원래 경로는 템플릿과 다를 때만 raw_path에 남는지 테스트"""
+    db_session.add_all(
+        [_log("/posts"), _log("/posts/1"), _log("/posts/15", ip="2001:db8::1")]
+    )
+    db_session.commit()
+
+    assert db_session.execute(select(Route.template)).scalars().all() == [
+        "/posts",
+        "/posts/{id}",
+    ]
+    logs = db_session.scalars(select(AccessLog).order_by(AccessLog.id)).all()
+    assert [log.raw_path for log in logs] == [None, "/posts/1", "/posts/15"]
+    assert [log.path for log in logs] == ["/posts", "/posts/1", "/posts/15"]
+    assert logs[2].ip_address == "2001:db8::1"
+
+    # IP는 4/16바이트 이진값으로 저장되어야 함
+    stored = db_session.execute(
+        text("SELECT length(ip_address) FROM access_logs ORDER BY id")
+    ).scalars()
+    assert list(stored) == [4, 4, 16]
+
+    logs[0].path = "/users"
+    db_session.commit()
+    assert db_session.get(AccessLog, logs[0].id).route.template == "/users"
+
+
+def test_core_rows_are_encoded_and_rollback_does_not_cache_route(db_session):
+    engine = db_session.get_bind()
+    row = {
+        "ip_address": "10.0.0.2",
+        "timestamp": datetime.datetime(2025, 10, 10, 12, 0),
+        "method": "GET",
+        "path": "/comments/7",
+        "status_code": 200,
+        "response_time_ms": 5.0,
+    }
+
+    with engine.connect() as conn:
+        with conn.begin() as trans:
+            conn.execute(insert(AccessLog), encode_access_log_rows(conn, [row]))
+            trans.rollback()
+        # 롤백된 routes.id를 캐시에서 재사용하지 않고 다시 추가해야 함
+        with conn.begin():
+            conn.execute(insert(AccessLog), encode_access_log_rows(conn, [row]))
+
+    route_id, raw_path = db_session.execute(
+        select(AccessLog.route_id, AccessLog.raw_path)
+    ).one()
+    assert db_session.get(Route, route_id).template == "/comments/{id}"
+    assert raw_path == "/comments/7"
+
+
+def test_invalid_ip_is_rejected(db_session):
+    db_session.add(_log("/posts", ip="not-an-ip"))
+    with pytest.raises(StatementError):
+        db_session.commit()
+    db_session.rollback()
@@ -0,0 +1,77 @@
+import asyncio
+import datetime
+import time
+
+import httpx
+
+from app.main import app, get_db
+from app.models import AccessLog, Post
+from performance_tests.replay_access_logs import (
+    endpoint_key,
+    iter_access_logs,
+    replay,
+)
+
+START = datetime.datetime(2025, 10, 10, 12, 0, 0)
+
+
+def _seed(db):
+    db.add(Post(title="제목", content="내용"))
+    recorded = [
+        (0.0, "GET", "/posts", 200, 12.0),
+        (0.2, "GET", "/posts/1", 200, 8.0),
+        (0.3, "POST", "/posts", 201, 20.0),
+        (0.4, "GET", "/posts/999", 404, 5.0),
+    ]
+    db.add_all(
+        AccessLog(
+            ip_address="10.0.0.1",
+            timestamp=START + datetime.timedelta(seconds=offset),
+            method=method,
+            path=path,
+            status_code=status_code,
+            response_time_ms=response_time_ms,
+        )
+        for offset, method, path, status_code, response_time_ms in recorded
+    )
+    db.commit()
+
+
+async def _replay(engine, speed):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        rows = iter_access_logs(
+            engine, START, START + datetime.timedelta(hours=1), chunk_size=2
+        )
+        return await replay(rows, client, speed=speed, concurrency=1)
+
+
+def test_replay_keeps_inter_arrival_timing(db_session):
+    """기록된 도착 간격(0.4초)을 배속에 맞춰 유지하고, 쓰기 요청은 기본적으로 건너뛰는지 테스트"""
+    _seed(db_session)
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        started = time.perf_counter()
+        report = asyncio.run(_replay(db_session.get_bind(), speed=2.0))
+        elapsed = time.perf_counter() - started
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert elapsed >= 0.2
+    assert (report.sent, report.skipped, report.errors) == (3, 1, 0)
+    assert report.status_mismatches == 0
+
+    summary = report.summary()
+    assert set(summary["endpoints"]) == {"GET /posts", "GET /posts/{id}"}
+    assert summary["endpoints"]["GET /posts/{id}"]["count"] == 2
+    assert abs(summary["endpoints"]["GET /posts"]["recorded_p50_ms"] - 12.0) < 0.2
+
+
+def test_endpoint_key_groups_numeric_ids():
+    assert endpoint_key("GET", "/posts/15?x=1") == "GET /posts/{id}"
+    assert endpoint_key("DELETE", "/users/3/posts/4") == "DELETE /users/{id}/posts/{id}"
+    # app.models.route_template과 같은 규칙이므로 UUID 구간도 {id}로 묶임
+    assert (
+        endpoint_key("GET", "/files/123e4567-e89b-12d3-a456-426614174000")
+        == "GET /files/{id}"
+    )
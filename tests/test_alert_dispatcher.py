@@ -0,0 +1,144 @@
+import email
+import email.policy
+import socketserver
+import threading
+
+import pandas as pd
+import pytest
+
+from app.services.alerting import AlertDispatcher
+
+
+# --- 테스트용 로컬 SMTP 서버 (실제 메일은 보내지 않고 제목과 본문만 기록) ---
+class _FakeSMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self._reply("220 fake-smtp ready")
+        data_lines = None
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            if data_lines is not None:
+                if line.rstrip(b"\r\n") == b".":
+                    if server.fail_next > 0:
+                        server.fail_next -= 1
+                        self._reply("451 temporary failure")
+                    else:
+                        message = email.message_from_bytes(
+                            b"".join(data_lines), policy=email.policy.default
+                        )
+                        server.messages.append(
+                            f"{message['Subject']}\n{message.get_content()}"
+                        )
+                        self._reply("250 queued")
+                    data_lines = None
+                else:
+                    data_lines.append(line[1:] if line.startswith(b"..") else line)
+                continue
+
+            command = line.decode().strip().upper()
+            if command.startswith("EHLO"):
+                self.wfile.write(b"250-fake-smtp\r\n250-AUTH PLAIN LOGIN\r\n250 OK\r\n")
+            elif command.startswith("AUTH"):
+                self._reply("235 authenticated")
+            elif command.startswith("DATA"):
+                data_lines = []
+                self._reply("354 end data with <CR><LF>.<CR><LF>")
+            elif command.startswith("QUIT"):
+                self._reply("221 bye")
+                break
+            else:
+                self._reply("250 OK")
+
+
+class _FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _FakeSMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self.fail_next = 0
+
+
+@pytest.fixture
+def smtp_server():
+    server = _FakeSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def dispatcher(smtp_server):
+    dispatcher = AlertDispatcher(
+        "sender@example.com",
+        "receiver@example.com",
+        "password",
+        host="127.0.0.1",
+        port=smtp_server.server_address[1],
+        use_ssl=False,
+        digest_interval=0.2,
+        top_n=5,
+        retry_backoff=0.01,
+    ).start()
+    yield dispatcher
+    dispatcher.stop()
+
+
+def test_alerts_are_batched_into_one_digest(dispatcher, smtp_server):
+    """짧은 시간에 들어온 여러 규칙의 알림이 하나의 요약 메일로 묶이고, 세션이 재사용되는지 테스트"""
+    for rule in ["2.1_brute_force", "2.2_web_scanner", "2.4_traffic_spike"]:
+        assert dispatcher.submit(rule, f"[경고] {rule}", "탐지됨", pd.DataFrame())
+    dispatcher.flush()
+
+    dispatcher.submit("2.3_sqli", "[경고] 2.3_sqli", "탐지됨", pd.DataFrame())
+    dispatcher.flush()
+
+    assert len(smtp_server.messages) == 2
+    digest = smtp_server.messages[0]
+    for rule in ["2.1_brute_force", "2.2_web_scanner", "2.4_traffic_spike"]:
+        assert rule in digest
+    assert "2.3_sqli" in smtp_server.messages[1]
+    assert smtp_server.connections == 1
+
+
+def test_duplicate_alerts_are_suppressed_within_window(dispatcher, smtp_server):
+    """중복 억제 윈도우 안에서 같은 규칙의 알림은 한 번만 발송되는지 테스트"""
+    assert dispatcher.submit("2.1_brute_force", "[경고] brute force", "1차", None)
+    assert not dispatcher.submit("2.1_brute_force", "[경고] brute force", "2차", None)
+    dispatcher.flush()
+
+    assert len(smtp_server.messages) == 1
+    assert "1차" in smtp_server.messages[0]
+
+
+def test_findings_are_truncated_to_top_n(dispatcher, smtp_server):
+    """탐지 결과 전체가 아닌 상위 N행 요약만 메일 본문에 포함되는지 테스트"""
+    findings = pd.DataFrame({"ip_address": [f"10.0.0.{i}" for i in range(100)]})
+    dispatcher.submit("2.2_web_scanner", "[경고] scanner", "탐지됨", findings)
+    dispatcher.flush()
+
+    message = smtp_server.messages[0]
+    assert "10.0.0.4" in message
+    assert "10.0.0.5" not in message
+    assert "95" in message
+
+
+def test_failed_delivery_is_retried(dispatcher, smtp_server):
+    """일시적인 발송 실패 시 세션을 다시 맺어 재시도하는지 테스트"""
+    smtp_server.fail_next = 1
+    dispatcher.submit("2.1_brute_force", "[경고] brute force", "탐지됨", None)
+    dispatcher.flush()
+
+    assert len(smtp_server.messages) == 1
+    assert dispatcher.sent_messages == 1
+    assert smtp_server.connections == 2
@@ -1,10 +1,9 @@
 import pytest
-import pandas as pd
-from sqlalchemy import text
 
 # 1. 이전 테스트에서 사용했던 헬퍼 함수와 새로 만든 알림 함수를 가져옵니다.
 from tests.test_analysis_queries import load_queries_from_file
 from app.services.alerting import send_email_alert
+from app.services.streaming import StreamStats, collect_findings, stream_query
 
 # 파일 전체에 마커를 적용합니다.
 pytestmark = pytest.mark.simulation
@@ -45,14 +44,21 @@ def test_detection_and_alerting_pipeline(mysql_engine, setup_test_data):
             continue
 
         print(f"\n  - '{name}' 쿼리 실행하여 모니터링 중...")
-        df = pd.read_sql_query(text(query), mysql_engine)
+        # 탐지 결과를 청크 단위로 스트리밍하며, 알림에 담을 앞쪽 행만 보관합니다.
+        stats = StreamStats()
+        df, total_rows = collect_findings(
+            stream_query(mysql_engine, query, stats=stats)
+        )
+        print(f"  - 스트리밍 조회: {stats.summary()}")
 
         # 3. (핵심) 쿼리 결과가 비어있지 않다면(= 탐지 성공), 알림 함수를 호출합니다.
-        if not df.empty:
+        if total_rows:
             alert_triggered = True
             print("  🚨 이상 징후 탐지! 알림을 생성합니다...")
             send_email_alert(
-                subject=details["subject"], body=details["body"], findings_df=df
+                subject=details["subject"],
+                body=f"{details['body']} (총 {total_rows}건)",
+                findings_df=df,
             )
         else:
             print(f"  ✅ '{name}' 항목에 대한 특이사항 없음.")
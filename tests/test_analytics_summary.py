@@ -0,0 +1,104 @@
+import datetime
+import json
+
+import pytest
+
+from app.analytics_router import get_summary_cache
+from app.main import app
+from app.models import AccessLog
+from app.services.analytics_summary import AnalyticsSummaryCache
+
+
+def _add_logs(db, path, count, response_time_ms):
+    db.add_all(
+        AccessLog(
+            ip_address="10.0.0.1",
+            timestamp=datetime.datetime(2025, 10, 10, 12, 30),
+            method="GET",
+            path=path,
+            status_code=200,
+            response_time_ms=response_time_ms,
+        )
+        for _ in range(count)
+    )
+    db.commit()
+
+
+@pytest.fixture
+def summary_cache(db_session):
+    cache = AnalyticsSummaryCache(db_session.get_bind())
+    app.dependency_overrides[get_summary_cache] = lambda: cache
+    yield cache
+    app.dependency_overrides.pop(get_summary_cache, None)
+
+
+def test_summary_is_served_with_etag(test_client, db_session, summary_cache):
+    """미리 계산된 요약이 ETag와 함께 제공되고, 변경이 없으면 304를 반환하는지 테스트"""
+    _add_logs(db_session, "/posts", 3, 100.0)
+    _add_logs(db_session, "/posts/1", 1, 500.0)
+
+    response = test_client.get("/analytics/summary")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    payload = response.json()
+    assert payload["kpis"]["total_requests"] == 4
+    assert payload["kpis"]["avg_response_time_ms"] == 200.0
+    assert payload["top_10_endpoints"][0] == {
+        "path": "/posts",
+        "method": "GET",
+        "request_count": 3,
+    }
+    assert payload["time_series_requests"][0]["hour_of_day"] == 12
+
+    response = test_client.get("/analytics/summary", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_requests_do_not_query_db_between_refreshes(
+    test_client, db_session, summary_cache
+):
+    """요청 시에는 메모리의 요약만 제공하고, 백그라운드 갱신 이후에만 내용이 바뀌는지 테스트"""
+    _add_logs(db_session, "/posts", 1, 100.0)
+    etag = test_client.get("/analytics/summary").headers["ETag"]
+
+    _add_logs(db_session, "/posts", 1, 300.0)
+    response = test_client.get("/analytics/summary", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    assert summary_cache.refresh() is True
+    assert summary_cache.refresh() is False
+    response = test_client.get("/analytics/summary", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["kpis"]["total_requests"] == 2
+
+
+def test_workers_share_one_refresher_and_etag(db_session, tmp_path):
+    """잠금을 잡은 한 워커만 DB를 집계하고, 다른 워커는 같은 본문/ETag를 파일에서 제공하는지 테스트"""
+    engine = db_session.get_bind()
+    leader = AnalyticsSummaryCache(engine, shared_dir=str(tmp_path))
+    follower = AnalyticsSummaryCache(engine, shared_dir=str(tmp_path))
+    assert leader._try_lead()
+    # 리더가 첫 요약을 쓰기 전에는 팔로워가 직접 집계하지 않고 (None, None) -> 503
+    assert follower.snapshot() == (None, None)
+
+    _add_logs(db_session, "/posts", 2, 100.0)
+    assert leader.sync() is True
+    follower.sync()
+    assert not follower.is_leader
+    assert follower.snapshot() == leader.snapshot()
+    assert follower.aggregator.watermark == 0  # 팔로워는 DB를 집계하지 않음
+
+    _add_logs(db_session, "/posts", 1, 400.0)
+    leader.sync()
+    body, etag = follower.snapshot()
+    assert etag == leader.etag
+    assert json.loads(body)["kpis"]["total_requests"] == 3
+
+    # 리더가 종료되면 다음 주기에 팔로워가 이어받아, 마지막 요약을 제공하면서 새로 집계함
+    leader.stop()
+    follower.sync()
+    assert follower.is_leader
+    assert follower.etag == etag
+    follower.stop()
@@ -0,0 +1,65 @@
+import datetime
+
+from sqlalchemy import func, select
+
+from app.models import AccessLog, SecurityEvent
+from scripts.fixture_snapshot import (
+    ensure_snapshot,
+    load_fixture_dataset,
+    restore_snapshot,
+    snapshot_key,
+)
+
+
+def _count(engine, model):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(model)).scalar()
+
+
+def test_snapshot_is_built_once_and_restored(db_session, tmp_path):
+    """같은 인자/시드의 스냅샷은 한 번만 생성되고, 복원 시 행이 그대로 복사되는지 테스트"""
+    engine = db_session.get_bind()
+
+    counts = load_fixture_dataset(
+        engine, "run_data_creation", num_logs=200, snapshot_dir=str(tmp_path)
+    )
+    # 배경 로그 200개 + 보장된 시나리오 로그 255개
+    assert counts["access_logs"] == 455
+    assert _count(engine, AccessLog) == 455
+    assert _count(engine, SecurityEvent) == counts["security_events"]
+
+    _, _, built = ensure_snapshot("run_data_creation", 200, snapshot_dir=str(tmp_path))
+    assert built is False
+
+    # 복원을 반복해도 기존 행을 지우고 다시 채우므로 행 수가 같아야 함
+    load_fixture_dataset(
+        engine, "run_data_creation", num_logs=200, snapshot_dir=str(tmp_path)
+    )
+    assert _count(engine, AccessLog) == 455
+
+
+def test_restore_shifts_timestamps_to_now(db_session, tmp_path):
+    """오래전에 만든 스냅샷도 복원 시점 기준의 '최근' 데이터가 되도록 시간이 이동되는지 테스트"""
+    engine = db_session.get_bind()
+    db_path, meta, _ = ensure_snapshot(
+        "run_normal_data_creation", 50, snapshot_dir=str(tmp_path)
+    )
+    built_at = datetime.datetime.fromisoformat(meta["built_at"])
+    meta["built_at"] = (built_at - datetime.timedelta(days=30)).isoformat()
+
+    restore_snapshot(db_path, meta, engine)
+    with engine.connect() as conn:
+        latest = conn.execute(select(func.max(AccessLog.timestamp))).scalar()
+    assert latest > built_at.replace(tzinfo=None) + datetime.timedelta(days=29)
+
+
+def test_snapshot_key_depends_on_parameters():
+    assert snapshot_key("run_data_creation", 100, 1) == snapshot_key(
+        "run_data_creation", 100, 1
+    )
+    assert snapshot_key("run_data_creation", 100, 1) != snapshot_key(
+        "run_data_creation", 100, 2
+    )
+    assert snapshot_key("run_data_creation", 100) != snapshot_key(
+        "run_normal_data_creation", 100
+    )
@@ -0,0 +1,114 @@
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import vulnerable_test_router
+from app.services import injection_detector
+from app.database import get_db
+from app.models import SecurityEvent
+from app.services.injection_detector import (
+    DEFAULT_PAYLOADS_FILE,
+    InjectionDetector,
+    SecurityEventSink,
+    get_event_sink,
+    load_payload_templates,
+)
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return InjectionDetector()
+
+
+def _filled_payloads():
+    with open(DEFAULT_PAYLOADS_FILE, "r", encoding="utf-8") as f:
+        scenarios = json.load(f)["scenarios"]
+    return [
+        s["payload"]
+        .replace("%d", "7")
+        .replace("%s", "SELECT 1")
+        .replace("<ATTACKER_DOMAIN>", "attacker.example")
+        for s in scenarios
+    ]
+
+
+@pytest.mark.parametrize("payload", _filled_payloads())
+def test_all_pentest_payloads_are_detected(detector, payload):
+    """payloads.json의 모든 공격 페이로드(치환 자리 채움)가 탐지되는지 테스트"""
+    assert detector.is_suspicious(detector.scan(payload))
+
+
+@pytest.mark.parametrize("text", ["order", "android color", "rock and roll", "news"])
+def test_plain_words_are_not_flagged(detector, text):
+    """'or'/'and'를 포함한 일반 단어는 부분 문자열 때문에 탐지되지 않아야 함"""
+    assert not detector.is_suspicious(detector.scan(text))
+
+
+def test_template_rules_generalize_placeholders_and_comments(detector):
+    detection = detector.scan("' oRdEr/**/by 12--")
+    assert "payload:GENERIC-UB-001" in detection.rules
+
+
+def test_search_endpoint_records_event_through_sink(db_session):
+    """취약한 검색 엔드포인트가 유효한 SecurityEvent를 싱크를 통해 배치로 기록하는지 테스트"""
+    sink = SecurityEventSink(db_session.get_bind(), flush_interval=0.05).start()
+    app = FastAPI()
+    app.include_router(vulnerable_test_router.router, prefix="/test-api")
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_event_sink] = lambda: sink
+
+    try:
+        with TestClient(app) as client:
+            client.get("/test-api/items/search", params={"name": "' OR 1=1--"})
+            client.get("/test-api/items/search", params={"name": "notebook"})
+        sink.flush()
+    finally:
+        sink.stop()
+
+    events = db_session.query(SecurityEvent).all()
+    assert len(events) == 1
+    assert events[0].event_type == "SQL_INJECTION_ATTEMPT"
+    assert events[0].ip_address == "testclient"
+    assert events[0].description.endswith("payload=' OR 1=1--")
+    assert sink.written == 1
+
+
+def test_sink_flushes_within_interval_while_events_keep_arriving(db_session):
+    """flush_interval보다 짧은 간격으로 이벤트가 계속 들어와도 약 한 주기 안에 기록되는지 테스트"""
+    sink = SecurityEventSink(db_session.get_bind(), flush_interval=0.2).start()
+    try:
+        started = time.monotonic()
+        while sink.written == 0 and time.monotonic() - started < 1.0:
+            sink.submit("SQL_INJECTION_ATTEMPT", "10.0.0.1", "payload")
+            time.sleep(0.05)
+        elapsed = time.monotonic() - started
+    finally:
+        sink.stop()
+
+    assert sink.written > 0
+    assert elapsed < 0.4
+
+
+def test_long_adversarial_input_is_scanned_in_bounded_time(detector):
+    """8KB의 반복 패턴도 앞/뒤 구간만 검사해 빠르게 끝나고, 끝에 붙은 페이로드는 탐지되는지 테스트"""
+    text = "' ORDER BY " * 750
+    started = time.perf_counter()
+    detector.scan(text)
+    assert time.perf_counter() - started < 0.05
+
+    padded = "a" * 8000 + "' UNION SELECT password FROM users--"
+    assert "union_select" in detector.scan(padded).rules
+
+
+def test_missing_payload_file_is_reported(tmp_path, monkeypatch):
+    """페이로드 파일이 없으면 빈 규칙으로 조용히 넘어가지 않고 경고를 남기는지 테스트"""
+    warnings = []
+    monkeypatch.setattr(
+        injection_detector.logger, "warning", lambda *args: warnings.append(args)
+    )
+    missing = str(tmp_path / "payloads.json")
+    assert load_payload_templates(missing) == []
+    assert warnings and missing in warnings[0]
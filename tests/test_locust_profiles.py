@@ -0,0 +1,63 @@
+import random
+from collections import Counter
+
+from performance_tests.id_reservoir import IdReservoir
+from performance_tests.run_profile import compare_results, stats_csv_to_endpoints
+
+STATS_CSV = """Type,Name,Request Count,Failure Count,Median Response Time,Average Response Time,Min Response Time,Max Response Time,Average Content Size,Requests/s,Failures/s,50%,66%,75%,80%,90%,95%,98%,99%,99.9%,99.99%,100%
+GET,/posts (list),1200,0,12,14.5,3,220,5400,40.1,0.0,12,14,16,18,25,31,45,60,180,220,220
+GET,/posts/[id] (view),800,2,6,7.25,2,90,120,26.7,0.1,6,7,8,9,11,14,20,30,80,90,90
+,Aggregated,2000,2,9,11.6,2,220,3300,66.8,0.1,9,11,13,15,20,27,40,55,170,220,220
+"""
+
+
+def test_reservoir_stays_bounded_and_supports_discard():
+    """ID가 계속 추가되어도 용량을 넘지 않고, 삭제된 ID는 다시 선택되지 않는지 테스트"""
+    reservoir = IdReservoir(capacity=50, rng=random.Random(1))
+    for post_id in range(1, 10_001):
+        reservoir.add(post_id)
+    assert len(reservoir) == 50
+    # Reservoir Sampling이므로 초기 ID만 남아 있지 않아야 함
+    assert max(reservoir._ids) > 1000
+
+    victim = reservoir.choice()
+    reservoir.discard(victim)
+    assert len(reservoir) == 49
+    assert all(reservoir.choice() != victim for _ in range(1000))
+
+
+def test_zipf_distribution_concentrates_on_hot_keys():
+    """zipf 분포에서는 앞 순위 ID가 균등 분포보다 훨씬 자주 선택되는지 테스트"""
+    picks = {}
+    for distribution in ["uniform", "zipf"]:
+        reservoir = IdReservoir(
+            capacity=100, distribution=distribution, rng=random.Random(7)
+        )
+        for post_id in range(1, 101):
+            reservoir.add(post_id)
+        picks[distribution] = Counter(reservoir.choice() for _ in range(10_000))
+
+    assert picks["zipf"][1] > 1000
+    assert picks["uniform"][1] < 200
+    assert picks["zipf"].most_common(1)[0][0] == 1
+
+
+def test_stats_csv_is_converted_to_per_endpoint_percentiles(tmp_path):
+    stats_path = tmp_path / "run_stats.csv"
+    stats_path.write_text(STATS_CSV, encoding="utf-8")
+
+    endpoints = stats_csv_to_endpoints(str(stats_path))
+    assert set(endpoints) == {
+        "GET /posts (list)",
+        "GET /posts/[id] (view)",
+        "Aggregated",
+    }
+    view = endpoints["GET /posts/[id] (view)"]
+    assert view["requests"] == 800
+    assert view["p95_ms"] == 14
+    assert view["p99_ms"] == 30
+    assert view["avg_ms"] == 7.25
+
+    slower = {name: dict(m, p95_ms=m["p95_ms"] * 2) for name, m in endpoints.items()}
+    changes = compare_results({"endpoints": slower}, {"endpoints": endpoints})
+    assert ("GET /posts (list)", "p95_ms", 31, 62, 1.0) in changes
@@ -0,0 +1,93 @@
+import datetime
+
+from app.models import AccessLog
+from app.services.log_aggregates import IncrementalLogAggregator
+
+
+def _add_logs(db, path, count, response_time_ms, hour=12, method="GET"):
+    timestamp = datetime.datetime(2025, 10, 10, hour, 30)
+    db.add_all(
+        AccessLog(
+            ip_address="10.0.0.1",
+            timestamp=timestamp,
+            method=method,
+            path=path,
+            status_code=200,
+            response_time_ms=response_time_ms,
+        )
+        for _ in range(count)
+    )
+    db.commit()
+
+
+def test_refresh_only_aggregates_new_rows(db_session):
+    """워터마크 이후의 새 행만 집계되어 기존 결과에 병합되는지 테스트"""
+    aggregator = IncrementalLogAggregator()
+    engine = db_session.get_bind()
+
+    _add_logs(db_session, "/posts", 3, 100.0)
+    assert aggregator.refresh(engine) == 3
+
+    # 새 행이 없으면 아무것도 다시 집계하지 않아야 함
+    assert aggregator.refresh(engine) == 0
+
+    _add_logs(db_session, "/posts", 2, 400.0)
+    _add_logs(db_session, "/posts/1", 1, 50.0, hour=13)
+    _add_logs(db_session, "/posts/15", 1, 70.0, hour=13)
+    assert aggregator.refresh(engine) == 4
+
+    results = aggregator.results()
+
+    top = results["top_10_endpoints"].set_index("path")
+    assert top.loc["/posts", "request_count"] == 5
+    # /posts/1과 /posts/15는 경로 템플릿 하나로 묶여야 함
+    assert top.loc["/posts/{id}", "request_count"] == 2
+
+    slowest = results["slowest_10_endpoints"].set_index("path")
+    assert slowest.loc["/posts", "avg_response_time_ms"] == 220.0
+    assert slowest.loc["/posts", "max_response_time_ms"] == 400.0
+    # 스케치 기반 분위수는 상대 오차 1% 이내여야 함
+    assert abs(slowest.loc["/posts", "p50_response_time_ms"] - 100.0) <= 1.0
+    assert abs(slowest.loc["/posts", "p99_response_time_ms"] - 400.0) <= 4.0
+
+    series = results["time_series_requests"].set_index("hour_of_day")
+    assert series.loc[12, "total_requests"] == 5
+    assert series.loc[13, "total_requests"] == 2
+
+
+def test_refresh_picks_up_rows_committed_below_the_watermark(db_session):
+    """id 순서와 다르게 늦게 커밋된 행을 다음 refresh에서 집계하고, 오래된 빈 id는 잊는지 테스트"""
+    aggregator = IncrementalLogAggregator(id_lag=5)
+    engine = db_session.get_bind()
+
+    def add(*ids):
+        for id_ in ids:
+            db_session.add(
+                AccessLog(
+                    id=id_,
+                    ip_address="10.0.0.1",
+                    timestamp=datetime.datetime(2025, 10, 10, 12, 30),
+                    method="GET",
+                    path="/posts",
+                    status_code=200,
+                    response_time_ms=100.0,
+                )
+            )
+        db_session.commit()
+
+    add(1, 2, 4)  # id 3의 트랜잭션이 아직 커밋되지 않음
+    assert aggregator.refresh(engine) == 3
+    add(3)
+    assert aggregator.refresh(engine) == 1
+    assert aggregator.refresh(engine) == 0
+
+    add(5, 7)
+    assert aggregator.refresh(engine) == 2
+    add(20)  # id 6은 롤백되어 비었다고 보고, id_lag 밖으로 밀려나면 더 확인하지 않음
+    assert aggregator.refresh(engine) == 1
+    assert aggregator._gaps == set(range(16, 20))
+    add(6)
+    assert aggregator.refresh(engine) == 0
+
+    top = aggregator.results()["top_10_endpoints"].set_index("path")
+    assert top.loc["/posts", "request_count"] == 7
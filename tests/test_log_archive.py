@@ -0,0 +1,144 @@
+import datetime
+import os
+
+import pandas as pd
+from sqlalchemy import func, select
+
+from app.models import AccessLog
+from app.services.log_archive import (
+    ANALYSIS_QUERIES,
+    ColdArchive,
+    load_access_logs,
+    read_part,
+    run_analysis,
+)
+
+NOW = datetime.datetime(2025, 10, 20, 15, 0)
+
+
+def _add_logs(db, rows):
+    db.add_all(
+        AccessLog(
+            ip_address=ip,
+            timestamp=timestamp,
+            method="GET",
+            path=path,
+            status_code=status,
+            response_time_ms=response_time_ms,
+            event_type="NORMAL",
+        )
+        for ip, timestamp, path, status, response_time_ms in rows
+    )
+    db.commit()
+
+
+def _hot_count(db):
+    return db.scalar(select(func.count()).select_from(AccessLog))
+
+
+def test_archive_moves_old_days_and_queries_span_both_tiers(db_session, tmp_path):
+    """오래된 행은 일 단위 파트로 옮겨지고, 핫 + 콜드를 합친 집계가 아카이브 전과 같은지 테스트"""
+    engine = db_session.get_bind()
+    old_day1 = datetime.datetime(2025, 10, 1, 9, 0)
+    old_day2 = datetime.datetime(2025, 10, 2, 9, 0)
+    recent = datetime.datetime(2025, 10, 19, 9, 0)
+    _add_logs(
+        db_session,
+        [("10.0.0.1", old_day1, "/posts/1", 200, 100.0)] * 3
+        + [("203.0.113.5", old_day2, "/admin/.git", 404, 30.0)] * 6
+        + [("203.0.113.5", recent, "/admin/.env", 404, 30.0)] * 6
+        + [("10.0.0.2", recent, "/posts", 200, 300.0)],
+    )
+    before = run_analysis(engine, str(tmp_path), "1.2")
+
+    archive = ColdArchive(str(tmp_path))
+    summary = archive.archive(engine, older_than_days=7, chunk_size=4, now=NOW)
+
+    assert summary["cutoff"] == "2025-10-13T00:00:00"
+    assert summary["archived_rows"] == summary["deleted_rows"] == 9
+    assert [part["day"] for part in archive.parts] == ["2025-10-01", "2025-10-02"]
+    assert archive.manifest["pending_delete"] == []
+    assert _hot_count(db_session) == 7
+
+    rows = read_part(os.path.join(str(tmp_path), archive.parts[0]["file"]))
+    assert [row["path"] for row in rows] == ["/posts/{id}"] * 3
+    assert rows[0]["raw_path"] == "/posts/1"
+    assert rows[0]["ip_address"] == "10.0.0.1"
+
+    # 다시 실행해도 옮길 행이 없어야 함
+    assert archive.archive(engine, older_than_days=7, now=NOW)["archived_rows"] == 0
+
+    after = run_analysis(engine, str(tmp_path), "1.2")
+    assert after.to_dict("records") == before.to_dict("records")
+
+    scanners = run_analysis(engine, str(tmp_path), "2.2").set_index("ip_address")
+    assert scanners.loc["203.0.113.5", "not_found_count"] == 12
+    assert scanners.loc["203.0.113.5", "scanned_paths"] == "/admin/.git, /admin/.env"
+
+    # 시간 범위가 아카이브 구간만 덮으면 해당 날짜의 파트만 읽음
+    assert archive.parts_between(old_day2, recent) == archive.parts[1:]
+    logs = load_access_logs(engine, str(tmp_path), start=old_day2, end=recent)
+    assert len(logs) == 6
+
+
+def test_interrupted_archive_finishes_deletes_without_duplicates(db_session, tmp_path):
+    """파일 기록 후 삭제 전에 중단되어도, 조회는 중복 없이 하고 다음 실행이 삭제를 마치는지 테스트"""
+    engine = db_session.get_bind()
+    old_day = datetime.datetime(2025, 10, 1, 9, 0)
+    _add_logs(db_session, [("10.0.0.1", old_day, "/posts", 200, 100.0)] * 5)
+
+    archive = ColdArchive(str(tmp_path))
+    original = archive.finish_pending_deletes
+    archive.finish_pending_deletes = lambda *args, **kwargs: 0
+    archive.archive(engine, older_than_days=7, now=NOW)
+    archive.finish_pending_deletes = original
+
+    assert _hot_count(db_session) == 5
+    assert len(load_access_logs(engine, str(tmp_path))) == 5
+
+    resumed = ColdArchive(str(tmp_path)).archive(engine, older_than_days=7, now=NOW)
+    assert resumed["archived_rows"] == 0
+    assert resumed["deleted_rows"] == 5
+    assert _hot_count(db_session) == 0
+    assert len(load_access_logs(engine, str(tmp_path))) == 5
+
+
+def test_streamed_analysis_matches_in_memory_aggregation(db_session, tmp_path):
+    """청크별 부분 집계를 합친 결과가 전체 행을 한 번에 집계한 결과와 같은지 테스트 (빈 구간 포함)"""
+    engine = db_session.get_bind()
+    for query_id in ANALYSIS_QUERIES:
+        assert run_analysis(engine, str(tmp_path), query_id).empty
+
+    day = datetime.datetime(2025, 10, 1, 9, 0)
+    rows = []
+    for i in range(40):
+        timestamp = day + datetime.timedelta(days=i % 12, hours=i % 5)
+        rows.append((f"10.0.0.{i % 3}", timestamp, f"/posts/{i % 4}", 200, 10.0 * i))
+        rows.append(("203.0.113.5", timestamp, f"/admin/{i % 6}", 404, 5.0))
+    _add_logs(db_session, rows)
+    db_session.add(
+        AccessLog(
+            ip_address="198.51.100.7",
+            timestamp=day,
+            method="GET",
+            path="/posts?q=' OR 1=1--",
+            status_code=200,
+            response_time_ms=1.0,
+            event_type="SQL_INJECTION_ATTEMPT",
+            details="union_select",
+        )
+    )
+    db_session.commit()
+    ColdArchive(str(tmp_path)).archive(engine, older_than_days=14, now=NOW)
+
+    logs = load_access_logs(engine, str(tmp_path))
+    params = {"1.2": {"limit": 3}, "2.2": {"min_count": 5}, "2.4": {"min_requests": 2}}
+    for query_id, aggregate in ANALYSIS_QUERIES.items():
+        expected = aggregate(logs, **params.get(query_id, {}))
+        streamed = run_analysis(
+            engine, str(tmp_path), query_id, chunk_size=7, **params.get(query_id, {})
+        )
+        assert not expected.empty, query_id
+        pd.testing.assert_frame_equal(
+            streamed.reset_index(drop=True), expected.reset_index(drop=True)
+        )
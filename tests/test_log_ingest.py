@@ -0,0 +1,77 @@
+import datetime
+import gzip
+
+from sqlalchemy import func, select
+
+from app.models import AccessLog
+from app.services.log_ingest import IngestCheckpoint, ingest_file, parse_line
+
+GUNICORN_LINES = [
+    '10.0.0.1 - - [10/Oct/2025:13:55:36 +0900] "GET /posts HTTP/1.1" 200 512 "-" "curl/8.0" 15320\n',
+    '10.0.0.2 - - [10/Oct/2025:13:55:37 +0900] "POST /users/login HTTP/1.1" 401 12 "-" "python-requests" 2100\n',
+    "this line is not an access log\n",
+    '10.0.0.3 - - [10/Oct/2025:13:55:38 +0900] "GET /admin/.env HTTP/1.1" 404 0 "-" "-"\n',
+]
+
+
+def _count(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(AccessLog)).scalar()
+
+
+def test_parse_gunicorn_and_uvicorn_lines():
+    """gunicorn/uvicorn 형식이 AccessLog 컬럼으로 정규화되는지 테스트"""
+    row = parse_line(GUNICORN_LINES[0])
+    assert row["ip_address"] == "10.0.0.1"
+    assert row["timestamp"] == datetime.datetime(
+        2025, 10, 10, 4, 55, 36, tzinfo=datetime.timezone.utc
+    )
+    assert (row["method"], row["path"], row["status_code"]) == ("GET", "/posts", 200)
+    assert row["response_time_ms"] == 15.32
+    assert parse_line(GUNICORN_LINES[1])["event_type"] == "FAILED_LOGIN"
+    assert parse_line(GUNICORN_LINES[2]) is None
+
+    row = parse_line(
+        '2025-10-10 13:55:36,123 - INFO:     [::1]:54321 - "DELETE /posts/1 HTTP/1.1" 204 No Content'
+    )
+    assert row["ip_address"] == "::1"
+    assert row["timestamp"].hour == 13
+    assert (row["method"], row["status_code"], row["response_time_ms"]) == (
+        "DELETE",
+        204,
+        0.0,
+    )
+
+
+def test_ingest_gzip_file_resumes_from_checkpoint(db_session, tmp_path):
+    """gzip 로그를 배치 단위로 적재하고, 다시 실행하면 체크포인트 이후의 줄만 적재하는지 테스트"""
+    engine = db_session.get_bind()
+    log_path = tmp_path / "access.log.gz"
+    checkpoint = IngestCheckpoint(str(tmp_path / "checkpoint.json"))
+
+    with gzip.open(log_path, "wt") as f:
+        f.writelines(GUNICORN_LINES)
+    stats = ingest_file(engine, str(log_path), checkpoint, batch_size=2)
+    assert (stats.lines, stats.inserted, stats.skipped) == (4, 3, 1)
+    assert stats.batches == 2
+    assert _count(engine) == 3
+
+    # 변경이 없으면 아무것도 다시 적재하지 않아야 함 (새 프로세스가 체크포인트 파일을 다시 읽음)
+    checkpoint = IngestCheckpoint(str(tmp_path / "checkpoint.json"))
+    assert ingest_file(engine, str(log_path), checkpoint).lines == 0
+    assert _count(engine) == 3
+
+
+def test_partial_last_line_is_left_for_next_run(db_session, tmp_path):
+    """기록 중인(개행 없는) 마지막 줄은 건너뛰었다가 완성된 뒤 적재하는지 테스트"""
+    engine = db_session.get_bind()
+    log_path = tmp_path / "access.log"
+    checkpoint = IngestCheckpoint(str(tmp_path / "checkpoint.json"))
+
+    log_path.write_text(GUNICORN_LINES[0] + GUNICORN_LINES[1].rstrip("\n"))
+    assert ingest_file(engine, str(log_path), checkpoint).inserted == 1
+
+    with open(log_path, "a") as f:
+        f.write("\n" + GUNICORN_LINES[3])
+    assert ingest_file(engine, str(log_path), checkpoint).inserted == 2
+    assert _count(engine) == 3
@@ -0,0 +1,125 @@
+import datetime
+
+from app.models import AccessLog
+from app.services.log_aggregates import IncrementalLogAggregator
+from app.services.log_snapshot import LogSnapshot, export_access_logs
+
+
+def _add_logs(db, rows):
+    db.add_all(
+        AccessLog(
+            ip_address=ip,
+            timestamp=timestamp,
+            method=method,
+            path=path,
+            status_code=status,
+            response_time_ms=response_time_ms,
+            event_type="NORMAL",
+        )
+        for ip, timestamp, method, path, status, response_time_ms in rows
+    )
+    db.commit()
+
+
+def test_export_and_append_snapshot(db_session, tmp_path):
+    """
+    스냅샷 내보내기 후 새 행만 이어 붙이고, NumPy 집계가 DB에서 GROUP BY로 집계한
+    IncrementalLogAggregator의 결과와 일치하는지 테스트
+    """
+    engine = db_session.get_bind()
+    day1 = datetime.datetime(2025, 10, 10, 9, 0)
+    day2 = day1 + datetime.timedelta(days=1)
+
+    _add_logs(
+        db_session,
+        [("10.0.0.1", day1, "GET", "/posts", 200, 100.0)] * 3
+        + [("203.0.113.5", day1, "GET", "/admin/.git", 404, 30.0)] * 2,
+    )
+    assert export_access_logs(engine, str(tmp_path), chunk_size=2) == 5
+
+    _add_logs(
+        db_session,
+        [("10.0.0.2", day2, "POST", "/posts", 201, 300.0)]
+        + [("203.0.113.5", day2, "GET", "/admin/.git", 404, 30.0)] * 10,
+    )
+    # 두 번째 내보내기는 워터마크 이후의 행만 추가해야 함
+    assert export_access_logs(engine, str(tmp_path)) == 11
+    assert export_access_logs(engine, str(tmp_path)) == 0
+
+    snapshot = LogSnapshot(str(tmp_path))
+    assert len(snapshot) == 16
+
+    by_hour = snapshot.requests_by_hour().set_index("hour_of_day")
+    assert by_hour.loc[9, "total_requests"] == 16
+    assert by_hour.loc[9, "avg_requests_per_day"] == 8
+
+    top = snapshot.top_endpoints()
+    assert top.iloc[0]["path"] == "/admin/.git"
+    assert top.iloc[0]["request_count"] == 12
+
+    latency = snapshot.endpoint_response_times().set_index("path")
+    assert latency.loc["/posts", "avg_response_time_ms"] == 150.0
+    assert latency.loc["/posts", "max_response_time_ms"] == 300.0
+
+    sketches = snapshot.endpoint_latency_sketches()
+    assert sketches["/posts"].count == 4
+    assert abs(sketches["/posts"].quantile(0.5) - 100.0) <= 1.0
+    assert abs(sketches["/posts"].quantile(1.0) - 300.0) <= 3.0
+
+    scanners = snapshot.not_found_by_ip(min_count=10)
+    assert list(scanners["ip_address"]) == ["203.0.113.5"]
+    assert scanners.iloc[0]["not_found_count"] == 12
+
+    # 같은 행을 DB에서 집계한 결과와 비교
+    aggregator = IncrementalLogAggregator()
+    assert aggregator.refresh(engine) == 16
+
+    db_by_hour = aggregator.time_series_requests().set_index("hour_of_day")
+    columns = ["total_requests", "avg_requests_per_day"]
+    assert by_hour[columns].to_dict() == db_by_hour[columns].to_dict()
+
+    def endpoint_counts(df):
+        return {(row.path, row.method): row.request_count for row in df.itertuples()}
+
+    assert endpoint_counts(top) == endpoint_counts(aggregator.top_endpoints())
+
+    db_latency = aggregator.endpoint_response_times().set_index("path")
+    columns = ["avg_response_time_ms", "max_response_time_ms"]
+    assert latency[columns].to_dict() == db_latency[columns].to_dict()
+
+
+def test_export_picks_up_rows_committed_below_the_watermark(db_session, tmp_path):
+    """id 순서와 다르게 늦게 커밋된 행을 다음 내보내기에서 추가하고, 사전은 별도 파일에 추가만 하는지 테스트"""
+    engine = db_session.get_bind()
+    timestamp = datetime.datetime(2025, 10, 10, 9, 0)
+
+    def add(*ids):
+        db_session.add_all(
+            AccessLog(
+                id=id_,
+                ip_address=f"10.0.0.{id_}",
+                timestamp=timestamp,
+                method="GET",
+                path="/posts",
+                status_code=200,
+                response_time_ms=100.0,
+                event_type="NORMAL",
+            )
+            for id_ in ids
+        )
+        db_session.commit()
+
+    add(1, 2, 4)  # id 3의 트랜잭션이 아직 커밋되지 않음
+    assert export_access_logs(engine, str(tmp_path), chunk_size=2) == 3
+    add(3, 5)
+    assert export_access_logs(engine, str(tmp_path)) == 2
+    assert export_access_logs(engine, str(tmp_path)) == 0
+
+    snapshot = LogSnapshot(str(tmp_path))
+    assert sorted(snapshot.column("id")) == [1, 2, 3, 4, 5]
+    assert snapshot.meta["gaps"] == []
+    assert "dictionaries" not in snapshot.meta
+    assert snapshot.meta["dictionary_sizes"]["ip_address"] == 5
+    assert set(snapshot.decode("ip_address", snapshot.column("ip_address"))) == {
+        f"10.0.0.{i}" for i in range(1, 6)
+    }
@@ -0,0 +1,100 @@
+import logging
+import queue
+import sys
+
+import orjson
+
+from app.logger_config import (
+    DropCounters,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RateLimitFilter,
+    SamplingFilter,
+    parse_sample_rates,
+)
+
+
+NAME = "MyApiProjectLogger.alerting"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _record(name="MyApiProjectLogger.alerting", level=logging.INFO, msg="x", *args):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_queue_handler_does_not_block_and_counts_drops():
+    """큐가 가득 차면 기다리지 않고 레코드를 버리고, 메시지 인자는 큐에 넣을 때 합쳐지는지 테스트"""
+    counters = DropCounters()
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2), counters)
+    logger = logging.getLogger("test_logger_config.queue")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning("요청 %d 처리", i)
+    finally:
+        logger.removeHandler(handler)
+
+    assert counters.snapshot()["queue_full"] == 3
+    first = handler.queue.get_nowait()
+    assert (first.msg, first.args) == ("요청 0 처리", None)
+
+
+def test_rate_limit_groups_by_message_template():
+    """같은 템플릿은 값이 달라도 한 버킷으로 제한되고, 시간이 지나면 다시 허용되는지 테스트"""
+    counters = DropCounters()
+    clock = FakeClock()
+    limiter = RateLimitFilter(rate=1.0, burst=3, counters=counters, clock=clock)
+
+    allowed = [
+        limiter.filter(_record(NAME, logging.INFO, "rule=%s", i)) for i in range(10)
+    ]
+    assert allowed.count(True) == 3
+    assert limiter.filter(_record(NAME, logging.INFO, "다른 메시지"))
+
+    clock.now += 2.0
+    assert (
+        sum(
+            limiter.filter(_record(NAME, logging.INFO, "rule=%s", "a"))
+            for _ in range(5)
+        )
+        == 2
+    )
+    assert counters.snapshot()["rate_limited"] == 10
+
+
+def test_sampling_applies_per_logger_and_keeps_warnings():
+    counters = DropCounters()
+    sampler = SamplingFilter(
+        parse_sample_rates("alerting=0,alerting.smtp=1"), counters=counters
+    )
+
+    assert not sampler.filter(_record("MyApiProjectLogger.alerting"))
+    assert sampler.filter(_record("MyApiProjectLogger.alerting.smtp"))
+    assert sampler.filter(_record("MyApiProjectLogger.monitoring"))
+    assert sampler.filter(_record("MyApiProjectLogger.alerting", logging.WARNING))
+    assert counters.snapshot()["sampled"] == 1
+
+
+def test_json_formatter_includes_extra_fields_and_exception():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord(
+            "MyApiProjectLogger", logging.ERROR, __file__, 1, "실패 %s", ("a",), None
+        )
+        record.exc_info = sys.exc_info()
+    record.rule = "brute_force"
+
+    payload = orjson.loads(JsonFormatter().format(record))
+    assert payload["msg"] == "실패 a"
+    assert payload["level"] == "ERROR"
+    assert payload["rule"] == "brute_force"
+    assert "ValueError: boom" in payload["exc"]
@@ -0,0 +1,60 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import Post
+from app.services.memory_diagnostics import memory_diagnostics
+
+HEADERS = {"X-Admin-Token": "secret"}
+
+
+@pytest.fixture
+def admin_client(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    with TestClient(app) as client:
+        yield client
+    memory_diagnostics.stop()
+
+
+def _allocate_posts(count):
+    return [Post(title=f"제목 {i}", content="내용 " * 50) for i in range(count)]
+
+
+def test_snapshot_diff_points_at_allocating_line(admin_client):
+    """두 스냅샷 사이에 할당한 코드의 파일/라인이 증가량 상위에 나타나는지 테스트"""
+    assert (
+        admin_client.post("/admin/memory/snapshots/before", headers=HEADERS).status_code
+        == 409
+    )
+    admin_client.post("/admin/memory/tracemalloc", headers=HEADERS)
+    admin_client.post("/admin/memory/snapshots/before", headers=HEADERS)
+    posts = _allocate_posts(2000)
+    admin_client.post("/admin/memory/snapshots/after", headers=HEADERS)
+
+    response = admin_client.get(
+        "/admin/memory/diff",
+        params={"base": "before", "target": "after", "limit": 5},
+        headers=HEADERS,
+    )
+    assert response.status_code == 200
+    top = response.json()["top"]
+    assert any(
+        entry["file"].endswith("test_memory_diagnostics.py")
+        and entry["size_diff_kb"] > 0
+        for entry in top
+    )
+
+    report = admin_client.get("/admin/memory", headers=HEADERS).json()
+    assert report["tracemalloc"]["snapshots"] == ["before", "after"]
+    assert report["orm_instances"]["Post"] >= len(posts)
+    assert len(report["gc"]["generations"]) == 3
+
+    missing = admin_client.get(
+        "/admin/memory/diff", params={"base": "nope"}, headers=HEADERS
+    )
+    assert missing.status_code == 404
+
+
+def test_memory_endpoints_require_admin_token(admin_client):
+    assert admin_client.get("/admin/memory").status_code == 403
+    assert admin_client.post("/admin/memory/tracemalloc").status_code == 403
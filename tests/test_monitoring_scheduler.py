@@ -0,0 +1,194 @@
+import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from sqlalchemy import text
+
+from app.models import AccessLog, SecurityEvent
+from app.services.monitoring import (
+    MonitoringRule,
+    RuleScheduler,
+    WatermarkStore,
+    scope_query,
+)
+
+SCANNER_QUERY = """
+-- 쿼리 9.1: 테스트용 404 스캐너 탐지
+SELECT ip_address, COUNT(*) AS not_found_count
+FROM access_logs
+WHERE status_code = 404
+GROUP BY ip_address
+HAVING COUNT(*) >= 3
+"""
+
+RULE = MonitoringRule(
+    name="scanner",
+    query_id="9.1",
+    interval=60,
+    lookback=600,
+    subject="[보안 경고] 스캐너 탐지",
+    body="404가 많은 IP",
+)
+
+
+def _add_not_found(db, ip, count, timestamp):
+    db.add_all(
+        AccessLog(
+            ip_address=ip,
+            timestamp=timestamp,
+            method="GET",
+            path="/admin/.git",
+            status_code=404,
+            response_time_ms=10.0,
+        )
+        for _ in range(count)
+    )
+    db.commit()
+
+
+def test_scope_query_wraps_monitored_tables():
+    """쿼리의 감시 테이블이 워터마크/lookback 범위의 파생 테이블로 바뀌는지 테스트"""
+    scoped = scope_query(SCANNER_QUERY)
+    assert "FROM (SELECT * FROM access_logs WHERE timestamp >= :since" in scoped
+    assert "id <= :access_logs_upper) AS access_logs" in scoped
+
+
+def test_rule_runs_only_when_new_rows_arrive(db_session, tmp_path):
+    """새 행이 있을 때만 규칙이 실행되고, lookback 밖의 과거 행은 조회하지 않는지 테스트"""
+    alerts = []
+    now = datetime.datetime(2025, 10, 10, 12, 0)
+    scheduler = RuleScheduler(
+        db_session.get_bind(),
+        [RULE],
+        WatermarkStore(str(tmp_path / "watermarks.json")),
+        queries={"9.1": SCANNER_QUERY},
+        alert=lambda **kwargs: alerts.append(kwargs),
+    )
+
+    # 한참 전의 404는 lookback(10분) 밖이므로 다음 실행에서 함께 집계되면 안 됨
+    _add_not_found(db_session, "203.0.113.5", 2, now - datetime.timedelta(hours=3))
+    assert scheduler.run_rule(RULE) == 0
+    assert scheduler.run_rule(RULE) is None  # 새 행 없음
+
+    _add_not_found(db_session, "203.0.113.5", 2, now)
+    assert scheduler.run_rule(RULE) == 0
+
+    _add_not_found(db_session, "203.0.113.5", 1, now + datetime.timedelta(minutes=1))
+    assert scheduler.run_rule(RULE) == 1
+    assert alerts[0]["rule"] == "scanner"
+    assert alerts[0]["findings_df"].iloc[0]["not_found_count"] == 3
+
+    # 워터마크는 파일에 저장되어, 새 스케줄러도 이어서 실행해야 함
+    restored = WatermarkStore(str(tmp_path / "watermarks.json"))
+    assert restored.get("scanner") == {"access_logs": 5}
+
+
+def test_run_pending_respects_interval(db_session, tmp_path):
+    """run_pending이 실행 주기가 된 규칙만 제출하는지 테스트"""
+    _add_not_found(db_session, "10.0.0.1", 1, datetime.datetime(2025, 10, 10, 12, 0))
+    scheduler = RuleScheduler(
+        db_session.get_bind(),
+        [RULE],
+        WatermarkStore(str(tmp_path / "watermarks.json")),
+        queries={"9.1": SCANNER_QUERY},
+        alert=lambda **kwargs: None,
+    )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        wait(scheduler.run_pending(executor, now=0))
+        assert scheduler.run_pending(executor, now=30) == []
+        assert len(scheduler.run_pending(executor, now=60)) == 1
+
+
+def test_rule_skips_new_rows_without_timestamp(db_session, tmp_path):
+    """새 행의 timestamp가 모두 NULL이어도(MIN()이 NULL) 에러 없이 워터마크만 올리는지 테스트"""
+    rule = MonitoringRule(
+        name="sqli",
+        query_id="9.2",
+        interval=60,
+        lookback=600,
+        subject="[보안 경고] SQLi",
+        body="SQL 인젝션 시도",
+    )
+    scheduler = RuleScheduler(
+        db_session.get_bind(),
+        [rule],
+        WatermarkStore(str(tmp_path / "watermarks.json")),
+        queries={"9.2": "SELECT ip_address FROM security_events"},
+        alert=lambda **kwargs: None,
+    )
+    db_session.add(
+        SecurityEvent(
+            event_type="SQL_INJECTION_ATTEMPT", ip_address="203.0.113.9", timestamp=None
+        )
+    )
+    db_session.commit()
+    db_session.execute(text("UPDATE security_events SET timestamp = NULL"))
+    db_session.commit()
+
+    assert scheduler.run_rule(rule) == 0
+    assert scheduler.watermarks.get("sqli") == {"security_events": 1}
+    assert scheduler.run_rule(rule) is None
+
+
+SQLI_QUERY = """
+-- 쿼리 9.3: 테스트용 SQL Injection 상세
+SELECT id, ip_address, details
+FROM access_logs
+WHERE event_type = 'SQL_INJECTION_ATTEMPT'
+"""
+
+
+def test_late_commits_are_detected_and_alerted_findings_are_not_resent(
+    db_session, tmp_path
+):
+    """워터마크 아래로 늦게 커밋된 행도 탐지하고, lookback에 다시 나온 기존 결과는 다시 알리지 않는지 테스트"""
+    rule = MonitoringRule(
+        name="sqli",
+        query_id="9.3",
+        interval=60,
+        lookback=0,
+        subject="[보안 경고] SQLi",
+        body="SQL 인젝션 시도",
+        key_columns=("id",),
+    )
+    alerts = []
+    scheduler = RuleScheduler(
+        db_session.get_bind(),
+        [rule],
+        WatermarkStore(str(tmp_path / "watermarks.json")),
+        queries={"9.3": SQLI_QUERY},
+        alert=lambda **kwargs: alerts.append(kwargs),
+    )
+    now = datetime.datetime(2025, 10, 10, 12, 0)
+
+    def add(id_, timestamp):
+        db_session.add(
+            AccessLog(
+                id=id_,
+                ip_address="198.51.100.7",
+                timestamp=timestamp,
+                method="GET",
+                path="/search",
+                status_code=200,
+                response_time_ms=1.0,
+                event_type="SQL_INJECTION_ATTEMPT",
+                details="union_select",
+            )
+        )
+        db_session.commit()
+
+    add(1, now)
+    add(3, now)  # id 2의 트랜잭션이 아직 커밋되지 않음
+    assert scheduler.run_rule(rule) == 2
+
+    # 더 이른 timestamp로 늦게 커밋된 id 2: 새로 나온 행만 알리고, 범위에 다시 들어온 1, 3은 다시 알리지 않음
+    add(2, now - datetime.timedelta(minutes=5))
+    assert scheduler.run_rule(rule) == 1
+    assert list(alerts[1]["findings_df"]["id"]) == [2]
+    assert scheduler.run_rule(rule) is None
+    assert len(alerts) == 2
+
+    restored = WatermarkStore(str(tmp_path / "watermarks.json")).get_state("sqli")
+    assert restored["watermarks"] == {"access_logs": 3}
+    assert restored["gaps"] == {}
+    assert len(restored["alerted"]) == 3
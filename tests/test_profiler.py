@@ -0,0 +1,79 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import profiler
+from app.services.tracing import _trace_endpoint, active_routes
+
+
+def _burn_cpu(stop: threading.Event):
+    total = 0
+    while not stop.is_set():
+        total += sum(range(1000))
+    return total
+
+
+def _run_busy_request(route: str, stop: threading.Event):
+    active_routes[threading.get_ident()] = route
+    try:
+        _burn_cpu(stop)
+    finally:
+        active_routes.pop(threading.get_ident(), None)
+
+
+def test_sampler_attributes_stacks_to_active_route():
+    """요청 처리 중인 스레드의 스택이 경로 이름을 맨 앞에 둔 collapsed-stack으로 누적되는지 테스트"""
+    stop = threading.Event()
+    worker = threading.Thread(target=_run_busy_request, args=("GET /busy", stop))
+    worker.start()
+    try:
+        sampler = profiler.profile(0.3, hz=200)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert sampler.samples > 10
+    assert set(sampler.routes) == {"GET /busy"}
+    stack, count = next(iter(sampler.stacks.most_common(1)))
+    assert stack.startswith("GET /busy;")
+    assert "_burn_cpu (test_profiler.py:" in stack
+
+    line = sampler.collapsed().splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+def test_profile_endpoint_allows_one_profile_per_worker(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "secret"}
+    with TestClient(app) as client:
+        assert client.get("/admin/profile", params={"seconds": 0.1}).status_code == 403
+
+        response = client.get(
+            "/admin/profile",
+            params={"seconds": 0.1, "all_threads": True},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert int(response.headers["x-profile-samples"]) > 0
+
+        with profiler._profile_lock:
+            busy = client.get(
+                "/admin/profile", params={"seconds": 0.1}, headers=headers
+            )
+        assert busy.status_code == 409
+
+
+def test_active_route_is_recorded_without_tracing():
+    """tracing이 꺼져 있어도(trace 없음) 엔드포인트 실행 중인 스레드의 경로가 표시되는지 테스트"""
+    seen = []
+
+    def endpoint():
+        seen.append(active_routes.get(threading.get_ident()))
+        return "ok"
+
+    wrapped = _trace_endpoint(endpoint, "/busy/{id}", methods={"GET"})
+    assert wrapped() == "ok"
+    assert seen == ["GET /busy/{id}"]
+    assert threading.get_ident() not in active_routes
@@ -0,0 +1,138 @@
+import io
+import json
+import threading
+import zipfile
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dashboard.qa_report_cache import QAReportFetcher, QAReportNotFound
+
+REPO = "owner/repo"
+REPORT = {"summary": {"total": 3, "passed": 3}}
+
+
+def _artifact_zip() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        z.writestr("pytest-report.json", json.dumps(REPORT))
+    return buffer.getvalue()
+
+
+# --- GitHub API를 흉내 내는 로컬 HTTP 서버 ---
+class _FakeGitHubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, body: dict):
+        payload = json.dumps(body).encode()
+        etag = f'"{hash(payload)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        server = self.server
+        path = self.path.split("?")[0]
+        server.requests[path] += 1
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        if path.endswith("/workflows/python-ci.yml/runs"):
+            runs = [
+                {
+                    "id": server.run_id,
+                    "head_commit": {"message": f"run {server.run_id}"},
+                }
+            ]
+            self._send_json({"workflow_runs": runs if server.run_id else []})
+        elif path.endswith("/artifacts"):
+            self._send_json(
+                {
+                    "artifacts": [
+                        {
+                            "name": "qa-test-report",
+                            "archive_download_url": f"{base}/download/{server.run_id}.zip",
+                        }
+                    ]
+                }
+            )
+        elif path.startswith("/download/"):
+            payload = _artifact_zip()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+
+@pytest.fixture
+def github_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeGitHubHandler)
+    server.requests = Counter()
+    server.not_modified = 0
+    server.run_id = 101
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _fetcher(server, cache_dir):
+    return QAReportFetcher(
+        REPO,
+        "token",
+        cache_dir=str(cache_dir),
+        api_url=f"http://127.0.0.1:{server.server_address[1]}",
+    )
+
+
+def test_unchanged_run_is_served_from_cache(github_server, tmp_path):
+    """최신 run ID가 그대로면 304 조건부 요청 한 번과 디스크 캐시만으로 리포트를 반환하는지 테스트"""
+    fetcher = _fetcher(github_server, tmp_path)
+
+    report, commit_message = fetcher.latest_report()
+    assert report == REPORT
+    assert commit_message == "run 101"
+    assert sum(github_server.requests.values()) == 3
+
+    # 두 번째 호출: 실행 목록만 조건부로 확인하고 아티팩트는 다시 받지 않아야 함
+    report, _ = fetcher.latest_report()
+    assert report == REPORT
+    assert sum(github_server.requests.values()) == 4
+    assert github_server.not_modified == 1
+
+    # 프로세스가 재시작되어도 디스크의 ETag/아티팩트 캐시를 재사용해야 함
+    report, _ = _fetcher(github_server, tmp_path).latest_report()
+    assert report == REPORT
+    assert github_server.requests["/download/101.zip"] == 1
+    assert github_server.not_modified == 2
+
+
+def test_new_run_downloads_new_artifact(github_server, tmp_path):
+    """새 run ID가 나오면 해당 실행의 아티팩트를 새로 내려받는지 테스트"""
+    fetcher = _fetcher(github_server, tmp_path)
+    fetcher.latest_report()
+
+    github_server.run_id = 102
+    _, commit_message = fetcher.latest_report()
+    assert commit_message == "run 102"
+    assert github_server.requests["/download/102.zip"] == 1
+    assert not (tmp_path / "runs" / "102" / "artifact.zip.part").exists()
+
+
+def test_missing_run_raises_not_found(github_server, tmp_path):
+    github_server.run_id = None
+    with pytest.raises(QAReportNotFound):
+        _fetcher(github_server, tmp_path).latest_report()
@@ -0,0 +1,44 @@
+import numpy as np
+
+from app.services.quantile_sketch import LatencySketch
+
+
+def test_quantiles_stay_within_relative_accuracy():
+    """스케치의 p50/p95/p99 추정값이 실제 분위수와 상대 오차 1% 이내인지 테스트"""
+    values = np.random.default_rng(42).lognormal(mean=4, sigma=1, size=20_000)
+    sketch = LatencySketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.95, 0.99):
+        expected = np.quantile(values, q, method="lower")
+        assert abs(sketch.quantile(q) - expected) / expected <= 0.01
+
+
+def test_merge_and_serialization_round_trip():
+    """시간대/워커별 스케치를 병합한 결과가 하나의 스케치에 모두 넣은 결과와 같은지 테스트"""
+    first, second, combined = LatencySketch(), LatencySketch(), LatencySketch()
+    for value in range(1, 501):
+        first.add(value)
+        combined.add(value)
+    for value in range(501, 1001):
+        second.add(value)
+        combined.add(value)
+
+    restored = LatencySketch.from_dict(first.to_dict())
+    restored.merge(LatencySketch.from_dict(second.to_dict()))
+
+    assert restored.count == combined.count == 1000
+    assert restored.bins == combined.bins
+    assert restored.quantile(0.99) == combined.quantile(0.99)
+
+
+def test_bin_count_is_bounded():
+    """버킷 수가 max_bins를 넘으면 가장 낮은 버킷부터 합쳐져 메모리가 일정하게 유지되는지 테스트"""
+    sketch = LatencySketch(max_bins=50)
+    for exponent in range(-3, 7):
+        for step in range(1, 100):
+            sketch.add(step * 10.0**exponent)
+
+    assert len(sketch.bins) <= 50
+    assert sketch.count == 990
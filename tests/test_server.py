@@ -0,0 +1,62 @@
+import pytest
+
+from app.server import available_cpus, cgroup_cpu_limit, gunicorn_options, plan_server
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.mark.parametrize(
+    "files, expected",
+    [
+        ({"cpu.max": "200000 100000\n"}, 2.0),
+        ({"cpu.max": "max 100000\n"}, None),
+        (
+            {"cpu/cpu.cfs_quota_us": "150000\n", "cpu/cpu.cfs_period_us": "100000\n"},
+            1.5,
+        ),
+        (
+            {"cpu/cpu.cfs_quota_us": "-1\n", "cpu/cpu.cfs_period_us": "100000\n"},
+            None,
+        ),
+        ({}, None),
+    ],
+)
+def test_cgroup_cpu_limit(tmp_path, files, expected):
+    """cgroup v2/v1 CPU 쿼터 파일을 코어 수로 해석하는지 테스트"""
+    for name, content in files.items():
+        _write(tmp_path / name, content)
+    assert cgroup_cpu_limit(str(tmp_path)) == expected
+
+
+def test_available_cpus_is_capped_by_quota(tmp_path):
+    _write(tmp_path / "cpu.max", "150000 100000\n")
+    assert available_cpus(str(tmp_path)) == 1
+
+
+def test_plan_divides_connection_budget_across_workers():
+    """워커 수가 늘어도 전체 커넥션 수가 예산을 넘지 않는지 테스트"""
+    plan = plan_server(cpus=4, connection_budget=60)
+    assert (plan.workers, plan.pool_size, plan.max_overflow) == (4, 12, 3)
+    assert plan.max_connections == 60
+    assert plan.database_env() == {"DB_POOL_SIZE": "12", "DB_MAX_OVERFLOW": "3"}
+
+    assert plan_server(cpus=16, connection_budget=60).max_connections <= 60
+    # 예산보다 워커가 많으면 워커 수를 줄여 워커마다 최소 1개의 커넥션을 보장
+    small = plan_server(cpus=8, connection_budget=3)
+    assert (small.workers, small.pool_size, small.max_overflow) == (3, 1, 0)
+
+    with pytest.raises(ValueError):
+        plan_server(cpus=2, connection_budget=0)
+
+
+def test_gunicorn_options_preload_and_reset_pool_after_fork():
+    options = gunicorn_options(plan_server(cpus=2, workers=3), graceful_timeout=10)
+    assert options["workers"] == 3
+    assert options["worker_class"] == "uvicorn.workers.UvicornWorker"
+    assert options["preload_app"] is True
+    assert options["graceful_timeout"] == 10
+    assert options["post_fork"].__name__ == "post_fork"
+    assert options["worker_exit"].__name__ == "worker_exit"
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from app.main import post_reads
+from app.services.single_flight import SingleFlight
+
+HEADERS = {"X-Admin-Token": "secret"}
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "조건을 기다리다 시간 초과"
+        time.sleep(0.001)
+
+
+def _run_followers(group, key, count, fn):
+    results = []
+
+    def follower():
+        try:
+            results.append(group.do(key, fn))
+        except Exception as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=follower) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_calls_share_one_execution():
+    """실행 중인 키로 들어온 호출은 fn을 다시 실행하지 않고 리더의 결과를 함께 받는지 테스트"""
+    group = SingleFlight("test_shared")
+    release = threading.Event()
+    executions = []
+
+    def fetch():
+        executions.append(1)
+        release.wait(2)
+        return {"id": 1}
+
+    leader, leader_results = _run_followers(group, 1, 1, fetch)
+    _wait_until(lambda: group.stats()["in_flight"] == 1)
+    followers, results = _run_followers(group, 1, 9, fetch)
+    _wait_until(lambda: group.stats()["shared"] == 9)
+    release.set()
+    for thread in leader + followers:
+        thread.join()
+
+    assert len(executions) == 1
+    assert leader_results + results == [{"id": 1}] * 10
+    stats = group.stats()
+    assert stats["calls"] == 10
+    assert stats["executions"] == 1
+    assert stats["coalescing_ratio"] == 0.9
+    assert stats["max_waiters"] == 9
+    assert stats["in_flight"] == 0
+
+    # 실행이 끝난 뒤의 호출은 결과를 재사용하지 않고 새로 실행 (TTL 캐시가 아님)
+    assert group.do(1, lambda: "fresh") == "fresh"
+
+
+def test_errors_are_propagated_to_waiters():
+    group = SingleFlight("test_errors")
+    release = threading.Event()
+
+    def failing_fetch():
+        release.wait(2)
+        raise ValueError("db down")
+
+    leader, leader_results = _run_followers(group, "k", 1, failing_fetch)
+    _wait_until(lambda: group.stats()["in_flight"] == 1)
+    followers, results = _run_followers(group, "k", 3, failing_fetch)
+    _wait_until(lambda: group.stats()["shared"] == 3)
+    release.set()
+    for thread in leader + followers:
+        thread.join()
+
+    assert all(isinstance(r, ValueError) for r in leader_results + results)
+    # 팔로워는 각자 새 예외 객체를 받아 트레이스백이 섞이지 않고, 원인으로 리더의 예외를 가리킴
+    assert len({id(r) for r in leader_results + results}) == 4
+    assert all(str(r) == "db down" for r in results)
+    assert all(r.__cause__ is leader_results[0] for r in results)
+    assert group.stats()["errors"] == 1
+    with pytest.raises(KeyError):
+        group.do("k", lambda: {}["missing"])
+
+
+def test_forget_starts_new_execution_for_later_calls():
+    group = SingleFlight("test_forget")
+    release = threading.Event()
+    leader, _ = _run_followers(group, "k", 1, lambda: release.wait(2))
+    _wait_until(lambda: group.stats()["in_flight"] == 1)
+
+    group.forget("k")
+    assert group.do("k", lambda: "after write") == "after write"
+    release.set()
+    leader[0].join()
+    assert group.stats()["executions"] == 2
+
+
+def test_read_post_goes_through_single_flight(test_client, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    post_reads.reset_stats()
+    post_id = test_client.post("/posts", json={"title": "t", "content": "c"}).json()[
+        "id"
+    ]
+
+    assert test_client.get(f"/posts/{post_id}").json()["title"] == "t"
+    assert test_client.get("/posts/9999").status_code == 404
+    assert len(test_client.get("/posts").json()) == 1
+
+    stats = test_client.get("/admin/single-flight", headers=HEADERS).json()
+    assert stats["read_post"]["calls"] == 2
+    assert stats["read_post"]["executions"] == 2
+    assert "read_posts" in stats
+    assert test_client.get("/admin/single-flight").status_code == 403
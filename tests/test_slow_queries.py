@@ -0,0 +1,111 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from app.admin_router import get_slow_query_recorder
+from app.main import app
+from app.services.slow_queries import SlowQueryRecorder, fingerprint
+
+
+def _sqlite_engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE posts (id INTEGER PRIMARY KEY, title TEXT)"))
+    return engine
+
+
+def test_fingerprint_ignores_literal_values():
+    """값만 다른 쿼리는 같은 지문으로, 구조가 다른 쿼리는 다른 지문으로 묶이는지 테스트"""
+    a = fingerprint("SELECT * FROM posts WHERE id = 1 AND title = 'a'")
+    b = fingerprint("select *  from posts\n where id = 42 and title = 'it''s'")
+    c = fingerprint("SELECT * FROM posts WHERE id = %(id_1)s AND title = %(title_1)s")
+    assert a == b == c
+    assert fingerprint("SELECT * FROM posts WHERE id IN (?, ?, ?)") == fingerprint(
+        "SELECT * FROM posts WHERE id IN (1)"
+    )
+    assert fingerprint("SELECT id FROM posts")[0] != a[0]
+
+
+def test_slow_queries_are_captured_with_explain(tmp_path):
+    """기준 시간을 넘은 SELECT가 파라미터/EXPLAIN 계획과 함께 보관되고 회전 파일에 남는지 테스트"""
+    engine = _sqlite_engine()
+    log_file = tmp_path / "slow.jsonl"
+    recorder = SlowQueryRecorder(threshold_ms=0.0, log_file=str(log_file)).attach(
+        engine
+    )
+
+    with engine.begin() as conn:
+        for i in range(3):
+            conn.execute(text("INSERT INTO posts (title) VALUES (:t)"), {"t": f"t{i}"})
+        conn.execute(text("SELECT * FROM posts WHERE id = :id"), {"id": 2})
+    recorder.wait_for_explain()
+
+    report = recorder.report(order_by="count")
+    top = report["fingerprints"][0]
+    assert top["statement"] == "insert into posts (title) values (?)"
+    assert top["count"] == 3
+
+    select_entry = next(e for e in report["recent"] if "SELECT" in e["statement"])
+    assert select_entry["parameters"] == "(2,)"
+    assert "SEARCH posts USING INTEGER PRIMARY KEY" in select_entry["plan"][0]["detail"]
+
+    # EXPLAIN 자신은 집계되지 않아야 함
+    assert all("explain" not in s["statement"] for s in report["fingerprints"])
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4
+    assert json.loads(lines[-1])["plan"] == select_entry["plan"]
+
+
+def test_fast_queries_are_only_counted():
+    engine = _sqlite_engine()
+    recorder = SlowQueryRecorder(threshold_ms=10_000).attach(engine)
+    with engine.connect() as conn:
+        for _ in range(5):
+            conn.execute(text("SELECT 1"))
+
+    report = recorder.report()
+    assert report["recent"] == []
+    assert report["fingerprints"][0]["count"] == 5
+    assert report["fingerprints"][0]["slow_count"] == 0
+
+
+def test_admin_endpoint_lists_worst_fingerprints(monkeypatch):
+    recorder = SlowQueryRecorder(threshold_ms=50, explain=False)
+    recorder.record("SELECT * FROM posts WHERE id = 1", (), 5.0)
+    recorder.record("SELECT * FROM posts WHERE id = 2", (), 80.0)
+    recorder.record("SELECT COUNT(*) FROM posts", (), 30.0)
+
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    app.dependency_overrides[get_slow_query_recorder] = lambda: recorder
+    try:
+        with TestClient(app) as client:
+            headers = {"X-Admin-Token": "secret"}
+            assert client.get("/admin/slow-queries").status_code == 403
+            body = client.get("/admin/slow-queries", headers=headers).json()
+            assert client.delete("/admin/slow-queries", headers=headers).status_code
+    finally:
+        app.dependency_overrides.pop(get_slow_query_recorder, None)
+
+    assert [f["total_ms"] for f in body["fingerprints"]] == [85.0, 30.0]
+    assert body["fingerprints"][0]["slow_count"] == 1
+    assert len(body["recent"]) == 1
+    assert recorder.report()["fingerprints"] == []
+
+
+def test_failed_queries_do_not_leave_start_times_behind():
+    """실행이 실패한 쿼리의 시작 시각이 커넥션에 남아 다음 쿼리 시간에 섞이지 않는지 테스트"""
+    engine = _sqlite_engine()
+    SlowQueryRecorder(threshold_ms=10_000).attach(engine)
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        assert conn.info["slow_query_started"] == []
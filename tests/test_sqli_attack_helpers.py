@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from penetration_tests.run_sqli_attack_and_verify import (
+    PAYLOAD_KEY_LENGTH,
+    judge_attack,
+    payload_key,
+    wait_for_events_to_settle,
+)
+
+
+@pytest.mark.parametrize(
+    "technique, status_code, text, elapsed, timed_out, expected",
+    [
+        ("Time-Based", None, "", 10.0, True, True),
+        ("Time-Based", 200, "{}", 4.5, False, True),
+        ("Time-Based", 200, "{}", 0.1, False, False),
+        ("Error-Based", 500, "", 0.1, False, True),
+        ("Error-Based", 200, "You have an error in your SQL syntax", 0.1, False, True),
+        ("Error-Based", 200, '{"results": []}', 0.1, False, False),
+        ("Error-Based", None, "", 10.0, True, False),
+        ("UNION-Based", 200, json.dumps({"results": [1, 2]}), 0.1, False, True),
+        ("UNION-Based", 200, json.dumps({"results": [1]}), 0.1, False, False),
+        ("UNION-Based", 200, "<html>error</html>", 0.1, False, False),
+        ("Boolean-Based", 200, "{}", 0.1, False, True),
+        ("Boolean-Based", 403, "", 0.1, False, False),
+    ],
+)
+def test_judge_attack(technique, status_code, text, elapsed, timed_out, expected):
+    """technique별 성공 판정 기준 테스트"""
+    success, message = judge_attack(technique, status_code, text, elapsed, timed_out)
+    assert success is expected
+    assert message.startswith("SUCCESS" if expected else "FAILED")
+
+
+def test_payload_key_strips_and_truncates():
+    assert payload_key("  ' OR 1=1--  ") == "' OR 1=1--"
+    assert len(payload_key("x" * 500)) == PAYLOAD_KEY_LENGTH
+
+
+def test_wait_for_events_polls_until_count_stops_changing():
+    """비동기 싱크가 기록을 끝낼 때까지 다시 세고, 값이 더 늘지 않으면 멈추는지 테스트"""
+    counts = iter([3, 7, 9, 9, 12])
+    sleeps = []
+    settled = wait_for_events_to_settle(
+        lambda: next(counts), expected=20, sleep=sleeps.append, clock=lambda: 0.0
+    )
+    assert settled == 9
+    assert len(sleeps) == 3
+
+    # 기대한 수에 도달하면 바로 반환
+    assert wait_for_events_to_settle(lambda: 5, expected=5, sleep=sleeps.append) == 5
+
+
+def test_wait_for_events_gives_up_after_timeout():
+    now = [0.0]
+    counts = iter(range(100))
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    settled = wait_for_events_to_settle(
+        lambda: next(counts),
+        expected=1000,
+        interval=1.0,
+        timeout=3.0,
+        sleep=sleep,
+        clock=lambda: now[0],
+    )
+    assert settled == 3
@@ -0,0 +1,57 @@
+import datetime
+from contextlib import closing
+
+from app.models import AccessLog
+from app.services.streaming import StreamStats, collect_findings, stream_query
+
+
+def _add_logs(db, count):
+    db.add_all(
+        AccessLog(
+            ip_address=f"10.0.0.{i % 5}",
+            timestamp=datetime.datetime(2025, 10, 10, 12, 0),
+            method="GET",
+            path="/posts",
+            status_code=404,
+            response_time_ms=10.0,
+        )
+        for i in range(count)
+    )
+    db.commit()
+
+
+def test_stream_query_yields_fixed_size_chunks(db_session):
+    """스트리밍 조회가 chunk_size 단위로 DataFrame을 나누어 반환하고 통계를 기록하는지 테스트"""
+    _add_logs(db_session, 25)
+    stats = StreamStats()
+
+    chunks = list(
+        stream_query(
+            db_session.get_bind(),
+            "SELECT id, ip_address FROM access_logs WHERE status_code = :status",
+            params={"status": 404},
+            chunk_size=10,
+            stats=stats,
+        )
+    )
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert list(chunks[0].columns) == ["id", "ip_address"]
+    assert stats.rows == 25 and stats.chunks == 3
+    assert stats.peak_chunk_bytes > 0
+
+
+def test_collect_findings_keeps_only_top_rows(db_session):
+    """탐지 결과 전체 건수는 세되, 알림용으로는 앞쪽 max_rows 행만 보관하는지 테스트"""
+    _add_logs(db_session, 25)
+    engine = db_session.get_bind()
+
+    findings, total_rows = collect_findings(
+        stream_query(engine, "SELECT * FROM access_logs", chunk_size=4), max_rows=6
+    )
+    assert total_rows == 25
+    assert len(findings) == 6
+
+    # 첫 청크만 확인하고 멈춰도 커서가 정상적으로 정리되어야 함
+    with closing(stream_query(engine, "SELECT * FROM access_logs")) as chunks:
+        assert len(next(chunks)) == 25
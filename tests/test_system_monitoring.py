@@ -1,5 +1,8 @@
+from contextlib import closing
+
 import pandas as pd
-from sqlalchemy import text
+
+from app.services.streaming import StreamStats, stream_query
 
 # test_analysis_queries.py 에 있던 헬퍼 함수를 가져오거나 공통 유틸리티로 분리할 수 있습니다.
 from tests.test_analysis_queries import load_queries_from_file
@@ -7,6 +10,19 @@ from tests.test_analysis_queries import load_queries_from_file
 # 테스트 시작 전에 전체 쿼리를 미리 로드합니다.
 all_queries = load_queries_from_file()
 
+
+def _detect(mysql_engine, query):
+    """
+    탐지 쿼리를 서버 측 커서로 스트리밍하여 첫 청크만 확인합니다.
+    이상 징후가 하나라도 있으면 충분하므로, 전체 결과를 메모리에 올리지 않습니다.
+    """
+    stats = StreamStats()
+    with closing(stream_query(mysql_engine, query, stats=stats)) as chunks:
+        df = next(chunks, pd.DataFrame())
+    print(f"\n  - 스트리밍 조회: {stats.summary()}")
+    return df
+
+
 # --- ⭐️ 모니터링 테스트의 핵심 원칙 ---
 # "정상적인 상황에서는, 이상 징후 쿼리가 아무것도 찾아내지 못해야 한다."
 # 따라서 모든 테스트는 쿼리 결과가 비어있음(empty)을 검증합니다.
@@ -17,7 +33,7 @@ def test_monitor_for_brute_force_attacks(mysql_engine, setup_normal_operation_da
     query = all_queries.get("2.1")
     assert query, "쿼리 2.1을 찾을 수 없습니다."
 
-    df = pd.read_sql_query(text(query), mysql_engine)
+    df = _detect(mysql_engine, query)
 
     # 쿼리 결과가 비어있지 않다면(= 공격이 탐지되었다면), 테스트를 실패시키고 탐지 내용을 출력합니다.
     assert (
@@ -30,7 +46,7 @@ def test_monitor_for_web_scanners(mysql_engine, setup_normal_operation_data):
     query = all_queries.get("2.2")
     assert query, "쿼리 2.2를 찾을 수 없습니다."
 
-    df = pd.read_sql_query(text(query), mysql_engine)
+    df = _detect(mysql_engine, query)
 
     assert (
         df.empty
@@ -42,7 +58,7 @@ def test_monitor_for_sqli_attempts(mysql_engine, setup_normal_operation_data):
     query = all_queries.get("2.3")
     assert query, "쿼리 2.3을 찾을 수 없습니다."
 
-    df = pd.read_sql_query(text(query), mysql_engine)
+    df = _detect(mysql_engine, query)
 
     assert (
         df.empty
@@ -54,7 +70,7 @@ def test_monitor_for_traffic_spikes(mysql_engine, setup_normal_operation_data):
     query = all_queries.get("2.4")
     assert query, "쿼리 2.4를 찾을 수 없습니다."
 
-    df = pd.read_sql_query(text(query), mysql_engine)
+    df = _detect(mysql_engine, query)
 
     assert (
         df.empty
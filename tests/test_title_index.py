@@ -0,0 +1,95 @@
+import pytest
+
+from app import models
+from app.main import app, get_title_index
+from app.services.title_index import TitleIndex, ensure_title_index, normalize_title
+
+
+def test_suggest_uses_normalized_prefix_and_limit():
+    """대소문자/전각/공백 차이를 무시하고, 접두어가 일치하는 제목만 제목 순으로 반환하는지 테스트"""
+    index = TitleIndex()
+    index.ready = True
+    for post_id, title in [
+        (1, "FastAPI 입문"),
+        (2, "ｆａｓｔ  Tips"),
+        (3, "Flask 정리"),
+        (4, "fastapi 성능"),
+    ]:
+        index.add(post_id, title)
+
+    assert normalize_title("ｆａｓｔ  Tips") == "fast tips"
+    assert index.suggest("FAST") == [
+        {"id": 2, "title": "ｆａｓｔ  Tips"},
+        {"id": 4, "title": "fastapi 성능"},
+        {"id": 1, "title": "FastAPI 입문"},
+    ]
+    assert [s["id"] for s in index.suggest("fast", limit=1)] == [2]
+    assert index.suggest("django") == []
+
+    index.add(4, "Django 배포")  # 같은 id는 제목을 교체
+    index.remove(1)
+    assert [s["id"] for s in index.suggest("fast")] == [2]
+    assert index.suggest("dj") == [{"id": 4, "title": "Django 배포"}]
+
+
+def test_updates_before_build_are_ignored():
+    index = TitleIndex()
+    index.add(1, "제목")
+    assert len(index) == 0
+
+
+@pytest.fixture
+def suggest_client(test_client, db_session):
+    app.dependency_overrides[get_title_index] = lambda: ensure_title_index(
+        db_session.get_bind()
+    )
+    yield test_client
+    app.dependency_overrides.pop(get_title_index, None)
+
+
+def test_suggest_endpoint_follows_crud_handlers(suggest_client):
+    """시작 시 DB에서 빌드되고, 생성/수정/삭제 핸들러가 인덱스를 갱신하는지 테스트"""
+    client = suggest_client
+    first = client.post("/posts", json={"title": "Python 기초", "content": "x"})
+    post_id = first.json()["id"]
+
+    response = client.get("/posts/suggest", params={"prefix": "py"})
+    assert response.status_code == 200
+    assert response.json() == [{"id": post_id, "title": "Python 기초"}]
+
+    second = client.post("/posts", json={"title": "PyTest 활용", "content": "x"})
+    assert [s["title"] for s in client.get("/posts/suggest?prefix=py").json()] == [
+        "PyTest 활용",
+        "Python 기초",
+    ]
+
+    client.put(f"/posts/{post_id}", json={"title": "Rust 기초", "content": "x"})
+    client.delete(f"/posts/{second.json()['id']}")
+    assert client.get("/posts/suggest?prefix=py").json() == []
+    assert client.get("/posts/suggest?prefix=ru").json() == [
+        {"id": post_id, "title": "Rust 기초"}
+    ]
+
+    assert client.get("/posts/suggest").status_code == 422
+
+
+def test_refresh_picks_up_writes_from_other_workers(db_session):
+    """API를 거치지 않은 변경(다른 워커/배치)을 (COUNT, MAX(id)) 변경 또는 max_age 경과로 반영하는지 테스트"""
+    engine = db_session.get_bind()
+    db_session.add(models.Post(id=1, title="Go 입문", content="x"))
+    db_session.commit()
+    index = TitleIndex(refresh_interval=0).build(engine)
+    assert index.refresh(engine) is False
+
+    db_session.add(models.Post(id=2, title="Go 동시성", content="x"))
+    db_session.commit()
+    index.refresh_if_stale(engine).join()
+    assert [s["id"] for s in index.suggest("go")] == [2, 1]
+
+    # 개수와 최대 id가 같은 제목 수정은 max_age가 지나야 반영됩니다.
+    db_session.get(models.Post, 1).title = "Rust 입문"
+    db_session.commit()
+    assert index.refresh(engine) is False
+    index.max_age = 0
+    assert index.refresh(engine) is True
+    assert index.suggest("ru") == [{"id": 1, "title": "Rust 입문"}]
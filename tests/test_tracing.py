@@ -0,0 +1,98 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app import database
+from app.main import app, get_db
+from app.services.tracing import (
+    Trace,
+    TraceBuffer,
+    _current_trace,
+    instrument_engines,
+    tracer,
+)
+
+
+def _parse_server_timing(header: str) -> dict:
+    metrics = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(p.split("=", 1) for p in params)
+    return metrics
+
+
+@pytest.fixture
+def traced_client(db_session, monkeypatch):
+    """get_db를 재정의하지 않고 실제 get_db가 테스트 DB 세션을 만들도록 하여 db.checkout 구간까지 기록"""
+    monkeypatch.setattr(
+        database, "SessionLocal", lambda: type(db_session)(bind=db_session.get_bind())
+    )
+    monkeypatch.setattr(tracer, "sample_rate", 1.0)
+    app.dependency_overrides.pop(get_db, None)
+    tracer.buffer.clear()
+    with TestClient(app) as client:
+        yield client
+    tracer.buffer.clear()
+
+
+def test_server_timing_breaks_down_request(traced_client):
+    """Server-Timing 헤더에 커넥션 대기/쿼리 실행/ORM/직렬화/전체 시간이 모두 담기는지 테스트"""
+    traced_client.post("/posts", json={"title": "제목", "content": "내용"})
+    response = traced_client.get("/posts")
+
+    assert response.status_code == 200
+    metrics = _parse_server_timing(response.headers["server-timing"])
+    assert {"db.checkout", "db.execute", "app", "serialize", "total"} <= set(metrics)
+    assert metrics["db.execute"]["desc"] == '"1 queries"'
+    assert float(metrics["total"]["dur"]) >= float(metrics["serialize"]["dur"])
+
+
+def test_admin_traces_requires_token(traced_client, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    traced_client.get("/posts/999")
+
+    assert traced_client.get("/admin/traces").status_code == 403
+    assert (
+        traced_client.get(
+            "/admin/traces", headers={"X-Admin-Token": "wrong"}
+        ).status_code
+        == 403
+    )
+
+    response = traced_client.get(
+        "/admin/traces", params={"path": "/posts"}, headers={"X-Admin-Token": "secret"}
+    )
+    assert response.status_code == 200
+    traces = response.json()["traces"]
+    assert traces[0]["path"] == "/posts/999"
+    assert traces[0]["status_code"] == 404
+    assert traces[0]["query_count"] == 1
+
+
+def test_trace_buffer_keeps_only_recent_traces():
+    buffer = TraceBuffer(maxlen=3)
+    for i in range(5):
+        trace = Trace("GET", f"/posts/{i}")
+        trace.total_ms = float(i)
+        buffer.append(trace)
+
+    assert [t["path"] for t in buffer.list()] == ["/posts/4", "/posts/3", "/posts/2"]
+    assert [t["path"] for t in buffer.list(min_ms=3.5)] == ["/posts/4"]
+
+
+def test_failed_queries_do_not_leave_start_times_behind():
+    """실패한 쿼리의 시작 시각은 버리고, 이후 쿼리는 자기 실행 시간만 기록하는지 테스트"""
+    engine = create_engine("sqlite:///:memory:")
+    instrument_engines()
+    trace = Trace("GET", "/posts")
+    token = _current_trace.set(trace)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+            assert conn.info["trace_query_started"] == []
+            conn.execute(text("SELECT 1"))
+    finally:
+        _current_trace.reset(token)
+    assert trace.query_count == 1